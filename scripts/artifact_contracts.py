@@ -1,10 +1,15 @@
 """Artifact contract loading + validation.
 
 Contracts are intentionally minimal: they enforce required headings/markers to prevent drift.
+
+`load_contracts` compiles every contract once into a `CompiledContract`, which finds all
+required headings/markers in a single scan of the text and reports every violation,
+not just the first. `IncrementalValidator` does the same over a streamed output, chunk by chunk.
 """
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -16,62 +21,181 @@ import yaml
 class ContractResult:
     ok: bool
     message: str
-
-
-def load_contracts(contracts_path: Path) -> dict[str, Any]:
+    violations: tuple[str, ...] = ()
+
+
+class CompiledContract:
+    """One artifact contract, precompiled for single-pass matching."""
+
+    def __init__(self, artifact_key: str, contract: dict[str, Any]):
+        self.artifact_key = artifact_key
+        self.raw = contract
+        self.required_headings: tuple[str, ...] = tuple(contract.get("required_headings") or [])
+        self.required_markers: tuple[str, ...] = tuple(contract.get("required_markers") or [])
+        self.required_any: tuple[str, ...] = tuple(contract.get("required_any") or [])
+        self.required_yaml_keys: tuple[tuple[str, ...], ...] = tuple(
+            tuple(key_path.split(".")) for key_path in (contract.get("required_yaml_keys") or [])
+        )
+
+        patterns = sorted(
+            {p for p in self.required_headings + self.required_markers + self.required_any if p},
+            key=len,
+            reverse=True,
+        )
+        self.patterns: tuple[str, ...] = tuple(patterns)
+        # Zero-width lookahead so every start position is tried; longest alternative first.
+        self._matcher = re.compile("(?=(" + "|".join(map(re.escape, patterns)) + "))") if patterns else None
+        # A match of pattern P implies every pattern that is a substring of P is present too
+        # (alternation only reports the longest pattern starting at a given position).
+        self._implied = {p: frozenset(q for q in patterns if q in p) for p in patterns}
+
+    def scan(self, content: str) -> set[str]:
+        """Return every required pattern present in `content` (one pass)."""
+        found: set[str] = set()
+        if self._matcher is None:
+            return found
+        total = len(self.patterns)
+        for m in self._matcher.finditer(content):
+            found |= self._implied[m.group(1)]
+            if len(found) == total:
+                break
+        return found
+
+    def text_violations(self, found: set[str]) -> list[str]:
+        violations = [f"Missing required heading: {h}" for h in self.required_headings if h not in found]
+        violations += [f"Missing required marker: {m}" for m in self.required_markers if m not in found]
+        if self.required_any and not any(m in found for m in self.required_any):
+            violations.append(f"Missing required marker (any of): {', '.join(self.required_any)}")
+        return violations
+
+    def mapping_violations(self, data: Any) -> list[str]:
+        if not isinstance(data, dict):
+            return ["Invalid YAML: expected mapping at root"]
+        return [
+            f"Missing required YAML key: {'.'.join(parts)}"
+            for parts in self.required_yaml_keys
+            if not _has_key_parts(data, parts)
+        ]
+
+    def validate(self, content: str) -> ContractResult:
+        violations = self.text_violations(self.scan(content))
+        if self.required_yaml_keys:
+            try:
+                parsed = yaml.safe_load(content)
+            except Exception as e:
+                violations.append(f"Invalid YAML: {e}")
+            else:
+                violations += self.mapping_violations(parsed)
+        return _result(violations)
+
+    def validate_mapping(self, data: Any) -> ContractResult:
+        """Check required YAML key paths against an already-parsed mapping (no YAML round-trip)."""
+        return _result(self.mapping_violations(data))
+
+    def incremental(self) -> "IncrementalValidator":
+        return IncrementalValidator(self.artifact_key, self)
+
+
+class IncrementalValidator:
+    """Track which required headings/markers have appeared in a streamed output.
+
+    Only the last `longest pattern - 1` characters are kept between chunks, so a heading
+    split across two chunks is still found and each character is scanned about once.
+    """
+
+    def __init__(self, artifact_key: str, contract: CompiledContract | None):
+        self.artifact_key = artifact_key
+        self.contract = contract
+        self.found: set[str] = set()
+        self._tail = ""
+        self._keep = max((len(p) for p in contract.patterns), default=1) - 1 if contract else 0
+
+    def feed(self, text: str) -> None:
+        if self.contract is None or not text or self.complete:
+            return
+        window = self._tail + text
+        self.found |= self.contract.scan(window)
+        self._tail = window[-self._keep:] if self._keep else ""
+
+    @property
+    def complete(self) -> bool:
+        """True once every required heading/marker has been seen."""
+        return self.contract is None or not self.missing()
+
+    def missing(self) -> list[str]:
+        if self.contract is None:
+            return []
+        return self.contract.text_violations(self.found)
+
+    def finish(self, content: str) -> ContractResult:
+        """Final result for the complete output (YAML key checks need the full text)."""
+        if self.contract is None:
+            return _skipped(self.artifact_key)
+        if self.contract.required_yaml_keys:
+            return self.contract.validate(content)
+        return _result(self.missing())
+
+
+class ContractSet:
+    """Loaded contracts file: raw data plus one compiled validator per artifact."""
+
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
+        self.validators = {
+            key: CompiledContract(key, contract or {}) for key, contract in (data.get("artifacts") or {}).items()
+        }
+
+    # Dict-style access to the raw contracts file.
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def validate(self, artifact_key: str, content: str) -> ContractResult:
+        validator = self.validators.get(artifact_key)
+        if validator is None:
+            return _skipped(artifact_key)
+        return validator.validate(content)
+
+    def validate_mapping(self, artifact_key: str, data: Any) -> ContractResult:
+        validator = self.validators.get(artifact_key)
+        if validator is None:
+            return _skipped(artifact_key)
+        return validator.validate_mapping(data)
+
+    def incremental(self, artifact_key: str) -> IncrementalValidator:
+        return IncrementalValidator(artifact_key, self.validators.get(artifact_key))
+
+
+def load_contracts(contracts_path: Path) -> ContractSet:
     if not contracts_path.exists():
         raise FileNotFoundError(f"Missing contracts file: {contracts_path}")
     data = yaml.safe_load(contracts_path.read_text(encoding="utf-8"))
     if not isinstance(data, dict) or "artifacts" not in data:
         raise ValueError("Invalid contracts file: expected top-level 'artifacts'")
-    return data
-
-
-def validate_artifact(contracts: dict[str, Any], artifact_key: str, content: str) -> ContractResult:
-    artifacts = contracts.get("artifacts", {})
-    contract = artifacts.get(artifact_key)
-    if contract is None:
-        return ContractResult(ok=True, message=f"No contract for artifact '{artifact_key}' (skipping).")
-
-    required_headings = contract.get("required_headings") or []
-    for heading in required_headings:
-        if heading not in content:
-            return ContractResult(ok=False, message=f"Missing required heading: {heading}")
+    return ContractSet(data)
 
-    required_markers = contract.get("required_markers") or []
-    for marker in required_markers:
-        if marker not in content:
-            return ContractResult(ok=False, message=f"Missing required marker: {marker}")
 
-    required_any = contract.get("required_any") or []
-    if required_any:
-        if not any(marker in content for marker in required_any):
-            return ContractResult(
-                ok=False,
-                message=f"Missing required marker (any of): {', '.join(required_any)}",
-            )
+def validate_artifact(contracts: ContractSet | dict[str, Any], artifact_key: str, content: str) -> ContractResult:
+    if not isinstance(contracts, ContractSet):
+        contracts = ContractSet(contracts)
+    return contracts.validate(artifact_key, content)
 
-    required_yaml_keys = contract.get("required_yaml_keys") or []
-    if required_yaml_keys:
-        try:
-            parsed = yaml.safe_load(content)
-        except Exception as e:
-            return ContractResult(ok=False, message=f"Invalid YAML: {e}")
 
-        if not isinstance(parsed, dict):
-            return ContractResult(ok=False, message="Invalid YAML: expected mapping at root")
+def _result(violations: list[str]) -> ContractResult:
+    if not violations:
+        return ContractResult(ok=True, message="OK")
+    return ContractResult(ok=False, message="; ".join(violations), violations=tuple(violations))
 
-        for key_path in required_yaml_keys:
-            if not _has_key_path(parsed, key_path):
-                return ContractResult(ok=False, message=f"Missing required YAML key: {key_path}")
 
-    return ContractResult(ok=True, message="OK")
+def _skipped(artifact_key: str) -> ContractResult:
+    return ContractResult(ok=True, message=f"No contract for artifact '{artifact_key}' (skipping).")
 
 
-def _has_key_path(root: dict[str, Any], key_path: str) -> bool:
-    """Check a dotted key path like 'inputs.config.sha256'."""
+def _has_key_parts(root: dict[str, Any], parts: tuple[str, ...]) -> bool:
     cur: Any = root
-    for part in key_path.split("."):
+    for part in parts:
         if not isinstance(cur, dict) or part not in cur:
             return False
         cur = cur[part]
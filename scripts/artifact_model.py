@@ -0,0 +1,354 @@
+"""Typed views of the markdown artifacts, parsed once per run.
+
+Agents write markdown; the controller reads structure out of it (ideas, shortlist
+items, beats, shots, QC findings). The parsers here turn an artifact into compact
+slotted dataclasses, and `ArtifactModels` caches the result per run so the fan-out,
+the idea pre-filter and the gates share one parse. Each parsed artifact is also
+serialized next to its markdown as `<stem>.model.json` (`artifact_model.sidecars`),
+tagged with the sha256 of the markdown it was parsed from.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    from scripts.gates import parse_qc_status
+    from scripts.provenance import sha256_text
+except ImportError:
+    from gates import parse_qc_status
+    from provenance import sha256_text
+
+SIDECAR_SUFFIX = ".model.json"
+
+_NEXT_SECTION_RE = re.compile(r"^##\s+", re.MULTILINE)
+_FIELD_RE = re.compile(r"^\s*[-*]\s*\*\*([^*:]+?)(?:\s*\([^)]*\))?:\*\*\s*(.*?)\s*$", re.MULTILINE)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the their "
+    "then they this to until up when where while who with won't".split()
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Topic:
+    name: str
+    context: str = ""
+    stability: str = ""
+    human_angle: str = ""
+    risk_flags: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Idea:
+    index: int  # 1-based position in ideas.md
+    title: str
+    block: str  # raw markdown for the item
+    premise: str = ""
+    pressure_source: str = ""
+    release_mechanism: str = ""
+    core_contrast: str = ""
+    tag: str = ""
+    tone: str = ""
+
+    def words(self) -> frozenset[str]:
+        """Content words of the title and premise (for near-duplicate checks)."""
+        text = f"{self.title} {self.premise}".lower().replace("’", "'")
+        return frozenset(w for w in _WORD_RE.findall(text) if w not in _STOPWORDS)
+
+
+@dataclass(frozen=True, slots=True)
+class ShortlistItem:
+    index: int  # 1-based position in the shortlist
+    title: str
+    block: str  # raw markdown for this item (title line + detail bullets)
+
+    @property
+    def branch_id(self) -> str:
+        return f"{self.index:02d}_{slugify(self.title)}"
+
+
+@dataclass(frozen=True, slots=True)
+class Beat:
+    index: int
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Shot:
+    index: int
+    size: str  # wide / medium / close ...
+    action: str
+    seconds: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ScenePlan:
+    title: str
+    mode: str
+    beats: tuple[Beat, ...]
+    shots: tuple[Shot, ...]
+    placement: str = ""  # "Character Placement" bullets
+    environment: str = ""  # "Environment & Props" bullets
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(shot.seconds or 0.0 for shot in self.shots)
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueLine:
+    speaker: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Script:
+    title: str
+    dialogue: tuple[DialogueLine, ...]
+    subtitles: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class QCFinding:
+    check: str  # merged report: the check name; single-call report: the findings subsection
+    kind: str  # "deterministic" | "llm" | "" (single-call report)
+    status: str  # PASS | FAIL | REVIEW | "" (single-call report)
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class QCReport:
+    status: str  # PASS | FAIL | UNKNOWN
+    version: str | None
+    findings: tuple[QCFinding, ...]
+
+
+# ---------------------------
+# Parsers
+# ---------------------------
+
+def _section(markdown: str, heading_re: re.Pattern) -> str:
+    """Body of the first `##` section matching `heading_re` ('' if absent)."""
+    m = heading_re.search(markdown or "")
+    if not m:
+        return ""
+    body = markdown[m.end():]
+    end = _NEXT_SECTION_RE.search(body)
+    return body[: end.start()] if end else body
+
+
+def _split_items(body: str, title_re: re.Pattern) -> list[tuple[str, str]]:
+    """(title, block) for every item that starts with a `title_re` line."""
+    titles = list(title_re.finditer(body))
+    items = []
+    for i, tm in enumerate(titles):
+        stop = titles[i + 1].start() if i + 1 < len(titles) else len(body)
+        items.append((tm.group(1), body[tm.start():stop].strip("\n") + "\n"))
+    return items
+
+
+def _fields(block: str) -> dict[str, str]:
+    """`**Label (hint):** value` bullets, keyed by the snake_cased label."""
+    return {
+        re.sub(r"\W+", "_", m.group(1).strip().lower()).strip("_"): m.group(2).strip("` ")
+        for m in _FIELD_RE.finditer(block)
+    }
+
+
+_TOPICS_RE = re.compile(r"^##\s+Topics\b.*$", re.IGNORECASE | re.MULTILINE)
+_TOPIC_RE = re.compile(r"^\s*[-*]\s*\*\*Topic:\*\*\s*(.+?)\s*$", re.MULTILINE)
+
+
+def parse_trend_brief(markdown: str) -> list[Topic]:
+    topics = []
+    for name, block in _split_items(_section(markdown, _TOPICS_RE), _TOPIC_RE):
+        f = _fields(block)
+        topics.append(Topic(name, f.get("context", ""), f.get("stability", ""), f.get("human_angle", ""), f.get("risk_flags", "")))
+    return topics
+
+
+_IDEAS_RE = re.compile(r"^##\s+Ideas\b.*$", re.IGNORECASE | re.MULTILINE)
+_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|-|\*)\s*\*\*Title:\*\*\s*(.+?)\s*$", re.MULTILINE)
+
+
+def parse_ideas(markdown: str) -> list[Idea]:
+    """Theo's `## Ideas` items, in document order."""
+    ideas = []
+    for i, (title, block) in enumerate(_split_items(_section(markdown, _IDEAS_RE), _ITEM_RE), 1):
+        f = _fields(block)
+        ideas.append(Idea(
+            i, title, block,
+            premise=f.get("premise", ""),
+            pressure_source=f.get("pressure_source", ""),
+            release_mechanism=f.get("release_mechanism", ""),
+            core_contrast=f.get("core_contrast", ""),
+            tag=f.get("tag", ""),
+            tone=f.get("tone", ""),
+        ))
+    return ideas
+
+
+_SHORTLIST_RE = re.compile(r"^##\s+Approved Shortlist\b.*$", re.IGNORECASE | re.MULTILINE)
+
+
+def parse_approved_shortlist(markdown: str) -> list[ShortlistItem]:
+    """Split the `## Approved Shortlist` section into items, in document order."""
+    return [
+        ShortlistItem(index=i, title=title, block=block)
+        for i, (title, block) in enumerate(_split_items(_section(markdown, _SHORTLIST_RE), _ITEM_RE), 1)
+    ]
+
+
+_PLAN_TITLE_RE = re.compile(r"^##\s+(.+?)\s*$", re.MULTILINE)
+_SUBSECTION_RE = re.compile(r"^###\s+(.+?)\s*$", re.MULTILINE)
+_BEAT_RE = re.compile(r"^\s*(\d+)[.)]\s+(.+?)\s*$", re.MULTILINE)
+# Shot fields are split only on a dash with whitespace on both sides, so "medium-wide"
+# stays one size and "4–5s" one duration (a range counts at its upper end).
+_SHOT_RE = re.compile(
+    r"^\s*[-*]\s*Shot\s*(\d+)\s*:\s*(.+?)\s+[—–-]\s+(.+?)"
+    r"(?:\s+[—–-]\s+(?:\d+(?:\.\d+)?\s*[—–-]\s*)?(\d+(?:\.\d+)?)\s*s(?:ec(?:onds?)?)?)?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _subsections(markdown: str) -> list[tuple[str, str]]:
+    """(heading, body) for every `###` subsection, in order."""
+    heads = list(_SUBSECTION_RE.finditer(markdown))
+    return [
+        (m.group(1), markdown[m.end(): heads[i + 1].start() if i + 1 < len(heads) else len(markdown)])
+        for i, m in enumerate(heads)
+    ]
+
+
+def _parts(markdown: str) -> dict[str, str]:
+    """First `###` subsection per heading, keyed without its hint: "Beat Sheet (3–7 beats)" -> "beat sheet"."""
+    parts: dict[str, str] = {}
+    for heading, body in _subsections(markdown or ""):
+        parts.setdefault(re.split(r"[(—]", heading)[0].strip().lower(), body)
+    return parts
+
+
+def parse_scene_plan(markdown: str) -> ScenePlan:
+    title = _PLAN_TITLE_RE.search(markdown or "")
+    parts = _parts(markdown)
+    mode = next((line.strip("-*` ") for line in parts.get("mode", "").splitlines() if line.strip()), "")
+    beats = tuple(Beat(int(m.group(1)), m.group(2)) for m in _BEAT_RE.finditer(parts.get("beat sheet", "")))
+    shots = tuple(
+        Shot(int(m.group(1)), m.group(2).strip(), m.group(3).strip(), float(m.group(4)) if m.group(4) else None)
+        for m in _SHOT_RE.finditer(parts.get("shot plan", ""))
+    )
+    return ScenePlan(
+        title.group(1) if title else "", mode, beats, shots,
+        placement=parts.get("character placement", "").strip(),
+        environment=parts.get("environment & props", "").strip(),
+    )
+
+
+_DIALOGUE_RE = re.compile(r"^\s*[-*]\s*([^:\n]{1,40}?)\s*:\s*(.+?)\s*$", re.MULTILINE)
+
+
+def parse_scripts(markdown: str) -> Script:
+    """Lena's first script: spoken dialogue lines and subtitle text."""
+    title = _PLAN_TITLE_RE.search(markdown or "")
+    parts = _parts(markdown)
+    dialogue = tuple(DialogueLine(m.group(1), m.group(2)) for m in _DIALOGUE_RE.finditer(parts.get("dialogue", "")))
+    subtitles = tuple(line.strip() for line in parts.get("subtitle text", "").splitlines() if line.strip())
+    return Script(title.group(1) if title else "", dialogue, subtitles)
+
+
+_QC_FINDINGS_RE = re.compile(r"^##\s+Findings\b.*$", re.IGNORECASE | re.MULTILINE)
+_QC_CHECK_RE = re.compile(r"^(\S+)\s+\((\w+)\)\s+[—–-]\s+(PASS|FAIL|REVIEW)\s*$")
+_QC_VERSION_RE = re.compile(r"\*\*Version reviewed:\*\*\s*(\S+)", re.IGNORECASE)
+
+
+def parse_qc_report(markdown: str) -> QCReport:
+    findings = []
+    for heading, body in _subsections(_section(markdown, _QC_FINDINGS_RE)):
+        lines = tuple(line for line in body.splitlines() if line.strip())
+        m = _QC_CHECK_RE.match(heading)
+        findings.append(QCFinding(*(m.groups() if m else (heading, "", "")), lines))
+    version = _QC_VERSION_RE.search(markdown or "")
+    return QCReport(parse_qc_status(markdown).status, version.group(1) if version else None, tuple(findings))
+
+
+PARSERS: dict[str, Callable[[str], Any]] = {
+    "trend_brief": parse_trend_brief,
+    "ideas": parse_ideas,
+    "approved_ideas": parse_approved_shortlist,
+    "scripts": parse_scripts,
+    "scene_plan": parse_scene_plan,
+    "qc_report": parse_qc_report,
+}
+
+
+def slugify(text: str, max_len: int = 40) -> str:
+    """Filesystem-safe slug: ascii, lowercase, hyphen-separated."""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_text.lower()).strip("-")
+    return slug[:max_len].rstrip("-") or "item"
+
+
+# ---------------------------
+# Per-run cache + sidecars
+# ---------------------------
+
+def to_jsonable(model: Any) -> Any:
+    if isinstance(model, (list, tuple)):
+        return [to_jsonable(m) for m in model]
+    return asdict(model)
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(path.stem + SIDECAR_SUFFIX)
+
+
+class ArtifactModels:
+    """Parsed artifacts for one run, keyed by file path and re-parsed only if the file changes."""
+
+    def __init__(self, *, sidecars: bool = True):
+        self.sidecars = sidecars
+        self._cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, artifact_key: str, path: Path) -> Any:
+        """The parsed model of `path` (None if `artifact_key` has no parser)."""
+        parser = PARSERS.get(artifact_key)
+        if parser is None:
+            return None
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            hit = self._cache.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        text = path.read_text(encoding="utf-8")
+        model = parser(text)
+        with self._lock:
+            self._cache[path] = (stamp, model)
+        if self.sidecars:
+            self._write_sidecar(artifact_key, path, text, model)
+        return model
+
+    def _write_sidecar(self, artifact_key: str, path: Path, text: str, model: Any) -> None:
+        sha256 = sha256_text(text)
+        side = sidecar_path(path)
+        try:
+            if json.loads(side.read_text(encoding="utf-8")).get("source_sha256") == sha256:
+                return
+        except (OSError, ValueError):
+            pass
+        data = {"artifact": artifact_key, "source": path.name, "source_sha256": sha256, "model": to_jsonable(model)}
+        tmp = side.with_name(f".{side.name}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        tmp.replace(side)
+
+
+def open_artifact_models(cfg: dict) -> ArtifactModels:
+    return ArtifactModels(sidecars=bool((cfg.get("artifact_model") or {}).get("sidecars", True)))
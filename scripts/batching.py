@@ -0,0 +1,261 @@
+"""Request batching for latency-insensitive agents via a provider batch API.
+
+`BatchCollector` holds back `agenerate` calls for the agents listed under
+`batching.agents` and submits them together as one batch job. A job is submitted once
+`max_batch_size` requests are waiting or the oldest one has waited `max_wait_s`. A
+background thread polls the job and hands each result back to the step awaiting it.
+Calls from concurrent runs (campaigns) share batches, since they share the provider stack.
+
+`LocalBatchProvider` is the stand-in batch backend. It runs a job's requests concurrently
+through the regular provider stack on a worker thread, so the batch path can be exercised
+before a real batch API is wired in. Each request runs in a copy of its caller's
+`contextvars` context, so per-run state (pool scope, profiler, cache refresh) carries over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
+
+try:
+    from scripts.provider import (
+        BatchItem,
+        BatchProvider,
+        Provider,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        capture_provider_events,
+        emit_provider_event,
+        stream,
+    )
+except ImportError:
+    from provider import (
+        BatchItem,
+        BatchProvider,
+        Provider,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        capture_provider_events,
+        emit_provider_event,
+        stream,
+    )
+
+
+@dataclass(frozen=True)
+class BatchPolicy:
+    agents: frozenset[str] = frozenset()
+    max_batch_size: int = 50
+    max_wait_s: float = 2.0
+    poll_interval_s: float = 0.5
+
+    @classmethod
+    def from_config(cls, raw: dict[str, Any]) -> "BatchPolicy":
+        return cls(
+            agents=frozenset(raw.get("agents") or ()),
+            max_batch_size=max(1, int(raw.get("max_batch_size", 50))),
+            max_wait_s=float(raw.get("max_wait_s", 2.0)),
+            poll_interval_s=float(raw.get("poll_interval_s", 0.5)),
+        )
+
+
+class LocalBatchProvider:
+    """Batch API stand-in: each job runs its requests concurrently through `inner` on a worker thread."""
+
+    def __init__(self, inner: Provider):
+        self.inner = inner
+        self._jobs: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit_batch(
+        self, requests: dict[str, dict[str, Any]], *, contexts: dict[str, contextvars.Context] | None = None
+    ) -> str:
+        job_id = f"localbatch_{uuid.uuid4().hex[:12]}"
+        job: Future = Future()
+
+        def _run() -> None:
+            try:
+                job.set_result(asyncio.run(self._run(requests, contexts or {})))
+            except BaseException as e:
+                job.set_exception(e)
+
+        with self._lock:
+            self._jobs[job_id] = job
+        threading.Thread(target=_run, name=job_id, daemon=True).start()
+        return job_id
+
+    async def _run(self, requests: dict[str, dict[str, Any]], contexts: dict[str, contextvars.Context]) -> list[BatchItem]:
+        tasks = [
+            asyncio.create_task(self._one(custom_id, request), context=contexts.get(custom_id, contextvars.Context()).copy())
+            for custom_id, request in requests.items()
+        ]
+        return list(await asyncio.gather(*tasks))
+
+    async def _one(self, custom_id: str, request: dict[str, Any]) -> BatchItem:
+        # Each task runs in its own copy of the caller's context, so events are captured per item.
+        with capture_provider_events() as events:
+            try:
+                result = await self.inner.agenerate(**request)
+            except Exception as e:
+                return BatchItem(custom_id, error=e, events=tuple(events))
+        return BatchItem(custom_id, result=result, events=tuple(events))
+
+    def poll_batch(self, job_id: str) -> str:
+        with self._lock:
+            job = self._jobs[job_id]
+        return "ended" if job.done() else "in_progress"
+
+    def fetch_batch(self, job_id: str) -> list[BatchItem]:
+        with self._lock:
+            job = self._jobs.pop(job_id)
+        return job.result()
+
+
+@dataclass(frozen=True)
+class _Pending:
+    custom_id: str
+    request: dict[str, Any]
+    queued_at: float
+    future: Future
+    context: contextvars.Context
+
+
+class BatchCollector(ProviderWrapper):
+    """Route calls for batched agents through `backend` as batch jobs; other agents pass through.
+
+    Batched calls are never streamed: the whole result arrives at once, as a single chunk.
+    """
+
+    def __init__(self, inner: Provider, backend: BatchProvider, policy: BatchPolicy):
+        super().__init__(inner)
+        self.backend = backend
+        self.policy = policy
+        self._cond = threading.Condition()
+        self._pending: list[_Pending] = []
+        self._ids = itertools.count(1)
+        self._dispatcher: threading.Thread | None = None
+
+    def batched(self, agent_name: str) -> bool:
+        return agent_name in self.policy.agents
+
+    async def agenerate(self, **request: Any) -> ProviderResult:
+        if not self.batched(request["agent_name"]):
+            return await self.inner.agenerate(**request)
+        queued_at = time.monotonic()
+        item, job_id, size = await asyncio.wrap_future(self._enqueue(request, queued_at))
+        for event in item.events:
+            fields = dict(event)
+            emit_provider_event(fields.pop("type"), **fields)
+        emit_provider_event(
+            "llm_batched",
+            agent=request["agent_name"],
+            job_id=job_id,
+            batch_size=size,
+            wait_s=round(time.monotonic() - queued_at, 3),
+        )
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def generate(self, **request: Any) -> ProviderResult:
+        if not self.batched(request["agent_name"]):
+            return self.inner.generate(**request)
+        return asyncio.run(self.agenerate(**request))
+
+    async def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        if not self.batched(request["agent_name"]):
+            async with aclosing(super().agenerate_stream(**request)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+            return
+        result = await self.agenerate(**request)
+        yield StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        if not self.batched(request["agent_name"]):
+            yield from stream(self.inner, **request)
+            return
+        result = self.generate(**request)
+        yield StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+    def _enqueue(self, request: dict[str, Any], queued_at: float) -> Future:
+        pending = _Pending(
+            f"{request['agent_name']}-{next(self._ids)}", request, queued_at, Future(), contextvars.copy_context()
+        )
+        with self._cond:
+            self._pending.append(pending)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="batch-dispatcher", daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+        return pending.future
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = self._pending[0].queued_at + self.policy.max_wait_s
+                while len(self._pending) < self.policy.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self.policy.max_batch_size]
+                del self._pending[: len(batch)]
+            # Callers cancelled while queued drop out here; the rest can no longer be cancelled.
+            batch = [p for p in batch if p.future.set_running_or_notify_cancel()]
+            if batch:
+                threading.Thread(target=self._run_job, args=(batch,), daemon=True).start()
+
+    def _run_job(self, batch: list[_Pending]) -> None:
+        try:
+            job_id = self.backend.submit_batch(
+                {p.custom_id: p.request for p in batch}, contexts={p.custom_id: p.context for p in batch}
+            )
+            while self.backend.poll_batch(job_id) != "ended":
+                time.sleep(self.policy.poll_interval_s)
+            items = {item.custom_id: item for item in self.backend.fetch_batch(job_id)}
+        except Exception as e:
+            for p in batch:
+                p.future.set_exception(e)
+            return
+        for p in batch:
+            item = items.get(p.custom_id) or BatchItem(
+                p.custom_id, error=RuntimeError(f"Batch {job_id} returned no result for '{p.custom_id}'")
+            )
+            p.future.set_result((item, job_id, len(batch)))
+
+
+def build_batch_collector(
+    cfg: dict,
+    inner: Provider,
+    *,
+    backend: BatchProvider | None = None,
+    override: bool | dict | None = None,
+) -> Provider:
+    """Wrap `inner` with a batch collector configured under `batching:` (if enabled).
+
+    `override` (e.g. a campaign's `batching:` key) toggles batching or overrides its settings.
+    Without a `backend` (a client implementing `BatchProvider`), `LocalBatchProvider` is used.
+    """
+    raw = dict(cfg.get("batching") or {})
+    if isinstance(override, bool):
+        raw["enabled"] = override
+    elif isinstance(override, dict):
+        raw.update(override)
+    if not raw.get("enabled", False):
+        return inner
+    policy = BatchPolicy.from_config(raw)
+    if not policy.agents:
+        return inner
+    return BatchCollector(inner, backend or LocalBatchProvider(inner), policy)
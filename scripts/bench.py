@@ -0,0 +1,380 @@
+"""Deterministic controller benchmarks with synthetic latency providers.
+
+Each scenario runs as a campaign in a temp dir, in a fresh process, so peak RSS and
+per-process caches are measured per scenario. The provider is replaced by a
+`SyntheticProvider` that simulates latency (log-normal, from a median and p95), streaming,
+transient failures and token usage. Its randomness is seeded per call, so a given seed
+always produces the same latencies and failures.
+
+Usage:
+  python scripts/bench.py                                 # all scenarios, JSON to stdout
+  python scripts/bench.py --scenario fanout --repeat 10 --output bench.json
+  python scripts/bench.py --latency-ms 200 --latency-p95-ms 900 --failure-rate 0.05
+
+Reported per scenario: throughput (runs/s, LLM calls/s), p50/p95 end-to-end run
+latency, controller overhead (step time not spent in LLM calls), manifest I/O
+(manifest writes + output hashing, journal/manifest bytes), retries and peak memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import yaml
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from scripts.profiling import PROFILE_JSON
+    from scripts.provider import ProviderConfig, ProviderResult, PromptPrefix, StreamChunk, estimate_tokens
+    from scripts.resilience import TransientProviderError
+    from scripts.run_pipeline import load_shared_inputs, run_campaign, stub_output
+    from scripts.run_index import open_run_index
+    from scripts.object_store import open_object_store
+except ImportError:
+    from profiling import PROFILE_JSON
+    from provider import ProviderConfig, ProviderResult, PromptPrefix, StreamChunk, estimate_tokens
+    from resilience import TransientProviderError
+    from run_pipeline import load_shared_inputs, run_campaign, stub_output
+    from run_index import open_run_index
+    from object_store import open_object_store
+
+BENCH_FORMAT = 1
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class SyntheticProfile:
+    latency_ms: float = 40.0  # median end-to-end call latency
+    latency_p95_ms: float = 120.0
+    ttft_fraction: float = 0.3  # share of the latency spent before the first chunk
+    failure_rate: float = 0.0  # chance an attempt raises TransientProviderError
+    seed: int = 0
+
+    @property
+    def sigma(self) -> float:
+        if self.latency_p95_ms <= self.latency_ms:
+            return 0.0
+        return math.log(self.latency_p95_ms / self.latency_ms) / 1.645
+
+
+class SyntheticProvider:
+    """Stand-in provider with seeded latency, streaming, failures and token usage.
+
+    Outputs come from `text_fn` (contract-compliant stubs by default). The RNG for a call
+    is derived from the seed, agent, payload and attempt number, so retries of the same
+    request draw fresh (but reproducible) outcomes.
+    """
+
+    def __init__(self, profile: SyntheticProfile, text_fn: Callable[[str, str], str] = stub_output):
+        self.profile = profile
+        self._text_fn = text_fn
+        self._attempts: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _draw(self, agent_name: str, user_payload: str) -> tuple[float, bool]:
+        digest = hashlib.sha256(f"{agent_name}\0{user_payload}".encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+            self.calls += 1
+        rng = random.Random(f"{self.profile.seed}:{digest}:{attempt}")
+        latency_s = self.profile.latency_ms * math.exp(rng.gauss(0.0, self.profile.sigma)) / 1000
+        failed = rng.random() < self.profile.failure_rate
+        if failed:
+            with self._lock:
+                self.failures += 1
+        return latency_s, failed
+
+    def _result(self, agent_name: str, system_prompt: str, user_payload: str) -> tuple[str, dict]:
+        text = self._text_fn(agent_name, user_payload)
+        usage = {"input_tokens": estimate_tokens(system_prompt + user_payload), "output_tokens": estimate_tokens(text)}
+        return text, usage
+
+    async def agenerate(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> ProviderResult:
+        latency_s, failed = self._draw(agent_name, user_payload)
+        await asyncio.sleep(latency_s * (self.profile.ttft_fraction if failed else 1.0))
+        if failed:
+            raise TransientProviderError("synthetic transient failure")
+        text, usage = self._result(agent_name, system_prompt, user_payload)
+        return ProviderResult(text=text, provider_name=config.name, model=config.model, usage=usage)
+
+    async def agenerate_stream(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        latency_s, failed = self._draw(agent_name, user_payload)
+        await asyncio.sleep(latency_s * self.profile.ttft_fraction)
+        if failed:
+            raise TransientProviderError("synthetic transient failure")
+        text, usage = self._result(agent_name, system_prompt, user_payload)
+        lines = text.splitlines(keepends=True) or [""]
+        gap = latency_s * (1 - self.profile.ttft_fraction) / len(lines)
+        for i, line in enumerate(lines):
+            if i:
+                await asyncio.sleep(gap)
+            yield StreamChunk(text=line, usage=usage if i == len(lines) - 1 else None)
+
+    def generate(self, **request: Any) -> ProviderResult:
+        return asyncio.run(self.agenerate(**request))
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        yield StreamChunk(text=self.generate(**request).text)
+
+
+def shortlist_text_fn(size: int) -> Callable[[str, str], str]:
+    """Stub outputs, except Mabel approves `size` ideas (drives the fan-out width)."""
+
+    def text_fn(agent_name: str, user_payload: str) -> str:
+        if agent_name != "mabel":
+            return stub_output(agent_name, user_payload)
+        items = "".join(
+            f"- **Title:** Bench Idea {i}\n"
+            "- **Why it fits (1–2 lines):** Synthetic benchmark item.\n"
+            "- **Risks / watch-outs (1 line max):** none\n"
+            "- **Recommended tone note (1 line max):** Calm.\n"
+            for i in range(1, size + 1)
+        )
+        return (
+            "## Approved Shortlist (3–7)\n" + items + "\n"
+            "## Rejected (rest)\n"
+            "- **Title:** (bench rejected idea)\n"
+            "- **Reason (1 line):** Synthetic.\n"
+        )
+
+    return text_fn
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    runs: int  # runs per repetition
+    workers: int
+    shortlist: int = 3
+    max_parallel_branches: int = 4
+
+
+SCENARIOS = {
+    "single": Scenario("single", runs=1, workers=1),
+    "fanout": Scenario("fanout", runs=1, workers=1, shortlist=7, max_parallel_branches=8),
+    "campaign": Scenario("campaign", runs=8, workers=4),
+}
+
+
+def bench_config(cfg: dict, tmp: Path, scenario: Scenario, *, stream: bool) -> dict:
+    """Project config redirected into `tmp`, with caching/batching/speculation off."""
+    cfg = copy.deepcopy(cfg)
+    runs_dir = tmp / "runs"
+    cfg["paths"]["runs_dir"] = str(runs_dir)
+    cfg.setdefault("run_index", {})["path"] = str(runs_dir / ".index.sqlite")
+    cfg.setdefault("object_store", {})["dir"] = str(runs_dir / ".objects")
+    cfg["cache"] = {**(cfg.get("cache") or {}), "enabled": False}
+    cfg["batching"] = {**(cfg.get("batching") or {}), "enabled": False}
+    cfg["speculative"] = {**(cfg.get("speculative") or {}), "enabled": False}
+    cfg["profiling"] = {**(cfg.get("profiling") or {}), "enabled": True}
+    cfg["streaming"] = {**(cfg.get("streaming") or {}), "enabled": stream}
+    # Keep retry backoff short so injected failures measure the controller, not sleeps.
+    cfg["resilience"] = {**(cfg.get("resilience") or {}), "max_retries": 5, "backoff_base_s": 0.005, "backoff_max_s": 0.05}
+    run_defaults = cfg.setdefault("run_defaults", {})
+    run_defaults.update({
+        "max_scripts": scenario.shortlist,
+        "max_scene_plans": scenario.shortlist,
+        "max_parallel_branches": scenario.max_parallel_branches,
+    })
+    return cfg
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _count_events(data: dict, event_type: str) -> int:
+    sections = [data, *(data.get("branches") or {}).values()]
+    return sum(1 for s in sections for e in s.get("events") or [] if e.get("type") == event_type)
+
+
+def run_scenario(spec: dict) -> dict:
+    """Run one scenario (in a child process) and return its metrics."""
+    os.chdir(ROOT_DIR)  # policy paths in project.yaml are relative to the repo root
+    scenario = Scenario(**spec["scenario"])
+    profile = SyntheticProfile(**spec["profile"])
+    base = load_shared_inputs(Path(spec["config"]))
+    client = SyntheticProvider(profile, shortlist_text_fn(scenario.shortlist))
+
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scenario.name}-") as tmp_name:
+        tmp = Path(tmp_name)
+        cfg = bench_config(base.cfg, tmp, scenario, stream=spec["stream"])
+        shared = replace(
+            base,
+            cfg=cfg,
+            runs_dir=tmp / "runs",
+            run_index=open_run_index(cfg, ROOT_DIR),
+            object_store=open_object_store(cfg, ROOT_DIR),
+        )
+        durations: list[float] = []
+        statuses: dict[str, int] = {}
+        wall_s = 0.0
+        for rep in range(spec["repeat"]):
+            campaign = {
+                "name": f"bench-{scenario.name}-{rep}",
+                "workers": scenario.workers,
+                "runs": [{"date": "2026-01-01", "slug": f"r{rep}-{i:03d}"} for i in range(scenario.runs)],
+            }
+            campaign_path = tmp / f"{campaign['name']}.yaml"
+            campaign_path.write_text(yaml.safe_dump(campaign), encoding="utf-8")
+            summary_path = run_campaign(shared, campaign_path, use_cache=False, client=client)
+            summary = yaml.safe_load(summary_path.read_text(encoding="utf-8"))
+            wall_s += summary["totals"]["wall_s"]
+            for result in summary["runs"]:
+                durations.append(result["duration_s"])
+                statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+        llm_calls = llm_ms = overhead_ms = manifest_ms = hashing_ms = 0.0
+        journal_bytes = manifest_bytes = retries = 0
+        for profile_path in sorted((tmp / "runs").glob(f"*/*/{PROFILE_JSON}")):
+            run_dir = profile_path.parent
+            report = json.loads(profile_path.read_text(encoding="utf-8"))
+            by_name = report["by_name"]
+            llm_calls += by_name.get("llm_call", {}).get("count", 0)
+            llm_ms += by_name.get("llm_call", {}).get("total_ms", 0.0)
+            manifest_ms += by_name.get("save_manifest", {}).get("total_ms", 0.0)
+            hashing_ms += by_name.get("upsert_output_manifest", {}).get("total_ms", 0.0)
+            overhead_ms += sum(max(0.0, s["duration_ms"] - s["llm_ms"]) for s in report["by_step"].values())
+            journal = run_dir / "run_journal.jsonl"
+            manifest = run_dir / "run_manifest.yaml"
+            journal_bytes += journal.stat().st_size if journal.exists() else 0
+            if manifest.exists():
+                manifest_bytes += manifest.stat().st_size
+                retries += _count_events(yaml.safe_load(manifest.read_text(encoding="utf-8")) or {}, "llm_retry")
+
+    runs = len(durations)
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+    if peak_rss_kb and sys.platform == "darwin":
+        peak_rss_kb //= 1024  # bytes on macOS
+    return {
+        "runs": runs,
+        "workers": scenario.workers,
+        "branches_per_run": scenario.shortlist,
+        "statuses": statuses,
+        "wall_s": round(wall_s, 3),
+        "throughput": {
+            "runs_per_s": round(runs / wall_s, 3) if wall_s else None,
+            "llm_calls_per_s": round(llm_calls / wall_s, 3) if wall_s else None,
+        },
+        "run_latency_s": {
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "max": max(durations),
+            "mean": round(sum(durations) / runs, 3),
+        },
+        "llm": {
+            "calls": int(llm_calls),
+            "attempts": client.calls,
+            "injected_failures": client.failures,
+            "retries": retries,
+            "total_ms": round(llm_ms, 1),
+        },
+        "controller_overhead_ms": {"total": round(overhead_ms, 1), "per_run": round(overhead_ms / runs, 1)},
+        "manifest_io": {
+            "save_manifest_ms": round(manifest_ms, 1),
+            "output_hashing_ms": round(hashing_ms, 1),
+            "journal_bytes": journal_bytes,
+            "manifest_bytes": manifest_bytes,
+        },
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark the controller with synthetic latency providers.")
+    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
+    ap.add_argument("--scenario", default=",".join(SCENARIOS), help=f"Comma-separated: {', '.join(SCENARIOS)}")
+    ap.add_argument("--repeat", type=int, default=5, help="Campaign repetitions per scenario (latency samples)")
+    ap.add_argument("--latency-ms", type=float, default=SyntheticProfile.latency_ms, help="Median call latency")
+    ap.add_argument("--latency-p95-ms", type=float, default=SyntheticProfile.latency_p95_ms, help="p95 call latency")
+    ap.add_argument("--ttft-fraction", type=float, default=SyntheticProfile.ttft_fraction, help="Share of latency before the first chunk")
+    ap.add_argument("--failure-rate", type=float, default=SyntheticProfile.failure_rate, help="Transient failure probability per attempt")
+    ap.add_argument("--seed", type=int, default=SyntheticProfile.seed)
+    ap.add_argument("--no-stream", action="store_true", help="Disable streaming (whole responses)")
+    ap.add_argument("--output", default=None, help="Write JSON here instead of stdout")
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.scenario.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(unknown)}")
+    profile = SyntheticProfile(
+        latency_ms=args.latency_ms,
+        latency_p95_ms=args.latency_p95_ms,
+        ttft_fraction=args.ttft_fraction,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    report = {
+        "bench_format": BENCH_FORMAT,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stream": not args.no_stream,
+        "repeat": args.repeat,
+        "provider": asdict(profile),
+        "scenarios": {},
+    }
+    for name in names:
+        spec = {
+            "scenario": asdict(SCENARIOS[name]),
+            "profile": asdict(profile),
+            "config": args.config,
+            "stream": not args.no_stream,
+            "repeat": max(1, args.repeat),
+        }
+        # A fresh process per scenario: isolated peak RSS and no warm caches from earlier scenarios.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            report["scenarios"][name] = pool.submit(run_scenario, spec).result()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Shared context blocks: policy docs placed as a stable prefix ahead of step payloads.
+
+Policy docs (character bible, taste profile, ...) are read and hashed once per process
+and always rendered in the order they are listed under `policy:` in project.yaml.
+Every call that uses the same blocks therefore starts with byte-identical text, which
+providers with server-side prompt caching can reuse (see `PromptPrefix`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from scripts.provenance import sha256_text
+    from scripts.provider import PromptPrefix
+except ImportError:
+    from provenance import sha256_text
+    from provider import PromptPrefix
+
+
+@dataclass(frozen=True)
+class ContextBlock:
+    key: str
+    name: str
+    text: str
+    sha256: str
+
+    def render(self) -> str:
+        return f"--- {self.name} ---\n{self.text}\n\n"
+
+
+# resolved path -> ((mtime_ns, size), block); one entry per doc, replaced when the file changes.
+_blocks: dict[str, tuple[tuple[int, int], ContextBlock]] = {}
+_lock = threading.Lock()
+
+
+def load_context_block(key: str, path: Path) -> ContextBlock:
+    """Read + hash a policy doc once per process; it is re-read only if the file changes."""
+    st = path.stat()
+    cache_key, stamp = str(path.resolve()), (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _blocks.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    data = path.read_bytes()
+    # Same digest as sha256_file(), so fingerprints and manifest hashes stay comparable.
+    block = ContextBlock(key, path.name, data.decode("utf-8"), hashlib.sha256(data).hexdigest())
+    with _lock:
+        _blocks[cache_key] = (stamp, block)
+    return block
+
+
+def policy_block(cfg: dict, key: str) -> ContextBlock:
+    return load_context_block(key, Path(cfg["policy"][key]))
+
+
+def context_prefix(cfg: dict, *keys: str) -> PromptPrefix:
+    """Render the `policy.<key>` docs as one prefix, in project.yaml order regardless of `keys` order."""
+    order = list(cfg["policy"])
+    blocks = [policy_block(cfg, key) for key in sorted(set(keys), key=order.index)]
+    text = ""
+    breakpoints = []
+    for block in blocks:
+        text += block.render()
+        breakpoints.append(len(text))
+    return PromptPrefix(
+        text=text,
+        sha256=sha256_text(text),
+        blocks=tuple(block.key for block in blocks),
+        breakpoints=tuple(breakpoints),
+    )
+
+
+def policy_inputs(cfg: dict) -> dict[str, dict]:
+    """`inputs.context_blocks` for the run manifest: every policy doc that exists on disk."""
+    entries = {}
+    for key, value in (cfg.get("policy") or {}).items():
+        if not isinstance(value, str):
+            continue
+        path = Path(value)
+        if path.is_file():
+            entries[key] = {"path": value, "sha256": load_context_block(key, path).sha256}
+    return entries
@@ -0,0 +1,209 @@
+"""Watch run folders for curator decisions (used by `run_pipeline.py --serve`).
+
+Only run folders at `runs/<YYYY-MM>/<run>/` that hold `READY_FOR_CURATOR.md` are
+considered. A folder is reported once its `curator_decision.md` was created or changed
+and then left alone for `debounce_s`, so an editor's several writes (or a save
+followed by a rename) count as one decision. Deciding what the change means
+(`parse_curator_approval`, whether Parker should run) is up to the caller.
+
+Backends:
+- `inotify` (Linux, through libc; no extra dependency): watches the runs dir, its
+  month folders and every run folder, so a change is seen as soon as it is written.
+- `polling`: stats every `curator_decision.md` each `poll_s`. Used when inotify is
+  unavailable (other platforms, watch limit reached) or `backend: polling` is set.
+
+On start every existing run folder counts as changed once, so decisions written while
+no watcher was running are still picked up.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+READY_NAME = "READY_FOR_CURATOR.md"
+
+# <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows, NUL-padded)
+_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+
+class _Inotify:
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._add(self.fd, os.fsencode(path), _MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+        return wd
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Pending (wd, mask, name) events; empty if there are none."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, size = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset: offset + size].rstrip(b"\0")
+            offset += size
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class CuratorWatcher:
+    """Report run folders whose `curator_decision.md` changed and has settled for `debounce_s`."""
+
+    def __init__(
+        self,
+        runs_dir: Path,
+        *,
+        curator_name: str = "curator_decision.md",
+        backend: str = "auto",
+        debounce_s: float = 1.0,
+        poll_s: float = 2.0,
+    ):
+        self.runs_dir = runs_dir
+        self.curator_name = curator_name
+        self.debounce_s = debounce_s
+        self.poll_s = poll_s
+        self._changed: dict[Path, float] = {}  # run folder -> time of its last change
+        self._stamps: dict[Path, tuple[int, int]] = {}  # polling: curator_decision.md stamps
+        self._last_scan = 0.0
+        self._inotify: _Inotify | None = None
+        self._watches: dict[int, tuple[Path, int]] = {}  # wd -> (dir, depth below runs_dir)
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        if backend in ("auto", "inotify"):
+            try:
+                self._inotify = _Inotify()
+                self._watch_tree(runs_dir, 0)
+            except OSError:
+                if backend == "inotify":
+                    raise
+                self._fall_back()
+        self.backend = "inotify" if self._inotify is not None else "polling"
+        for run_dir in self._run_dirs():
+            self._changed[run_dir] = 0.0  # settled: decisions made while nobody watched
+            self._stamps.update(self._stamp(run_dir))
+
+    def _run_dirs(self) -> list[Path]:
+        return sorted(p for p in self.runs_dir.glob("*/*") if p.is_dir() and not p.parent.name.startswith("."))
+
+    def _stamp(self, run_dir: Path) -> dict[Path, tuple[int, int]]:
+        try:
+            st = (run_dir / self.curator_name).stat()
+        except FileNotFoundError:
+            return {}
+        return {run_dir: (st.st_mtime_ns, st.st_size)}
+
+    def _fall_back(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+        self._inotify = None
+        self._watches.clear()
+        self.backend = "polling"
+
+    def _watch_tree(self, path: Path, depth: int) -> None:
+        """Watch the runs dir (depth 0), its month folders (1) and their run folders (2)."""
+        if depth > 0 and path.name.startswith("."):
+            return  # .cache, .objects, .queue, ...
+        self._watches[self._inotify.add_watch(path)] = (path, depth)
+        if depth < 2:
+            for child in path.iterdir():
+                if child.is_dir():
+                    self._watch_tree(child, depth + 1)
+        elif (path / self.curator_name).exists():
+            self._changed[path] = time.monotonic()  # created before the watch was in place
+
+    def _read_inotify(self) -> None:
+        now = time.monotonic()
+        for wd, mask, name in self._inotify.read():
+            if mask & _IN_Q_OVERFLOW:
+                for run_dir in self._run_dirs():
+                    self._changed[run_dir] = now
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            path, depth = self._watches.get(wd, (None, None))
+            if path is None:
+                continue
+            if depth < 2 and mask & _IN_ISDIR:
+                try:
+                    self._watch_tree(path / name, depth + 1)
+                except FileNotFoundError:
+                    pass  # gone again before we could watch it
+                except OSError:
+                    self._fall_back()  # e.g. fs.inotify.max_user_watches reached
+                    return
+            elif depth == 2 and name in (self.curator_name, READY_NAME):
+                self._changed[path] = now
+
+    def _scan(self) -> None:
+        now = time.monotonic()
+        if now - self._last_scan < self.poll_s:
+            return
+        self._last_scan = now
+        for run_dir in self._run_dirs():
+            stamp = self._stamp(run_dir)
+            if stamp and stamp[run_dir] != self._stamps.get(run_dir):
+                self._stamps.update(stamp)
+                self._changed[run_dir] = now
+
+    def poll(self) -> list[Path]:
+        """Run folders ready for the curator whose decision file changed and then stayed unchanged."""
+        if self._inotify is not None:
+            self._read_inotify()
+        else:
+            self._scan()
+        now = time.monotonic()
+        settled = [run_dir for run_dir, at in self._changed.items() if now - at >= self.debounce_s]
+        for run_dir in settled:
+            del self._changed[run_dir]
+        return [
+            run_dir for run_dir in settled
+            if (run_dir / READY_NAME).exists() and (run_dir / self.curator_name).exists()
+        ]
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def open_curator_watcher(cfg: dict, runs_dir: Path) -> CuratorWatcher:
+    """The watcher configured under `serve.curator_watch`."""
+    serve_cfg = cfg.get("serve") or {}
+    watch_cfg = serve_cfg.get("curator_watch") or {}
+    return CuratorWatcher(
+        runs_dir,
+        curator_name=(cfg.get("artifacts") or {}).get("curator_decision", "curator_decision.md"),
+        backend=str(watch_cfg.get("backend", "auto")),
+        debounce_s=float(watch_cfg.get("debounce_s", 1.0)),
+        poll_s=float(serve_cfg.get("poll_s", 2)),
+    )
@@ -45,3 +45,62 @@ def parse_curator_approval(markdown: str) -> GateDecision:
     if token in {"yes", "true"}:
         return GateDecision(status="APPROVED", raw=token)
     return GateDecision(status="VETO", raw=token)
+
+
+_CURATOR_BRANCH_RE = re.compile(
+    r"^\s*(?:-|\*)?\s*Selected branch\s*:\s*([A-Za-z0-9_\-]+)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def parse_curator_branch(markdown: str) -> str | None:
+    """Parse the optional `Selected branch:` pick (e.g. `01` or `01_the-lunchbox`)."""
+    m = _CURATOR_BRANCH_RE.search(markdown or "")
+    return m.group(1) if m else None
+
+
+_CURATOR_VERSION_RE = re.compile(
+    r"^\s*(?:-|\*)?\s*Selected version\s*:\s*(v\d+|final)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def parse_curator_version(markdown: str) -> str | None:
+    """Parse the `Selected version:` pick (`v1`, `v2`, ... or `final`); the template placeholder counts as unset."""
+    m = _CURATOR_VERSION_RE.search(markdown or "")
+    return m.group(1).lower() if m else None
+
+
+_CURATOR_NOTES_RE = re.compile(
+    r"^\s*(?:-|\*)?\s*(?:Optional\s+)?notes(?:\s*\([^)]*\))?\s*:[ \t]*(.*?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# The notes block ends at the next heading or top-level bullet.
+_NOTES_END_RE = re.compile(r"^(?:#|[-*]\s)")
+
+
+def parse_curator_notes(markdown: str) -> str | None:
+    """Parse the curator's optional notes: the rest of the notes line plus the lines under it (None if left empty)."""
+    m = _CURATOR_NOTES_RE.search(markdown or "")
+    if not m:
+        return None
+    lines = [m.group(1)]
+    for line in markdown[m.start(1):].splitlines()[1:]:
+        if _NOTES_END_RE.match(line):
+            break
+        lines.append(line.strip())
+    notes = "\n".join(line for line in lines if line)
+    return notes or None
+
+
+def normalize_curator_decision(markdown: str) -> str:
+    """The parts of curator_decision.md Parker acts on, in a canonical form.
+
+    Two decisions that normalize the same ask Parker for the same post bundle, whatever
+    their formatting, template leftovers or unrelated sections.
+    """
+    return (
+        f"Approved: {parse_curator_approval(markdown).status}\n"
+        f"Selected version: {parse_curator_version(markdown) or 'v1'}\n"
+        f"Notes: {parse_curator_notes(markdown) or ''}\n"
+    )
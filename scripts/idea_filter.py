@@ -0,0 +1,104 @@
+"""Local pre-filter for Theo's ideas before the Mabel call.
+
+Each idea parsed from `ideas.md` (see artifact_model.py) is screened in order:
+
+- red lines: `policy.red_line_terms` hits (shared with QC, see policy.py)
+- tone: a `**Tone:**` outside `prefilter.allowed_tones`
+- trend firewall: `prefilter.trend_terms`, whole words as in policy.py (ideas that name a
+  meme format or platform). Being trend-seeded alone is not a reason: Mabel's Trend Gate
+  judges whether an idea depends on trend recognition.
+- near-duplicates: title + premise word overlap (Jaccard) with an earlier kept idea
+  at or above `prefilter.duplicate_threshold`
+
+Mabel only sees the kept ideas; the filtered ones are appended to the `## Rejected`
+section of `approved_ideas.md` with a `prefilter:` reason.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+try:
+    from scripts.artifact_model import Idea
+    from scripts.policy import screen_red_lines, terms_pattern
+except ImportError:
+    from artifact_model import Idea
+    from policy import screen_red_lines, terms_pattern
+
+_NEXT_SECTION_RE = re.compile(r"^##\s+", re.MULTILINE)
+
+DEFAULT_ALLOWED_TONES = ("dry", "warm", "cozy", "sincere", "absurd-light")
+
+
+@dataclass(frozen=True)
+class Rejection:
+    idea: Idea
+    reason: str
+
+
+@dataclass(frozen=True)
+class IdeaScreen:
+    kept: tuple[Idea, ...]
+    rejected: tuple[Rejection, ...]
+
+    def ideas_markdown(self) -> str:
+        """The kept ideas as an `ideas.md` body for Mabel (original numbering kept)."""
+        return "## Ideas\n" + "".join(idea.block for idea in self.kept)
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def screen_ideas(cfg: dict, ideas: list[Idea]) -> IdeaScreen | None:
+    """Split Theo's parsed ideas into kept and rejected (None if there are none to screen)."""
+    if not ideas:
+        return None
+    pf = cfg.get("prefilter") or {}
+    allowed_tones = {t.lower() for t in pf.get("allowed_tones") or DEFAULT_ALLOWED_TONES}
+    trend = terms_pattern(tuple(pf.get("trend_terms") or ()))
+    threshold = float(pf.get("duplicate_threshold", 0.6))
+
+    kept: list[Idea] = []
+    rejected: list[Rejection] = []
+    for idea in ideas:
+        reason = None
+        hits = screen_red_lines(cfg, idea.block)
+        tone = idea.tone.lower()
+        trend_hit = trend.search(idea.block) if trend else None
+        if hits:
+            reason = f'red line "{hits[0].red_line}" (matched "{hits[0].term}")'
+        elif tone and not any(part.strip() in allowed_tones for part in re.split(r"[/,]", tone)):
+            reason = f"tone '{tone}' is not one of {', '.join(sorted(allowed_tones))}"
+        elif trend_hit:
+            reason = f'leans on a trend format or platform (matched "{trend_hit.group(0)}")'
+        else:
+            words = idea.words()
+            dup = next((k for k in kept if jaccard(words, k.words()) >= threshold), None)
+            if dup is not None:
+                reason = f"near-duplicate of idea {dup.index} ({dup.title})"
+        if reason:
+            rejected.append(Rejection(idea, reason))
+        else:
+            kept.append(idea)
+    return IdeaScreen(tuple(kept), tuple(rejected))
+
+
+_REJECTED_RE = re.compile(r"^##\s+Rejected\b.*$", re.IGNORECASE | re.MULTILINE)
+
+
+def merge_rejected(approved_md: str, rejected: tuple[Rejection, ...]) -> str:
+    """Append prefilter rejections to the end of `## Rejected` (adding the section if missing)."""
+    if not rejected:
+        return approved_md
+    entries = "".join(
+        f"- **Title:** {r.idea.title}\n- **Reason (1 line):** prefilter: {r.reason}\n" for r in rejected
+    )
+    m = _REJECTED_RE.search(approved_md)
+    if not m:
+        return approved_md.rstrip("\n") + "\n\n## Rejected (rest)\n" + entries
+    end = _NEXT_SECTION_RE.search(approved_md, m.end())
+    stop = end.start() if end else len(approved_md)
+    section = approved_md[:stop].rstrip("\n") + "\n" + entries
+    return section + ("\n" + approved_md[stop:] if end else "")
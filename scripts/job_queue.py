@@ -0,0 +1,183 @@
+"""Directory-based job queue for the resident worker (`run_pipeline.py --serve`).
+
+Layout under `serve.queue_dir` (default `runs/.queue/`):
+
+    incoming/  job files waiting to run (`<name>.yaml`)
+    active/    jobs the worker has claimed (moved here by an atomic rename)
+    done/      finished jobs, with their outcome
+    failed/    jobs that raised, with the error
+
+A job file is a YAML mapping: `kind: run` (`date`, `slug`, optional `incremental`,
+`speculative`) or `kind: resume` (`run_dir`). Any process can submit a job by writing
+a file into `incoming/` (to a dot-file first, then renamed); `submit` does that. A job
+whose name is already queued or running is not submitted twice. Jobs left in `active/`
+by a worker that died are moved back to `incoming/` when the next worker starts.
+
+Usage:
+  python scripts/job_queue.py submit run --date 2026-02-02 --slug test_run
+  python scripts/job_queue.py submit resume runs/2026-02/2026-02-02_test_run
+  python scripts/job_queue.py status
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+JOB_KINDS = ("run", "resume")
+_STATES = ("incoming", "active", "done", "failed")
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    kind: str
+    spec: dict
+    path: Path  # the job file in `active/`
+
+    @property
+    def run_key(self) -> str:
+        """The run folder name the job touches; the worker runs one job per run folder at a time."""
+        if self.kind == "resume":
+            return Path(str(self.spec.get("run_dir", ""))).name
+        return f"{self.spec.get('date')}_{self.spec.get('slug') or 'run'}"
+
+
+def job_name(spec: dict) -> str:
+    """Default name: one queued job per run folder and kind (e.g. `run-2026-02-02_test_run`)."""
+    if spec.get("kind") == "run" and spec.get("date"):
+        return f"run-{spec['date']}_{spec.get('slug') or 'run'}"
+    if spec.get("kind") == "resume" and spec.get("run_dir"):
+        return f"resume-{Path(str(spec['run_dir'])).name}"
+    return f"{spec.get('kind', 'job')}-{uuid.uuid4().hex[:8]}"
+
+
+class JobQueue:
+    def __init__(self, root: Path):
+        self.root = root
+        for state in _STATES:
+            (root / state).mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, state: str) -> Path:
+        return self.root / state
+
+    def _jobs(self, state: str) -> list[Path]:
+        """Job files in `state`, oldest first."""
+        paths = []
+        for p in self._dir(state).glob("*.yaml"):
+            try:
+                paths.append((p.stat().st_mtime_ns, p.name, p))
+            except FileNotFoundError:
+                continue
+        return [p for _, _, p in sorted(paths)]
+
+    def submit(self, spec: dict, *, name: str | None = None) -> Path | None:
+        """Queue a job; returns its file, or None if a job with this name is already queued or running."""
+        if spec.get("kind") not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {spec.get('kind')!r} (expected one of {', '.join(JOB_KINDS)})")
+        name = name or job_name(spec)
+        target = self._dir("incoming") / f"{name}.yaml"
+        if target.exists() or (self._dir("active") / target.name).exists():
+            return None
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(yaml.safe_dump({**spec, "submitted_at": _now_iso()}, sort_keys=False), encoding="utf-8")
+        os.replace(tmp, target)
+        return target
+
+    def claim(self, *, busy: set[str] | frozenset[str] = frozenset()) -> Job | None:
+        """Move the oldest queued job whose run folder is not in `busy` into `active/`."""
+        for path in self._jobs("incoming"):
+            try:
+                spec = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            except (FileNotFoundError, yaml.YAMLError):
+                continue  # taken by another worker, or still being written by hand
+            job = Job(path.stem, str(spec.get("kind")), spec, self._dir("active") / path.name)
+            if job.run_key in busy:
+                continue
+            try:
+                os.replace(path, job.path)
+            except FileNotFoundError:
+                continue
+            return job
+        return None
+
+    def complete(self, job: Job, outcome: dict) -> Path:
+        return self._finish(job, "done", {"outcome": outcome})
+
+    def fail(self, job: Job, error: str) -> Path:
+        return self._finish(job, "failed", {"error": error})
+
+    def _finish(self, job: Job, state: str, fields: dict) -> Path:
+        record = {**job.spec, **fields, "finished_at": _now_iso()}
+        stamp = dt.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        target = self._dir(state) / f"{job.name}.{stamp}.yaml"
+        tmp = target.with_name(f".{target.name}.tmp")
+        tmp.write_text(yaml.safe_dump(record, sort_keys=False, allow_unicode=True), encoding="utf-8")
+        os.replace(tmp, target)
+        job.path.unlink(missing_ok=True)
+        return target
+
+    def recover(self) -> int:
+        """Requeue jobs a previous worker claimed but never finished; returns how many."""
+        moved = 0
+        for path in self._jobs("active"):
+            os.replace(path, self._dir("incoming") / path.name)
+            moved += 1
+        return moved
+
+    def counts(self) -> dict[str, int]:
+        return {state: len(self._jobs(state)) for state in _STATES}
+
+
+def _now_iso() -> str:
+    return dt.datetime.now().isoformat(timespec="seconds")
+
+
+def open_job_queue(cfg: dict, root_dir: Path) -> JobQueue:
+    return JobQueue(root_dir / str((cfg.get("serve") or {}).get("queue_dir") or "runs/.queue"))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Submit jobs to the resident pipeline worker (run_pipeline.py --serve).")
+    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_submit = sub.add_parser("submit", help="Queue a job")
+    kinds = p_submit.add_subparsers(dest="kind", required=True)
+    p_run = kinds.add_parser("run", help="Run the pipeline for a date/slug")
+    p_run.add_argument("--date", default=None, help="YYYY-MM-DD (defaults to today)")
+    p_run.add_argument("--slug", default="run", help="Run slug (e.g., test_run)")
+    p_run.add_argument("--incremental", action="store_true", help="Skip steps whose recorded inputs are unchanged")
+    p_run.add_argument("--speculative", action="store_true", default=None, help="Draft Parker's post bundle during QC")
+    p_resume = kinds.add_parser("resume", help="Resume a run folder (interrupted run or curator decision)")
+    p_resume.add_argument("run_dir", help="Path to the run folder")
+    sub.add_parser("status", help="Count jobs per state")
+    args = ap.parse_args()
+
+    root_dir = Path(__file__).resolve().parents[1]
+    config_path = Path(args.config)
+    cfg = yaml.safe_load((config_path if config_path.is_absolute() else root_dir / config_path).read_text(encoding="utf-8")) or {}
+    queue = open_job_queue(cfg, root_dir)
+
+    if args.command == "status":
+        print(", ".join(f"{state}: {n}" for state, n in queue.counts().items()))
+        return
+    if args.kind == "run":
+        spec = {"kind": "run", "date": args.date or dt.date.today().isoformat(), "slug": args.slug}
+        if args.incremental:
+            spec["incremental"] = True
+        if args.speculative is not None:
+            spec["speculative"] = args.speculative
+    else:
+        spec = {"kind": "resume", "run_dir": str(Path(args.run_dir).resolve())}
+    path = queue.submit(spec)
+    print(f"Queued: {path}" if path else f"Already queued or running: {job_name(spec)}")
+
+
+if __name__ == "__main__":
+    main()
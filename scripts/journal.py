@@ -0,0 +1,170 @@
+"""Append-only run journal + journaled manifest view.
+
+Every manifest mutation is appended to `run_journal.jsonl` as one JSON line before it is
+applied in memory, so the manifest can always be rebuilt by replaying the journal.
+The YAML `run_manifest.yaml` is only materialized at checkpoints, which keeps per-step
+cost O(1) instead of re-serializing every event after every step.
+
+Record shapes:
+- `{"op": "init", "manifest": {...}}`: replace the whole manifest
+- `{"op": "set", "path": [...], "value": ...}`: set a (nested) key
+- `{"op": "append", "path": [...], "value": ...}`: append to a (nested) list
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+JOURNAL_NAME = "run_journal.jsonl"
+
+
+class RunJournal:
+    """Line-buffered JSONL writer. Each record is flushed; `fsync=True` also syncs to disk."""
+
+    def __init__(self, path: Path, *, fsync: bool = False, truncate: bool = False):
+        self.path = path
+        self.fsync = fsync
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not truncate:
+            _drop_torn_tail(path)
+        self._fh = path.open("w" if truncate else "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def append(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+def _drop_torn_tail(path: Path) -> None:
+    """Cut a partial last line (crash mid-write) so appended records start on a fresh line."""
+    if not path.exists():
+        return
+    with path.open("rb+") as fh:
+        data = fh.read()
+        if not data or data.endswith(b"\n"):
+            return
+        fh.truncate(data.rfind(b"\n") + 1)
+
+
+def apply_record(data: dict[str, Any], record: dict[str, Any]) -> None:
+    op = record["op"]
+    if op == "init":
+        data.clear()
+        data.update(copy.deepcopy(record["manifest"]))
+        return
+    path = record["path"]
+    parent = data
+    for key in path[:-1]:
+        parent = parent.setdefault(key, {})
+    if op == "set":
+        parent[path[-1]] = record["value"]
+    elif op == "append":
+        parent.setdefault(path[-1], []).append(record["value"])
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+
+def iter_journal(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-write; everything before it is intact.
+                return
+
+
+def replay_journal(path: Path) -> dict[str, Any]:
+    """Rebuild a manifest dict from its journal."""
+    data: dict[str, Any] = {}
+    for record in iter_journal(path):
+        apply_record(data, record)
+    return data
+
+
+class RunManifest:
+    """Journaled view over the run manifest (or one of its sections).
+
+    Mutate only through `set()` / `append()`; read like a dict. `section()` returns a
+    view scoped to a nested mapping, e.g. `manifest.section("branches", "01_x")`.
+    """
+
+    def __init__(self, data: dict[str, Any], journal: RunJournal | None = None, scope: tuple[str, ...] = ()):
+        self._root = data
+        self._journal = journal
+        self.scope = scope
+
+    @property
+    def data(self) -> dict[str, Any]:
+        node: Any = self._root
+        for key in self.scope:
+            node = node[key]
+        return node
+
+    def section(self, *keys: str) -> "RunManifest":
+        return RunManifest(self._root, self._journal, self.scope + keys)
+
+    def _write(self, op: str, path: tuple[str, ...], value: Any) -> None:
+        record = {"op": op, "path": list(self.scope + path), "value": value}
+        if self._journal is not None:
+            self._journal.append(record)
+        apply_record(self._root, record)
+
+    def set(self, *path: str, value: Any) -> None:
+        self._write("set", path, value)
+
+    def append(self, *path: str, value: Any) -> None:
+        self._write("append", path, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def snapshot(self) -> dict[str, Any]:
+        return copy.deepcopy(self.data)
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+
+
+def open_run_manifest(
+    run_dir: Path,
+    initial: dict[str, Any] | None,
+    *,
+    fsync: bool = False,
+) -> RunManifest:
+    """Start a fresh journal from `initial`, or (initial=None) continue the existing one."""
+    path = run_dir / JOURNAL_NAME
+    if initial is not None:
+        journal = RunJournal(path, fsync=fsync, truncate=True)
+        data: dict[str, Any] = {}
+        manifest = RunManifest(data, journal)
+        record = {"op": "init", "manifest": initial}
+        journal.append(record)
+        apply_record(data, record)
+        return manifest
+    data = replay_journal(path) if path.exists() else {}
+    return RunManifest(data, RunJournal(path, fsync=fsync))
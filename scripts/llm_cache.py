@@ -0,0 +1,228 @@
+"""Content-addressed cache for provider responses.
+
+Keys hash the agent, system prompt, user payload and resolved provider config, so a
+rerun replays identical calls from disk instead of paying for them again. Entries
+live as one JSON file each under the cache dir (default `runs/.cache/`) and are
+evicted least-recently-used once the cache exceeds its size bound.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+try:
+    from scripts.provenance import sha256_text
+    from scripts.provider import (
+        Provider,
+        ProviderConfig,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        astream,
+        emit_provider_event,
+        stream,
+    )
+except ImportError:
+    from provenance import sha256_text
+    from provider import (
+        Provider,
+        ProviderConfig,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        astream,
+        emit_provider_event,
+        stream,
+    )
+
+CACHE_FORMAT = "v1"
+
+_refresh: ContextVar[bool] = ContextVar("cache_refresh", default=False)
+
+
+@contextmanager
+def refresh_cache() -> Iterator[None]:
+    """Calls made in this context skip cache lookups; their fresh responses replace the entries.
+
+    Used to regenerate an artifact whose cached response violated its contract.
+    """
+    token = _refresh.set(True)
+    try:
+        yield
+    finally:
+        _refresh.reset(token)
+
+
+def cache_key(*, agent_name: str, system_prompt: str, user_payload: str, config: ProviderConfig) -> str:
+    material = {
+        "format": CACHE_FORMAT,
+        "agent": agent_name,
+        "prompt_sha256": sha256_text(system_prompt),
+        "payload_sha256": sha256_text(user_payload),
+        "provider": asdict(config),
+    }
+    return sha256_text(json.dumps(material, sort_keys=True, default=str))
+
+
+class ResponseCache:
+    """On-disk LRU store of provider results (recency = file mtime)."""
+
+    def __init__(self, root: Path, *, max_bytes: int = 256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return record
+
+    def put(self, key: str, record: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._entries())
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[Path]:
+        return [p for p in self.root.glob("*/*.json") if p.is_file()]
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+
+
+class CachingProvider(ProviderWrapper):
+    """Serve repeated requests from a `ResponseCache`; emits `llm_cache` hit/miss events.
+
+    Streams are cached only once they complete; a stream the consumer aborts is not stored.
+    A hit is replayed as a single chunk.
+    """
+
+    def __init__(self, inner: Provider, cache: ResponseCache):
+        super().__init__(inner)
+        self.cache = cache
+
+    def _lookup(self, request: dict[str, Any]) -> tuple[str, ProviderResult | None]:
+        key = cache_key(
+            agent_name=request["agent_name"],
+            system_prompt=request["system_prompt"],
+            user_payload=request["user_payload"],
+            config=request["config"],
+        )
+        if _refresh.get():
+            emit_provider_event("llm_cache", agent=request["agent_name"], result="refresh", key=key)
+            return key, None
+        record = self.cache.get(key)
+        emit_provider_event("llm_cache", agent=request["agent_name"], result="hit" if record else "miss", key=key)
+        if record is None:
+            return key, None
+        return key, ProviderResult(
+            text=record["text"],
+            provider_name=record["provider_name"],
+            model=record["model"],
+            request_id=record.get("request_id"),
+            usage=record.get("usage"),
+        )
+
+    def _store(self, key: str, agent_name: str, result: ProviderResult) -> None:
+        self.cache.put(key, {"agent": agent_name, **asdict(result)})
+
+    def generate(self, **request: Any) -> ProviderResult:
+        key, cached = self._lookup(request)
+        if cached is not None:
+            return cached
+        result = self.inner.generate(**request)
+        self._store(key, request["agent_name"], result)
+        return result
+
+    async def agenerate(self, **request: Any) -> ProviderResult:
+        key, cached = self._lookup(request)
+        if cached is not None:
+            return cached
+        result = await self.inner.agenerate(**request)
+        self._store(key, request["agent_name"], result)
+        return result
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        key, cached = self._lookup(request)
+        if cached is not None:
+            yield _as_chunk(cached)
+            return
+        chunks: list[StreamChunk] = []
+        for chunk in stream(self.inner, **request):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, request["agent_name"], _joined(chunks, request["config"]))
+
+    async def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        key, cached = self._lookup(request)
+        if cached is not None:
+            yield _as_chunk(cached)
+            return
+        chunks: list[StreamChunk] = []
+        async with aclosing(astream(self.inner, **request)) as stream_:
+            async for chunk in stream_:
+                chunks.append(chunk)
+                yield chunk
+        self._store(key, request["agent_name"], _joined(chunks, request["config"]))
+
+
+def _as_chunk(result: ProviderResult) -> StreamChunk:
+    return StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+
+def _joined(chunks: list[StreamChunk], config: ProviderConfig) -> ProviderResult:
+    return ProviderResult(
+        text="".join(c.text for c in chunks),
+        provider_name=config.name,
+        model=config.model,
+        request_id=next((c.request_id for c in reversed(chunks) if c.request_id), None),
+        usage=next((c.usage for c in reversed(chunks) if c.usage), None),
+    )
+
+
+def build_cache_provider(cfg: dict, root_dir: Path, inner: Provider) -> Provider:
+    """Wrap `inner` with the response cache configured under `cache:` (if enabled)."""
+    cache_cfg = cfg.get("cache") or {}
+    if not cache_cfg.get("enabled", False):
+        return inner
+    cache_dir = root_dir / str(cache_cfg.get("dir") or "runs/.cache")
+    max_bytes = int(float(cache_cfg.get("max_mb", 256)) * 1024 * 1024)
+    return CachingProvider(inner, ResponseCache(cache_dir, max_bytes=max_bytes))
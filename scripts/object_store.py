@@ -0,0 +1,141 @@
+"""Content-addressed object store shared by run folders.
+
+Artifacts are stored once under `runs/.objects/<sha256[:2]>/<sha256>` and run folders
+hardlink to them, so byte-identical outputs across runs, reruns and bundle versions
+take the space of one copy. Objects are made read-only. The controller writes artifacts
+atomically (temp file + rename), which replaces a link instead of editing the shared
+object in place. Where a link cannot be made (another filesystem, link limit), the run
+keeps its own copy.
+
+Objects no longer linked from a run folder nor referenced by any run manifest are
+removed by `gc`:
+  python scripts/object_store.py gc [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+import yaml
+
+try:
+    from scripts.provenance import sha256_file
+except ImportError:
+    from provenance import sha256_file
+
+DEFAULT_EXCLUDE = ("curator_decision.md",)  # edited in place by the curator
+
+
+class ObjectStore:
+    def __init__(self, root: Path, *, exclude: tuple[str, ...] = DEFAULT_EXCLUDE):
+        self.root = root
+        self.exclude = frozenset(exclude)
+
+    def path_for(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def intern(self, path: Path, sha256: str | None = None) -> bool:
+        """Store `path`'s content and make `path` a hardlink to the object.
+
+        `sha256` must be the file's current digest if given. Returns True if `path` now
+        shares the object's inode, False if it was excluded or kept as a private copy.
+        """
+        if path.name in self.exclude:
+            return False
+        sha256 = sha256 or sha256_file(path)
+        obj = self.path_for(sha256)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_name(f".{sha256}.{uuid.uuid4().hex}.tmp")
+            try:
+                os.link(path, tmp)
+            except OSError:
+                shutil.copyfile(path, tmp)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, obj)
+        if os.path.samefile(path, obj):
+            return True
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(obj, tmp)
+        except OSError:
+            return False
+        os.replace(tmp, path)
+        return True
+
+    def objects(self) -> Iterator[Path]:
+        if self.root.exists():
+            yield from (p for p in self.root.glob("??/*") if not p.name.endswith(".tmp"))
+
+
+def open_object_store(cfg: dict, root_dir: Path) -> ObjectStore | None:
+    """The object store configured under `object_store:` (None if disabled)."""
+    store_cfg = cfg.get("object_store") or {}
+    if not store_cfg.get("enabled", False):
+        return None
+    return ObjectStore(
+        root_dir / str(store_cfg.get("dir") or "runs/.objects"),
+        exclude=tuple(store_cfg.get("exclude") or DEFAULT_EXCLUDE),
+    )
+
+
+def manifest_hashes(data: dict) -> set[str]:
+    """Every output sha256 recorded in a run manifest (trunk and branches)."""
+    sections = [data, *(data.get("branches") or {}).values()]
+    return {
+        out["sha256"]
+        for section in sections
+        for out in (section.get("outputs") or {}).values()
+        if isinstance(out, dict) and out.get("sha256")
+    }
+
+
+def gc(store: ObjectStore, runs_dir: Path, *, manifest_name: str = "run_manifest.yaml", dry_run: bool = False) -> dict[str, int]:
+    """Remove objects that no run folder links to and no manifest references."""
+    live: set[str] = set()
+    for manifest_path in runs_dir.glob(f"*/*/{manifest_name}"):
+        data = yaml.safe_load(manifest_path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            live |= manifest_hashes(data)
+    counts = {"objects": 0, "live": 0, "removed": 0, "bytes_freed": 0}
+    for obj in store.objects():
+        counts["objects"] += 1
+        st = obj.stat()
+        if obj.name in live or st.st_nlink > 1:
+            counts["live"] += 1
+            continue
+        counts["removed"] += 1
+        counts["bytes_freed"] += st.st_size
+        if not dry_run:
+            obj.unlink()
+    return counts
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Maintain the shared artifact object store.")
+    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_gc = sub.add_parser("gc", help="Delete objects no run folder or manifest still uses")
+    p_gc.add_argument("--dry-run", action="store_true", help="Report what would be removed")
+    args = ap.parse_args()
+
+    root_dir = Path(__file__).resolve().parents[1]
+    config_path = Path(args.config)
+    cfg = yaml.safe_load((config_path if config_path.is_absolute() else root_dir / config_path).read_text(encoding="utf-8")) or {}
+    store = ObjectStore(root_dir / str((cfg.get("object_store") or {}).get("dir") or "runs/.objects"))
+    counts = gc(
+        store,
+        root_dir / cfg["paths"]["runs_dir"],
+        manifest_name=(cfg.get("artifacts") or {}).get("run_manifest", "run_manifest.yaml"),
+        dry_run=args.dry_run,
+    )
+    print(", ".join(f"{key}: {value}" for key, value in counts.items()) + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Deterministic policy screening shared by QC and idea triage.
+
+`policy.red_lines` in project.yaml are the human-readable rules. `policy.red_line_terms`
+maps each red line to screening terms. Terms are case-insensitive and match whole words
+or phrases; a trailing `*` opts a term into stem matching (`humiliat*` also catches
+"humiliating"). Screening is a cheap first pass that flags likely violations before any
+LLM spend; judgment calls remain with the QC and Mabel prompts.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class RedLineHit:
+    red_line: str
+    term: str
+    excerpt: str
+
+    def describe(self, source: str | None = None) -> str:
+        where = f" in {source}" if source else ""
+        return f'"{self.red_line}": matched "{self.term}"{where}: "{self.excerpt}"'
+
+
+def _term_regex(term: str) -> str:
+    """A whole word/phrase, or a word-start stem when the term ends in `*`."""
+    if term.endswith("*"):
+        return rf"(?<!\w){re.escape(term[:-1].rstrip())}\w*"
+    return rf"(?<!\w){re.escape(term)}(?!\w)"
+
+
+@lru_cache(maxsize=64)
+def terms_pattern(words: tuple[str, ...]) -> re.Pattern | None:
+    """Case-insensitive pattern matching any of `words` (see `_term_regex`; None if empty)."""
+    alternation = "|".join(_term_regex(w.strip()) for w in words if w.strip().rstrip("*"))
+    return re.compile(alternation, re.IGNORECASE) if alternation else None
+
+
+def _compile(terms: tuple[tuple[str, tuple[str, ...]], ...]) -> tuple[tuple[str, re.Pattern], ...]:
+    compiled = ((red_line, terms_pattern(words)) for red_line, words in terms)
+    return tuple((red_line, pattern) for red_line, pattern in compiled if pattern is not None)
+
+
+def red_line_patterns(cfg: dict) -> tuple[tuple[str, re.Pattern], ...]:
+    """One compiled pattern per red line that has screening terms (each term set compiled once)."""
+    policy = cfg.get("policy") or {}
+    terms = policy.get("red_line_terms") or {}
+    red_lines = list(policy.get("red_lines") or terms)
+    return _compile(tuple((line, tuple(terms.get(line) or ())) for line in red_lines))
+
+
+def _excerpt(text: str, start: int, end: int, width: int = 40) -> str:
+    left = max(0, start - width)
+    right = min(len(text), end + width)
+    snippet = " ".join(text[left:right].split())
+    return ("…" if left else "") + snippet + ("…" if right < len(text) else "")
+
+
+def screen_red_lines(cfg: dict, text: str) -> list[RedLineHit]:
+    """Every red line whose screening terms occur in `text` (first match per red line)."""
+    hits = []
+    for red_line, pattern in red_line_patterns(cfg):
+        m = pattern.search(text or "")
+        if m:
+            hits.append(RedLineHit(red_line, m.group(0), _excerpt(text, m.start(), m.end())))
+    return hits
@@ -0,0 +1,181 @@
+"""Lightweight run profiling: timed spans with byte/token counters.
+
+A `RunProfiler` is activated per run (a context variable, so concurrent steps, worker
+threads and campaign runs each report to the right run). Instrumented helpers wrap
+their work in `span(...)`; with no active profiler a span costs one context-var lookup.
+
+At the end of a run the spans are aggregated into `run_profile.json` plus a
+human-readable `run_profile.md` in the run folder.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+PROFILE_JSON = "run_profile.json"
+PROFILE_MD = "run_profile.md"
+
+# Counters summed per span name and per step.
+COUNTERS = ("bytes_read", "bytes_written", "payload_bytes", "input_tokens", "output_tokens", "cached_tokens")
+
+
+class RunProfiler:
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.t0 = time.perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, attrs: dict[str, Any]) -> None:
+        record = {
+            "name": name,
+            "step": _step.get(),
+            "start_ms": round((start - self.t0) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+            **{k: v for k, v in attrs.items() if v is not None},
+        }
+        with self._lock:
+            self.spans.append(record)
+
+    def report(self) -> dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        by_name: dict[str, dict[str, Any]] = {}
+        by_step: dict[str, dict[str, Any]] = {}
+        for s in spans:
+            agg = by_name.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            agg["count"] += 1
+            agg["total_ms"] += s["duration_ms"]
+            agg["max_ms"] = max(agg["max_ms"], s["duration_ms"])
+            _add_counters(agg, s)
+            if s["step"] is None:
+                continue
+            step = by_step.setdefault(s["step"], {"duration_ms": 0.0, "llm_ms": 0.0, "llm_calls": 0})
+            if s["name"] == "step":
+                step["duration_ms"] += s["duration_ms"]
+                step["agent"] = s.get("agent")
+                step["skipped"] = s.get("skipped", False)
+                continue
+            if s["name"] == "llm_call":
+                step["llm_ms"] += s["duration_ms"]
+                step["llm_calls"] += 1
+            _add_counters(step, s)
+        for agg in (*by_name.values(), *by_step.values()):
+            for key, value in agg.items():
+                if isinstance(value, float):
+                    agg[key] = round(value, 3)
+        return {
+            "run_id": self.run_id,
+            "wall_ms": round((time.perf_counter() - self.t0) * 1000, 3),
+            "totals": {key: sum(agg.get(key, 0) for agg in by_name.values()) for key in COUNTERS},
+            "by_name": dict(sorted(by_name.items(), key=lambda kv: -kv[1]["total_ms"])),
+            "by_step": by_step,
+            "spans": spans,
+        }
+
+
+def _add_counters(agg: dict[str, Any], span_record: dict[str, Any]) -> None:
+    for key in COUNTERS:
+        if key in span_record:
+            agg[key] = agg.get(key, 0) + span_record[key]
+
+
+_profiler: ContextVar[RunProfiler | None] = ContextVar("run_profiler", default=None)
+_step: ContextVar[str | None] = ContextVar("profile_step", default=None)
+
+
+@contextmanager
+def activate(profiler: RunProfiler | None) -> Iterator[RunProfiler | None]:
+    """Make `profiler` the sink for spans in this context (None disables profiling)."""
+    token = _profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _profiler.reset(token)
+
+
+@contextmanager
+def span(name: str, *, step: str | None = None, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """Time a block. Yields `attrs` so the block can fill in counters (bytes, tokens) as it learns them.
+
+    `step=` marks a pipeline step: every span nested inside it is attributed to that step.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        yield attrs
+        return
+    step_token = _step.set(step) if step is not None else None
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        profiler.add(name, start, time.perf_counter(), attrs)
+        if step_token is not None:
+            _step.reset(step_token)
+
+
+def record_span(name: str, duration_s: float, **attrs: Any) -> None:
+    """Record work that was timed piecemeal (e.g. writes interleaved with a stream)."""
+    profiler = _profiler.get()
+    if profiler is None:
+        return
+    end = time.perf_counter()
+    profiler.add(name, end - duration_s, end, attrs)
+
+
+def write_profile(run_dir: Path, profiler: RunProfiler) -> dict[str, Any]:
+    report = profiler.report()
+    (run_dir / PROFILE_JSON).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    (run_dir / PROFILE_MD).write_text(render_summary(report), encoding="utf-8")
+    return report
+
+
+def render_summary(report: dict[str, Any]) -> str:
+    lines = [
+        "# Run Profile",
+        "",
+        f"Run: {report['run_id']}",
+        f"Wall time: {report['wall_ms'] / 1000:.3f}s",
+        "",
+        "## By step",
+        "",
+        "| Step | Agent | ms | LLM ms | Calls | Payload bytes | Tokens in | Tokens out | Cached | Read bytes | Written bytes |",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for name, s in report["by_step"].items():
+        agent = (s.get("agent") or "") + (" (skipped)" if s.get("skipped") else "")
+        lines.append(
+            f"| {name} | {agent} | {s['duration_ms']:.1f} | {s['llm_ms']:.1f} | {s['llm_calls']} "
+            f"| {s.get('payload_bytes', 0)} | {s.get('input_tokens', 0)} | {s.get('output_tokens', 0)} "
+            f"| {s.get('cached_tokens', 0)} | {s.get('bytes_read', 0)} | {s.get('bytes_written', 0)} |"
+        )
+    lines += [
+        "",
+        "## By span",
+        "",
+        "| Span | Count | Total ms | Max ms | Read bytes | Written bytes |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for name, s in report["by_name"].items():
+        lines.append(
+            f"| {name} | {s['count']} | {s['total_ms']:.1f} | {s['max_ms']:.1f} "
+            f"| {s.get('bytes_read', 0)} | {s.get('bytes_written', 0)} |"
+        )
+    totals = report["totals"]
+    lines += [
+        "",
+        "## Totals",
+        "",
+        f"- Tokens in/out: {totals['input_tokens']} / {totals['output_tokens']} (cached: {totals['cached_tokens']})",
+        f"- Payload bytes sent: {totals['payload_bytes']}",
+        "",
+        "Token counts are estimated (~4 chars/token) where the provider reports no usage.",
+        "",
+    ]
+    return "\n".join(lines)
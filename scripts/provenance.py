@@ -8,6 +8,11 @@ from __future__ import annotations
 import hashlib
 from pathlib import Path
 
+try:
+    from scripts.profiling import span
+except ImportError:
+    from profiling import span
+
 
 def sha256_text(text: str) -> str:
     h = hashlib.sha256()
@@ -17,7 +22,10 @@ def sha256_text(text: str) -> str:
 
 def sha256_file(path: Path) -> str:
     h = hashlib.sha256()
-    with path.open("rb") as f:
+    with span("sha256_file") as attrs, path.open("rb") as f:
+        size = 0
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
+            size += len(chunk)
+        attrs["bytes_read"] = size
     return h.hexdigest()
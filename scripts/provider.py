@@ -6,8 +6,13 @@ Real providers (OpenAI, Anthropic, etc.) should implement the same interface.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, contextmanager
+from contextvars import Context, ContextVar, copy_context
 from dataclasses import dataclass
-from typing import Any, Callable, Protocol
+from typing import Any, AsyncIterator, Callable, Iterator, Protocol
 
 
 @dataclass(frozen=True)
@@ -26,6 +31,29 @@ class ProviderResult:
     usage: dict[str, Any] | None = None
 
 
+@dataclass(frozen=True)
+class PromptPrefix:
+    """Cache-breakpoint hint: `user_payload` starts with `text`, shared verbatim across calls.
+
+    `breakpoints` are offsets into `user_payload` where a context block ends; providers with
+    server-side prompt caching can mark them as cache breakpoints. Others may ignore the hint.
+    """
+
+    text: str
+    sha256: str
+    blocks: tuple[str, ...] = ()
+    breakpoints: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class StreamChunk:
+    """One piece of streamed output. Metadata (request id, usage) may arrive on any chunk."""
+
+    text: str
+    request_id: str | None = None
+    usage: dict[str, Any] | None = None
+
+
 class Provider(Protocol):
     def generate(
         self,
@@ -34,8 +62,71 @@ class Provider(Protocol):
         system_prompt: str,
         user_payload: str,
         config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
     ) -> ProviderResult: ...
 
+    async def agenerate(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> ProviderResult: ...
+
+    def generate_stream(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> Iterator[StreamChunk]: ...
+
+    def agenerate_stream(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> AsyncIterator[StreamChunk]: ...
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One demultiplexed batch result: either `result` or `error` is set.
+
+    `events` are provider events raised while serving the item (retries, throttling, ...),
+    re-emitted in the waiting caller's context.
+    """
+
+    custom_id: str
+    result: ProviderResult | None = None
+    error: BaseException | None = None
+    events: tuple[dict[str, Any], ...] = ()
+
+
+class BatchProvider(Protocol):
+    """Optional batch API: many independent requests submitted as one asynchronous job.
+
+    `requests` maps a caller-chosen custom id to the keyword arguments of `generate()`.
+    `poll_batch` returns "in_progress" or "ended"; `fetch_batch` is only called once ended.
+    `contexts` maps each custom id to its caller's `contextvars` context; a backend that
+    serves requests in-process runs each one in it, a remote one can ignore it.
+    """
+
+    def submit_batch(
+        self, requests: dict[str, dict[str, Any]], *, contexts: dict[str, Context] | None = None
+    ) -> str: ...
+
+    def poll_batch(self, job_id: str) -> str: ...
+
+    def fetch_batch(self, job_id: str) -> list[BatchItem]: ...
+
 
 class StubProvider:
     """Deterministic provider used until a real client is wired."""
@@ -50,11 +141,162 @@ class StubProvider:
         system_prompt: str,
         user_payload: str,
         config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
     ) -> ProviderResult:
         # Intentionally ignores prompt; stub_fn must be deterministic.
         text = self._stub_fn(agent_name, user_payload)
         return ProviderResult(text=text, provider_name=config.name, model=config.model)
 
+    def generate_stream(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> Iterator[StreamChunk]:
+        # Line-sized chunks are close enough to a real token stream for exercising the controller.
+        text = self._stub_fn(agent_name, user_payload)
+        for line in text.splitlines(keepends=True):
+            yield StreamChunk(text=line)
+
+
+class SyncProviderAdapter:
+    """Expose `agenerate()` for a provider that only implements blocking `generate()`.
+
+    Blocking calls run on the adapter's own pool of `max_workers` threads (in the caller's
+    context) so concurrent steps overlap; `agenerate_stream()` likewise pulls each chunk of
+    `generate_stream()` there. A call that outlives its deadline cannot be interrupted: it is
+    abandoned and keeps its thread until the client returns, so clients should apply
+    `config.params["timeout_seconds"]` themselves. The bounded pool keeps abandoned calls
+    from eating into the default executor that the rest of the pipeline shares.
+    """
+
+    def __init__(self, inner: Any, *, max_workers: int = 16):
+        self.inner = inner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sync-provider")
+
+    async def _in_thread(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        call = functools.partial(copy_context().run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def generate(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> ProviderResult:
+        return self.inner.generate(**_request(agent_name, system_prompt, user_payload, config, prefix))
+
+    async def agenerate(
+        self,
+        *,
+        agent_name: str,
+        system_prompt: str,
+        user_payload: str,
+        config: ProviderConfig,
+        prefix: PromptPrefix | None = None,
+    ) -> ProviderResult:
+        return await self._in_thread(
+            self.inner.generate, **_request(agent_name, system_prompt, user_payload, config, prefix)
+        )
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        return stream(self.inner, **request)
+
+    async def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        chunks = stream(self.inner, **request)
+        try:
+            while (chunk := await self._in_thread(next, chunks, None)) is not None:
+                yield chunk
+        finally:
+            try:
+                chunks.close()  # stop the upstream generation when the consumer aborts
+            except ValueError:
+                pass  # cancelled while a worker thread was still inside next()
+
+
+def _request(agent_name: str, system_prompt: str, user_payload: str, config: ProviderConfig, prefix: PromptPrefix | None) -> dict[str, Any]:
+    # `prefix` is only forwarded when set, so providers predating it keep working.
+    request: dict[str, Any] = dict(agent_name=agent_name, system_prompt=system_prompt, user_payload=user_payload, config=config)
+    if prefix is not None:
+        request["prefix"] = prefix
+    return request
+
+
+class ProviderWrapper:
+    """Base for providers that decorate another provider (cache, retry, ...).
+
+    Requests are forwarded as keyword arguments so wrappers stay agnostic to
+    optional request fields.
+    """
+
+    def __init__(self, inner: Provider):
+        self.inner = inner
+
+    def generate(self, **request: Any) -> ProviderResult:
+        return self.inner.generate(**request)
+
+    async def agenerate(self, **request: Any) -> ProviderResult:
+        return await self.inner.agenerate(**request)
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        return stream(self.inner, **request)
+
+    def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        return astream(self.inner, **request)
+
+
+def stream(provider: Any, **request: Any) -> Iterator[StreamChunk]:
+    """`provider.generate_stream(...)`, or the whole `generate()` result as one chunk."""
+    if hasattr(provider, "generate_stream"):
+        yield from provider.generate_stream(**request)
+        return
+    result = provider.generate(**request)
+    yield StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+
+async def astream(provider: Any, **request: Any) -> AsyncIterator[StreamChunk]:
+    """`provider.agenerate_stream(...)`, or the whole `agenerate()` result as one chunk."""
+    if hasattr(provider, "agenerate_stream"):
+        # Close the inner stream deterministically when our consumer stops early.
+        async with aclosing(provider.agenerate_stream(**request)) as chunks:
+            async for chunk in chunks:
+                yield chunk
+        return
+    result = await provider.agenerate(**request)
+    yield StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough output token count (~4 characters per token) when the provider reports no usage."""
+    return (len(text) + 3) // 4
+
+
+def cached_input_tokens(usage: dict[str, Any] | None) -> int | None:
+    """Prompt tokens served from the provider's prefix cache, across common usage shapes."""
+    if not usage:
+        return None
+    for key in ("cached_tokens", "cache_read_input_tokens"):
+        if usage.get(key) is not None:
+            return int(usage[key])
+    for key in ("input_tokens_details", "prompt_tokens_details"):
+        details = usage.get(key) or {}
+        if details.get("cached_tokens") is not None:
+            return int(details["cached_tokens"])
+    return None
+
+
+def as_async_provider(provider: Any, *, max_workers: int = 16) -> Provider:
+    """Return `provider` unchanged if it is already async-capable, else wrap it."""
+    if asyncio.iscoroutinefunction(getattr(provider, "agenerate", None)):
+        return provider
+    return SyncProviderAdapter(provider, max_workers=max_workers)
+
 
 def resolve_provider_config(
     raw_provider: dict[str, Any] | None,
@@ -80,3 +322,25 @@ def resolve_provider_config(
             params[key] = raw_provider[key]
 
     return ProviderConfig(name=name, model=model, params=params)
+
+
+# Wrappers report side-channel facts (cache hits, retries, ...) as provider events.
+# The controller collects them per call and appends them to the run manifest.
+_provider_events: ContextVar[list[dict[str, Any]] | None] = ContextVar("provider_events", default=None)
+
+
+def emit_provider_event(event_type: str, **fields: Any) -> None:
+    """Record an event for the provider call currently in progress (no-op if none)."""
+    sink = _provider_events.get()
+    if sink is not None:
+        sink.append({"type": event_type, **fields})
+
+
+@contextmanager
+def capture_provider_events() -> Iterator[list[dict[str, Any]]]:
+    events: list[dict[str, Any]] = []
+    token = _provider_events.set(events)
+    try:
+        yield events
+    finally:
+        _provider_events.reset(token)
@@ -0,0 +1,414 @@
+"""Provider pool: shared clients and rate limits per provider ref.
+
+Every agent resolves to a provider ref under `providers:` in project.yaml. The pool keeps
+one state per ref, shared by all agents and by every run in the process (campaign runs
+execute on worker threads, each with its own event loop):
+
+- `max_in_flight`: concurrent calls, granted round-robin across (run, agent) queues so one
+  busy agent or run cannot starve the others (`FairSlots`)
+- `rpm` / `tpm`: requests- and tokens-per-minute token buckets (`TokenBucket`); tokens are
+  reserved up front from an estimate and settled against reported usage afterwards
+- clients: one reusable client/HTTP session per ref, created lazily by a factory
+  registered for the provider name, and exposed to the base provider via `pool_client()`
+
+Limits come from `providers.<ref>.limits` and can be overridden per campaign.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import aclosing, contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Callable, Iterator
+
+try:
+    from scripts.provider import (
+        Provider,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        astream,
+        emit_provider_event,
+        estimate_tokens,
+        stream,
+    )
+except ImportError:
+    from provider import (
+        Provider,
+        ProviderResult,
+        ProviderWrapper,
+        StreamChunk,
+        astream,
+        emit_provider_event,
+        estimate_tokens,
+        stream,
+    )
+
+
+def provider_ref_for(cfg: dict, agent_name: str) -> str:
+    route = (cfg.get("agent_routing") or {}).get(agent_name, {})
+    return route.get("provider") or "default"
+
+
+class FairSlots:
+    """Counting semaphore that can be awaited from any event loop or thread.
+
+    Waiters queue per key; freed slots are handed out round-robin across keys
+    (FIFO within a key).
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self._lock = threading.Lock()
+        self._free = limit
+        self._queues: OrderedDict[str, deque] = OrderedDict()
+
+    def _try_take(self) -> bool:
+        if self._free > 0 and not self._queues:
+            self._free -= 1
+            return True
+        return False
+
+    async def acquire(self, key: str = "") -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_take():
+                return
+            fut = loop.create_future()
+            waiter = (loop, fut)
+            self._queues.setdefault(key, deque()).append(waiter)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                if self._discard(key, waiter):
+                    raise
+            # The slot was handed to us as we were cancelled; pass it on.
+            self.release()
+            raise
+
+    def acquire_blocking(self, key: str = "") -> None:
+        event = threading.Event()
+        with self._lock:
+            if self._try_take():
+                return
+            self._queues.setdefault(key, deque()).append((None, event))
+        event.wait()
+
+    def _discard(self, key: str, waiter: tuple) -> bool:
+        queue = self._queues.get(key)
+        if not queue or waiter not in queue:
+            return False
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[key]
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._queues:
+                self._free += 1
+                return
+            key, queue = self._queues.popitem(last=False)
+            loop, waiter = queue.popleft()
+            if queue:
+                self._queues[key] = queue  # back of the rotation
+        if loop is None:
+            waiter.set()
+        else:
+            loop.call_soon_threadsafe(self._grant, waiter)
+
+    def _grant(self, fut: asyncio.Future) -> None:
+        if fut.done():  # cancelled before the hand-off landed
+            self.release()
+        else:
+            fut.set_result(None)
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously. Reservations may overdraw; the caller waits off the debt."""
+
+    def __init__(self, per_minute: float, *, burst: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else per_minute)
+        self._level = self.capacity
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._t) * self.rate)
+        self._t = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` now; return how long to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def settle(self, delta: float) -> None:
+        """Correct an earlier reservation by `delta` (positive = used more than reserved)."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - delta)
+
+    def drain(self) -> None:
+        """Empty the bucket (e.g. after a 429 from the provider)."""
+        with self._lock:
+            self._refill()
+            self._level = min(self._level, 0.0)
+
+
+@dataclass(frozen=True)
+class PoolLimits:
+    max_in_flight: int = 8
+    rpm: float | None = None
+    tpm: float | None = None
+
+    @classmethod
+    def from_config(cls, raw: dict | None) -> "PoolLimits":
+        raw = raw or {}
+        return cls(
+            max_in_flight=int(raw.get("max_in_flight") or cls.max_in_flight),
+            rpm=float(raw["rpm"]) if raw.get("rpm") else None,
+            tpm=float(raw["tpm"]) if raw.get("tpm") else None,
+        )
+
+    def merged(self, override: Any) -> "PoolLimits":
+        """Apply a campaign override: an int (max in-flight) or a mapping of limits."""
+        if override is None:
+            return self
+        if isinstance(override, (int, float)):
+            return replace(self, max_in_flight=int(override))
+        return PoolLimits.from_config({"max_in_flight": self.max_in_flight, "rpm": self.rpm, "tpm": self.tpm, **override})
+
+
+class _RefState:
+    def __init__(self, ref: str, limits: PoolLimits):
+        self.ref = ref
+        self.limits = limits
+        self.slots = FairSlots(limits.max_in_flight)
+        self.rpm = TokenBucket(limits.rpm) if limits.rpm else None
+        self.tpm = TokenBucket(limits.tpm) if limits.tpm else None
+
+    def reserve(self, tokens: int) -> tuple[float, str | None]:
+        waits = []
+        if self.rpm is not None:
+            waits.append((self.rpm.reserve(1), "rpm"))
+        if self.tpm is not None:
+            waits.append((self.tpm.reserve(tokens), "tpm"))
+        wait, reason = max(waits, default=(0.0, None))
+        return wait, (reason if wait > 0 else None)
+
+    def settle(self, reserved: int, used: int) -> None:
+        if self.tpm is not None and used != reserved:
+            self.tpm.settle(used - reserved)
+
+    def rate_limited(self) -> None:
+        for bucket in (self.rpm, self.tpm):
+            if bucket is not None:
+                bucket.drain()
+
+
+# Factories for reusable clients, keyed by provider name (`providers.<ref>.name`).
+_client_factories: dict[str, Callable[[dict], Any]] = {}
+
+
+def register_client_factory(provider_name: str, factory: Callable[[dict], Any]) -> None:
+    """Register how to build a client/HTTP session from a `providers.<ref>` mapping."""
+    _client_factories[provider_name] = factory
+
+
+_current_client: ContextVar[Any] = ContextVar("pool_client", default=None)
+_run_scope: ContextVar[str] = ContextVar("pool_run_scope", default="")
+
+
+def pool_client() -> Any:
+    """The pooled client for the provider call in progress (None if no factory is registered)."""
+    return _current_client.get()
+
+
+@contextmanager
+def pool_scope(run_id: str) -> Iterator[None]:
+    """Tag calls made in this context with `run_id`, so queuing is fair across concurrent runs."""
+    token = _run_scope.set(run_id)
+    try:
+        yield
+    finally:
+        _run_scope.reset(token)
+
+
+class ProviderPool(ProviderWrapper):
+    """Enforce per-ref in-flight, RPM and TPM limits with fair queuing; own per-ref clients.
+
+    The request's `timeout_seconds` deadline is applied here, once the call holds a slot
+    and any throttle wait is over, so time spent queued never counts as a slow provider.
+    """
+
+    # Tells the retrying layer above that per-attempt deadlines are enforced here.
+    applies_timeout = True
+
+    def __init__(self, inner: Provider, cfg: dict, overrides: dict[str, Any] | None = None):
+        super().__init__(inner)
+        self._cfg = cfg
+        self._overrides = overrides or {}
+        self._states: dict[str, _RefState] = {}
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, ref: str) -> PoolLimits:
+        raw = ((self._cfg.get("providers") or {}).get(ref) or {}).get("limits")
+        return PoolLimits.from_config(raw).merged(self._overrides.get(ref))
+
+    def _state(self, ref: str) -> _RefState:
+        with self._lock:
+            if ref not in self._states:
+                self._states[ref] = _RefState(ref, self.limits_for(ref))
+            return self._states[ref]
+
+    def client(self, ref: str) -> Any:
+        with self._lock:
+            if ref not in self._clients:
+                raw = (self._cfg.get("providers") or {}).get(ref) or {}
+                factory = _client_factories.get(str(raw.get("name") or "stub"))
+                self._clients[ref] = factory(raw) if factory else None
+            return self._clients[ref]
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
+
+    def _prepare(self, request: dict[str, Any]) -> tuple[_RefState, str, int]:
+        ref = provider_ref_for(self._cfg, request["agent_name"])
+        key = f"{_run_scope.get()}/{request['agent_name']}"
+        max_out = int(request["config"].params.get("max_output_tokens") or 0)
+        reserved = estimate_tokens(request["system_prompt"] + request["user_payload"]) + max_out
+        return self._state(ref), key, reserved
+
+    def _throttle(self, state: _RefState, request: dict[str, Any], reserved: int) -> float:
+        wait, reason = state.reserve(reserved)
+        if wait > 0:
+            emit_provider_event(
+                "llm_throttled", agent=request["agent_name"], provider=state.ref, reason=reason, wait_s=round(wait, 3),
+            )
+        return wait
+
+    def _failed(self, state: _RefState, exc: BaseException) -> None:
+        if (getattr(exc, "status_code", None) or getattr(exc, "status", None)) == 429:
+            state.rate_limited()
+
+    async def agenerate(self, **request: Any) -> ProviderResult:
+        state, key, reserved = self._prepare(request)
+        await state.slots.acquire(key)
+        token = _current_client.set(self.client(state.ref))
+        try:
+            wait = self._throttle(state, request, reserved)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                result = await asyncio.wait_for(self.inner.agenerate(**request), _timeout(request))
+            except Exception as e:
+                self._failed(state, e)
+                raise
+            state.settle(reserved, _used_tokens(request, result.text, result.usage))
+            return result
+        finally:
+            _current_client.reset(token)
+            state.slots.release()
+
+    def generate(self, **request: Any) -> ProviderResult:
+        state, key, reserved = self._prepare(request)
+        state.slots.acquire_blocking(key)
+        token = _current_client.set(self.client(state.ref))
+        try:
+            wait = self._throttle(state, request, reserved)
+            if wait:
+                time.sleep(wait)
+            try:
+                result = self.inner.generate(**request)
+            except Exception as e:
+                self._failed(state, e)
+                raise
+            state.settle(reserved, _used_tokens(request, result.text, result.usage))
+            return result
+        finally:
+            _current_client.reset(token)
+            state.slots.release()
+
+    async def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        # The slot is held for the whole stream, not just until the first chunk.
+        state, key, reserved = self._prepare(request)
+        await state.slots.acquire(key)
+        token = _current_client.set(self.client(state.ref))
+        chunks: list[StreamChunk] = []
+        try:
+            wait = self._throttle(state, request, reserved)
+            if wait:
+                await asyncio.sleep(wait)
+            timeout = _timeout(request)
+            try:
+                async with aclosing(astream(self.inner, **request)) as upstream:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(anext(upstream), timeout)
+                        except StopAsyncIteration:
+                            break
+                        chunks.append(chunk)
+                        yield chunk
+            except Exception as e:
+                self._failed(state, e)
+                raise
+        finally:
+            state.settle(reserved, _streamed_tokens(request, chunks))
+            with suppress(ValueError):  # finalized from another context (generator not closed by its consumer)
+                _current_client.reset(token)
+            state.slots.release()
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        state, key, reserved = self._prepare(request)
+        state.slots.acquire_blocking(key)
+        token = _current_client.set(self.client(state.ref))
+        chunks: list[StreamChunk] = []
+        try:
+            wait = self._throttle(state, request, reserved)
+            if wait:
+                time.sleep(wait)
+            for chunk in stream(self.inner, **request):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            state.settle(reserved, _streamed_tokens(request, chunks))
+            _current_client.reset(token)
+            state.slots.release()
+
+
+def _timeout(request: dict[str, Any]) -> float | None:
+    """The per-call (for streams: per-chunk) deadline, from `config.params["timeout_seconds"]`."""
+    timeout = request["config"].params.get("timeout_seconds")
+    return float(timeout) if timeout else None
+
+
+def _used_tokens(request: dict[str, Any], output_text: str, usage: dict[str, Any] | None) -> int:
+    usage = usage or {}
+    used_in = usage.get("input_tokens", usage.get("prompt_tokens"))
+    used_out = usage.get("output_tokens", usage.get("completion_tokens"))
+    if used_in is None:
+        used_in = estimate_tokens(request["system_prompt"] + request["user_payload"])
+    if used_out is None:
+        used_out = estimate_tokens(output_text)
+    return int(used_in) + int(used_out)
+
+
+def _streamed_tokens(request: dict[str, Any], chunks: list[StreamChunk]) -> int:
+    usage = next((c.usage for c in reversed(chunks) if c.usage), None)
+    return _used_tokens(request, "".join(c.text for c in chunks), usage)
@@ -0,0 +1,265 @@
+"""Multi-check QC: deterministic pre-checks, LLM check payloads, and the merged report.
+
+A branch's QC runs in two phases (orchestrated by `step_qc` in run_pipeline.py):
+
+1. Deterministic checks run locally: contract completeness of the branch artifacts,
+   red-line screening, character consistency against the character bible, and
+   runtime/bundle format against `run_defaults`. Any FAIL short-circuits QC before LLM spend.
+   Red-line term hits are only screening: by default (`qc.red_line_hits: review`) they are
+   marked REVIEW and handed to the LLM checks with `review_red_lines: true`.
+2. The LLM checks configured under `qc.llm_checks` run concurrently, one QC call each.
+
+`render_qc_report` merges every result into one `qc_report.md` that keeps the
+`- **Status:** PASS/FAIL` line `parse_qc_status` gates on.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from scripts.artifact_contracts import ContractSet
+    from scripts.gates import parse_qc_status
+    from scripts.policy import screen_red_lines
+except ImportError:
+    from artifact_contracts import ContractSet
+    from gates import parse_qc_status
+    from policy import screen_red_lines
+
+# Branch artifacts QC reads, in report order.
+QC_INPUTS = ("scene_brief", "scripts", "scene_plan", "render_report")
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    name: str
+    kind: str  # "deterministic" | "llm"
+    status: str  # PASS | FAIL | REVIEW (flagged for the LLM checks; does not fail QC by itself)
+    findings: tuple[str, ...] = ()  # markdown lines
+    fixes: tuple[str, ...] = ()
+    improvements: tuple[str, ...] = ()
+
+
+def _result(name: str, problems: list[str], ok_note: str) -> CheckResult:
+    if problems:
+        return CheckResult(name, "deterministic", "FAIL", tuple(f"- {p}" for p in problems), tuple(problems))
+    return CheckResult(name, "deterministic", "PASS", (f"- {ok_note}",))
+
+
+# ---------------------------
+# Deterministic checks
+# ---------------------------
+
+def contract_check(contracts: ContractSet, texts: dict[str, str]) -> CheckResult:
+    problems = []
+    for key, text in texts.items():
+        result = contracts.validate(key, text)
+        problems += [f"{key}: {v}" for v in result.violations or ((result.message,) if not result.ok else ())]
+    return _result("contract", problems, "All branch artifacts satisfy their contracts.")
+
+
+def red_line_check(cfg: dict, texts: dict[str, str]) -> CheckResult:
+    """Screening-term hits FAIL only with `qc.red_line_hits: fail` or when no LLM check reviews them."""
+    problems = [hit.describe(key) for key, text in texts.items() for hit in screen_red_lines(cfg, text)]
+    reviewers = red_line_reviewers(cfg)
+    if problems and reviewers and (cfg.get("qc") or {}).get("red_line_hits", "review") == "review":
+        return CheckResult("red_lines", "deterministic", "REVIEW", tuple(f"- {p}" for p in problems))
+    return _result("red_lines", problems, "No red-line screening terms found.")
+
+
+_CARD_RE = re.compile(r"^###\s+(.+?)\s*$", re.MULTILINE)
+
+
+def bible_characters(bible_text: str) -> set[str]:
+    """Character names: `### Name` headings whose card has a `**Role in world:**` line."""
+    names = set()
+    headings = list(_CARD_RE.finditer(bible_text or ""))
+    for i, m in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(bible_text)
+        name = m.group(1)
+        if "**Role in world:**" in bible_text[m.end():end] and not name.startswith("{"):
+            names.add(name)
+    return names
+
+
+_SPEAKER_RE = re.compile(r"^\s*[-*]\s*([A-Z][\w'’.-]*(?: [A-Z][\w'’.-]*)?)\s*:", re.MULTILINE)
+
+
+def _section(markdown: str, heading_re: str) -> str:
+    """Body of every section whose heading matches `heading_re` (up to the next heading of any level)."""
+    parts = []
+    for m in re.finditer(rf"^#+\s*{heading_re}.*$", markdown or "", re.IGNORECASE | re.MULTILINE):
+        nxt = re.search(r"^#+\s", markdown[m.end():], re.MULTILINE)
+        parts.append(markdown[m.end(): m.end() + nxt.start()] if nxt else markdown[m.end():])
+    return "\n".join(parts)
+
+
+def speakers(texts: dict[str, str]) -> dict[str, set[str]]:
+    """Named characters per artifact: dialogue/punchline speakers and the brief's cast list."""
+    found = {}
+    for key, heading in (("scripts", r"(Dialogue|Alt Punchlines)"), ("scene_brief", r"Characters Present")):
+        section = _section(texts.get(key, ""), heading)
+        names = {m.group(1) for m in _SPEAKER_RE.finditer(section)}
+        if names:
+            found[key] = names
+    return found
+
+
+def character_check(bible_text: str, texts: dict[str, str], *, extra_speakers: tuple[str, ...] = ()) -> CheckResult:
+    known = bible_characters(bible_text) | set(extra_speakers)
+    problems = [
+        f"{key}: '{name}' is not in the character bible"
+        for key, names in sorted(speakers(texts).items())
+        for name in sorted(names - known)
+    ]
+    return _result("roster", problems, f"All named characters are in the bible ({', '.join(sorted(known)) or 'none'}).")
+
+
+_RUNTIME_RE = re.compile(r"\*\*Runtime:\*\*\s*(\d+(?:\.\d+)?)\s*(?:s\b|sec|seconds)?", re.IGNORECASE)
+_VERSION_RE = re.compile(r"\*\*Version:\*\*\s*(v\d+|final)\b", re.IGNORECASE)
+
+
+def render_version(render_report: str) -> str | None:
+    m = _VERSION_RE.search(render_report or "")
+    return m.group(1).lower() if m else None
+
+
+def duration_check(cfg: dict, render_report: str, bundle_root: Path | None) -> CheckResult:
+    run_defaults = cfg.get("run_defaults") or {}
+    tolerance = float((cfg.get("qc") or {}).get("duration_tolerance_s", 5))
+    problems = []
+    m = _RUNTIME_RE.search(render_report or "")
+    target = run_defaults.get("target_seconds")
+    if not m:
+        problems.append("render_report: no `**Runtime:**` reported")
+    elif target is not None and abs(float(m.group(1)) - float(target)) > tolerance:
+        problems.append(f"render_report: runtime {m.group(1)}s is outside {target}s ± {tolerance:g}s")
+    version = render_version(render_report)
+    if version is None:
+        problems.append("render_report: no `**Version:**` reported")
+    elif bundle_root is not None and not any((bundle_root / version).glob("*")):
+        problems.append(f"render prompt bundle {bundle_root.name}/{version} is missing or empty")
+    runtime = f"{m.group(1)}s" if m else "?"
+    return _result("duration", problems, f"Runtime {runtime} within {target}s ± {tolerance:g}s; bundle {version} present.")
+
+
+def run_deterministic_checks(
+    cfg: dict,
+    contracts: ContractSet,
+    texts: dict[str, str],
+    *,
+    bible_text: str,
+    bundle_root: Path | None,
+) -> list[CheckResult]:
+    extra = tuple((cfg.get("qc") or {}).get("extra_speakers") or ())
+    return [
+        contract_check(contracts, texts),
+        red_line_check(cfg, texts),
+        character_check(bible_text, texts, extra_speakers=extra),
+        duration_check(cfg, texts.get("render_report", ""), bundle_root),
+    ]
+
+
+# ---------------------------
+# LLM checks
+# ---------------------------
+
+def llm_checks(cfg: dict) -> dict[str, dict]:
+    """`qc.llm_checks` (name -> {focus, inputs, policy}); one QC call runs per check."""
+    return dict((cfg.get("qc") or {}).get("llm_checks") or {"review": {"inputs": ["render_report"]}})
+
+
+def red_line_reviewers(cfg: dict) -> tuple[str, ...]:
+    """LLM checks that judge red-line screening hits in context (`review_red_lines: true`)."""
+    return tuple(name for name, spec in llm_checks(cfg).items() if spec.get("review_red_lines"))
+
+
+def qc_policy_keys(cfg: dict) -> tuple[str, ...]:
+    """Policy docs QC reads: the character bible plus every doc an LLM check is given."""
+    keys = {"character_bible"} | {key for spec in llm_checks(cfg).values() for key in spec.get("policy") or ()}
+    return tuple(key for key in (cfg.get("policy") or {}) if key in keys)
+
+
+def llm_check_payload(cfg: dict, name: str, spec: dict, texts: dict[str, str], flagged: tuple[str, ...] = ()) -> str:
+    """One check's payload; `flagged` (red-line screening findings) goes to `review_red_lines` checks."""
+    red_lines = (cfg.get("policy") or {}).get("red_lines") or []
+    parts = [f"CHECK: {name}\n"]
+    if spec.get("focus"):
+        parts.append(f"Focus: {spec['focus']}\n")
+    if red_lines:
+        parts.append("Red lines:\n" + "".join(f"- {line}\n" for line in red_lines))
+    if flagged and spec.get("review_red_lines"):
+        parts.append(
+            "Red-line screening hits (keyword matches; FAIL only if the content actually crosses the red line):\n"
+            + "".join(f"{line}\n" for line in flagged)
+        )
+    for key in spec.get("inputs") or ["render_report"]:
+        parts.append(f"\n--- {key}.md ---\n{texts.get(key, '')}\n")
+    return "".join(parts)
+
+
+def parse_llm_check(name: str, text: str) -> CheckResult:
+    """Status, findings, fixes and improvements from one QC call (UNKNOWN status counts as FAIL)."""
+    status = parse_qc_status(text).status
+    findings = _section(text, r"Findings\s*$") + _subsections(text)
+    lines = tuple(line for line in findings.splitlines() if line.strip())
+    fixes = tuple(_items(_section(text, r"Required Fixes")))
+    improvements = tuple(_items(_section(text, r"Optional Improvements")))
+    if status not in ("PASS", "FAIL"):
+        return CheckResult(name, "llm", "FAIL", lines + ("- QC check returned no PASS/FAIL status",), fixes or ("Re-run QC",), improvements)
+    return CheckResult(name, "llm", status, lines, fixes, improvements)
+
+
+def _subsections(text: str) -> str:
+    """`### ...` subsections that follow `## Findings`, demoted one level for nesting in the merged report."""
+    m = re.search(r"^##\s+Findings\s*$", text or "", re.MULTILINE)
+    if not m:
+        return ""
+    rest = text[m.end():]
+    end = re.search(r"^##\s", rest, re.MULTILINE)
+    body = rest[: end.start()] if end else rest
+    first = re.search(r"^###\s", body, re.MULTILINE)
+    return re.sub(r"^###\s", "#### ", body[first.start():], flags=re.MULTILINE) if first else ""
+
+
+def _items(section: str) -> list[str]:
+    items = []
+    for line in section.splitlines():
+        m = re.match(r"^\s*(?:\d+[.)]|[-*])\s+(.*\S)", line)
+        if m and m.group(1) not in ("...", "…"):
+            items.append(m.group(1))
+    return items
+
+
+# ---------------------------
+# Merged report
+# ---------------------------
+
+def render_qc_report(results: list[CheckResult], *, version: str | None, skipped: tuple[str, ...] = ()) -> str:
+    status = "FAIL" if any(r.status == "FAIL" for r in results) else "PASS"
+    summary = [f"{r.name} {r.status}" for r in results] + [f"{name} skipped" for name in skipped]
+    lines = [
+        "## QC Result",
+        f"- **Status:** {status}",
+        f"- **Version reviewed:** {version or 'unknown'}",
+        f"- **Checks:** {' · '.join(summary)}",
+        "",
+        "## Findings",
+    ]
+    for r in results:
+        lines.append(f"### {r.name} ({r.kind}) — {r.status}")
+        lines += list(r.findings) or ["- (no findings reported)"]
+        lines.append("")
+    if skipped:
+        lines += ["### Skipped", f"- Deterministic checks failed; LLM checks not run: {', '.join(skipped)}", ""]
+    if status == "FAIL":
+        fixes = [f"{r.name}: {fix}" for r in results if r.status == "FAIL" for fix in r.fixes]
+        lines.append("## Required Fixes (if FAIL)")
+        lines += [f"{i}. {fix}" for i, fix in enumerate(fixes, 1)] or ["1. See findings above."]
+    else:
+        improvements = [f"{r.name}: {item}" for r in results for item in r.improvements]
+        lines.append("## Optional Improvements (if PASS)")
+        lines += [f"- {item}" for item in improvements] or ["- none"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,169 @@
+"""Offline render-budget preflight for a branch's scene plan.
+
+Runs after Rowan's scene plan and before any Evan/render spend. From the plan's shots
+(see `render_bundle.plan_shots`) and `run_defaults` (fps, resolution, target_seconds) it
+estimates, per shot, the frame count, generation cost and generation time using the
+local cost model under `render_budget.cost_model`:
+
+    scale     = pixels(resolution) / pixels(reference_resolution)
+    cost_usd  = seconds * usd_per_second[shot size] * scale
+    render_s  = shot_overhead_s + seconds * render_s_per_second * scale
+
+Shots are ordered longest-first (by estimated render time) so `workers` parallel
+render workers finish as early as possible; the wall-clock estimate is that
+schedule's makespan. A plan is rejected if it breaks any `render_budget.limits`. A plan
+shorter than `target_seconds` is cheaper, not over budget: the shortfall is only recorded
+as a warning (QC's duration check judges runtime against the target).
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import asdict, dataclass
+
+try:
+    from scripts.artifact_model import Shot
+except ImportError:
+    from artifact_model import Shot
+
+DEFAULT_COST_MODEL = {
+    "usd_per_second": {"default": 0.10},
+    "render_s_per_second": 30.0,
+    "shot_overhead_s": 15.0,
+    "reference_resolution": "1080x1920",
+}
+
+
+@dataclass(frozen=True)
+class ShotEstimate:
+    shot: int
+    size: str
+    seconds: float
+    frames: int
+    cost_usd: float
+    render_s: float
+
+
+@dataclass(frozen=True)
+class RenderBudget:
+    shots: tuple[ShotEstimate, ...]  # plan order
+    order: tuple[int, ...]  # shot numbers, longest render first
+    runtime_s: float
+    frames: int
+    cost_usd: float
+    render_s_serial: float
+    render_s_wall: float  # longest-first makespan across `workers`
+    workers: int
+    violations: tuple[str, ...] = ()
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def to_manifest(self) -> dict:
+        return {
+            "decision": "PASS" if self.ok else "FAIL",
+            "runtime_s": self.runtime_s,
+            "frames": self.frames,
+            "cost_usd": self.cost_usd,
+            "render_s_serial": self.render_s_serial,
+            "render_s_wall": self.render_s_wall,
+            "workers": self.workers,
+            "order": list(self.order),
+            "violations": list(self.violations),
+            "warnings": list(self.warnings),
+            "shots": [asdict(s) for s in self.shots],
+        }
+
+    def to_markdown(self) -> str:
+        lines = [
+            "## Render Budget (preflight estimate)",
+            f"- **Decision:** {'PASS' if self.ok else 'FAIL'}",
+            f"- Runtime: {self.runtime_s:g}s · Frames: {self.frames}",
+            f"- Estimated cost: ${self.cost_usd:.2f}",
+            f"- Estimated render time: {self.render_s_wall / 60:.1f} min on {self.workers} workers "
+            f"({self.render_s_serial / 60:.1f} min serial)",
+            f"- Render order (longest first): {', '.join(f'shot {n}' for n in self.order)}",
+        ]
+        lines += [f"- Over budget: {v}" for v in self.violations]
+        lines += [f"- Warning: {w}" for w in self.warnings]
+        lines += ["", "| Shot | Size | Seconds | Frames | Cost (USD) | Render (s) |", "|---|---|---|---|---|---|"]
+        lines += [
+            f"| {s.shot} | {s.size} | {s.seconds:g} | {s.frames} | {s.cost_usd:.2f} | {s.render_s:.0f} |"
+            for s in self.shots
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _pixels(resolution: str | None) -> int | None:
+    m = re.match(r"^\s*(\d+)\s*[x×]\s*(\d+)\s*$", str(resolution or ""))
+    return int(m.group(1)) * int(m.group(2)) if m else None
+
+
+def makespan(durations: list[float], workers: int) -> float:
+    """Finish time when `durations` (already longest-first) go to the next free worker."""
+    free = [0.0] * max(1, workers)
+    for d in durations:
+        heapq.heapreplace(free, free[0] + d)
+    return max(free)
+
+
+def estimate_render(cfg: dict, shots: tuple[Shot, ...]) -> RenderBudget:
+    rd = cfg.get("run_defaults") or {}
+    budget_cfg = cfg.get("render_budget") or {}
+    model = {**DEFAULT_COST_MODEL, **(budget_cfg.get("cost_model") or {})}
+    limits = budget_cfg.get("limits") or {}
+    workers = int(budget_cfg.get("workers", 4))
+
+    fps = float(rd.get("fps") or 30)
+    pixels, reference = _pixels(rd.get("resolution")), _pixels(model["reference_resolution"])
+    scale = pixels / reference if pixels and reference else 1.0
+    rates = model["usd_per_second"] or {}
+
+    estimates = []
+    for shot in shots:
+        seconds = float(shot.seconds or 0.0)
+        rate = float(rates.get(shot.size.lower(), rates.get("default", 0.0)))
+        estimates.append(ShotEstimate(
+            shot=shot.index,
+            size=shot.size,
+            seconds=seconds,
+            frames=round(seconds * fps),
+            cost_usd=round(seconds * rate * scale, 4),
+            render_s=round(float(model["shot_overhead_s"]) + seconds * float(model["render_s_per_second"]) * scale, 1),
+        ))
+    ranked = sorted(estimates, key=lambda e: (-e.render_s, e.shot))
+    runtime = sum(e.seconds for e in estimates)
+    cost = round(sum(e.cost_usd for e in estimates), 2)
+    wall = round(makespan([e.render_s for e in ranked], workers), 1) if ranked else 0.0
+
+    violations, warnings = [], []
+    target = rd.get("target_seconds")
+    tolerance = float(limits.get("runtime_tolerance_s", 5))
+    if target is not None and runtime > float(target) + tolerance:
+        violations.append(f"planned runtime {runtime:g}s is over {target}s + {tolerance:g}s")
+    elif target is not None and runtime < float(target) - tolerance:
+        warnings.append(f"planned runtime {runtime:g}s is under {target}s - {tolerance:g}s")
+    if limits.get("max_shots") is not None and len(estimates) > int(limits["max_shots"]):
+        violations.append(f"{len(estimates)} shots > max_shots {limits['max_shots']}")
+    if limits.get("max_cost_usd") is not None and cost > float(limits["max_cost_usd"]):
+        violations.append(f"estimated cost ${cost:.2f} > max_cost_usd ${float(limits['max_cost_usd']):.2f}")
+    if limits.get("max_wall_minutes") is not None and wall > float(limits["max_wall_minutes"]) * 60:
+        violations.append(f"estimated render time {wall / 60:.1f} min > max_wall_minutes {limits['max_wall_minutes']}")
+    if not estimates:
+        violations.append("scene plan has no shots or beats to render")
+
+    return RenderBudget(
+        shots=tuple(estimates),
+        order=tuple(e.shot for e in ranked),
+        runtime_s=runtime,
+        frames=sum(e.frames for e in estimates),
+        cost_usd=cost,
+        render_s_serial=round(sum(e.render_s for e in estimates), 1),
+        render_s_wall=wall,
+        workers=workers,
+        violations=tuple(violations),
+        warnings=tuple(warnings),
+    )
@@ -0,0 +1,160 @@
+"""Evan's render prompt bundle: per-shot jobs, versioned folders and the bundle index.
+
+A bundle is built from the parsed scene plan and script (artifact_model.py):
+
+- one `shot_NN.txt` image/video prompt per shot in the plan's Shot Plan (or one per
+  beat if the plan lists no shots; untimed shots share `run_defaults.target_seconds`)
+- `voice.txt` (only if the script has spoken dialogue)
+- `subtitles.txt` (only if the script has subtitle text)
+- `edit_notes.md`: assembly order and timecodes, written locally
+
+Every prompt file is an independent Evan call; `step_evan` runs them concurrently. Each
+render creates the next version folder (`render_prompts/v1`, `v2`, ...), and
+`render_prompts/index.yaml` lists every version with its files, shots and hashes.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import yaml
+
+try:
+    from scripts.artifact_model import ScenePlan, Script, Shot
+except ImportError:
+    from artifact_model import ScenePlan, Script, Shot
+
+BUNDLE_DIR = "render_prompts"
+INDEX_NAME = "index.yaml"
+_VERSION_RE = re.compile(r"^v(\d+)$")
+_REPORT_VERSION_RE = re.compile(r"^(\s*[-*]\s*\*\*Version:\*\*).*$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class BundleJob:
+    file: str  # file name inside the version folder
+    kind: str  # shot | voice | subtitles
+    payload: str
+    shot: Shot | None = None
+
+
+def plan_shots(plan: ScenePlan, target_seconds: float | None) -> tuple[Shot, ...]:
+    """The plan's shots (or one shot per beat), every one with a duration.
+
+    Shots without a duration share whatever `target_seconds` the timed shots leave.
+    """
+    shots = plan.shots or tuple(Shot(b.index, "medium", b.text) for b in plan.beats)
+    untimed = [s for s in shots if s.seconds is None]
+    if not untimed or not target_seconds:
+        return shots
+    left = max(float(target_seconds) - sum(s.seconds or 0.0 for s in shots), 0.0)
+    each = round(left / len(untimed), 2)
+    return tuple(s if s.seconds is not None else replace(s, seconds=each) for s in shots)
+
+
+def next_version(bundle_root: Path) -> str:
+    existing = [int(m.group(1)) for p in bundle_root.glob("v*") if p.is_dir() and (m := _VERSION_RE.match(p.name))]
+    return f"v{max(existing, default=0) + 1}"
+
+
+def stamp_version(render_report: str, version: str) -> str:
+    """Set the report's `**Version:**` to the bundle version the controller actually wrote."""
+    return _REPORT_VERSION_RE.sub(lambda m: f"{m.group(1)} {version}", render_report, count=1)
+
+
+def _constraints(cfg: dict) -> str:
+    rd = cfg.get("run_defaults") or {}
+    return (
+        f"Aspect ratio: {rd.get('aspect_ratio')}\n"
+        f"Resolution: {rd.get('resolution')}\n"
+        f"FPS: {rd.get('fps')}\n"
+        f"Target seconds: {rd.get('target_seconds')}\n"
+    )
+
+
+def _shot_line(shot: Shot, total: int) -> str:
+    seconds = f" — {shot.seconds:g}s" if shot.seconds is not None else ""
+    return f"Shot {shot.index} of {total}: {shot.size} — {shot.action}{seconds}"
+
+
+def plan_bundle_jobs(
+    cfg: dict,
+    plan: ScenePlan,
+    script: Script,
+    shots: tuple[Shot, ...],
+    *,
+    version: str,
+    order: tuple[int, ...] = (),
+) -> list[BundleJob]:
+    """One Evan call per prompt file; each payload carries only what that file needs.
+
+    Shot jobs follow `order` (shot numbers, e.g. the preflight's longest-first order).
+    """
+    header = f"Bundle version: {version}\n{_constraints(cfg)}\n"
+    beats = "".join(f"{b.index}. {b.text}\n" for b in plan.beats)
+    rank = {n: i for i, n in enumerate(order)}
+    jobs = []
+    for shot in sorted(shots, key=lambda s: rank.get(s.index, len(rank))):
+        jobs.append(BundleJob(
+            f"shot_{shot.index:02d}.txt", "shot",
+            (
+                "OUTPUT: shot_prompt\n"
+                f"{header}"
+                f"Scene: {plan.title} ({plan.mode or 'sketch'})\n"
+                f"{_shot_line(shot, len(shots))}\n\n"
+                f"Beats:\n{beats}\n"
+                f"Character placement:\n{plan.placement}\n\n"
+                f"Environment & props:\n{plan.environment}\n"
+            ),
+            shot,
+        ))
+    if script.dialogue:
+        lines = "".join(f"- {d.speaker}: {d.text}\n" for d in script.dialogue)
+        jobs.append(BundleJob("voice.txt", "voice", f"OUTPUT: voice\n{header}Scene: {plan.title}\n\nDialogue:\n{lines}"))
+    if script.subtitles:
+        timing = "".join(f"- {_shot_line(s, len(shots))}\n" for s in shots)
+        lines = "".join(f"{line}\n" for line in script.subtitles)
+        jobs.append(BundleJob(
+            "subtitles.txt", "subtitles",
+            f"OUTPUT: subtitles\n{header}Scene: {plan.title}\n\nShots:\n{timing}\nSubtitle text:\n{lines}",
+        ))
+    return jobs
+
+
+def edit_notes(plan: ScenePlan, shots: tuple[Shot, ...], *, version: str) -> str:
+    """Assembly order with cumulative timecodes (no LLM call needed)."""
+    lines = [f"# Edit notes — {plan.title} ({version})", "", "## Assembly order"]
+    t = 0.0
+    for shot in shots:
+        end = t + (shot.seconds or 0.0)
+        lines.append(f"{shot.index}. `shot_{shot.index:02d}.txt` {t:.1f}s → {end:.1f}s — {shot.size}: {shot.action}")
+        t = end
+    lines += ["", f"Runtime (planned): {t:g} seconds"]
+    return "\n".join(lines) + "\n"
+
+
+def update_index(
+    bundle_root: Path,
+    version: str,
+    entries: list[dict],
+    *,
+    created_at: str,
+    runtime_seconds: float,
+    render_order: tuple[int, ...] = (),
+) -> Path:
+    """Add `version` to `render_prompts/index.yaml` and mark it latest."""
+    index_path = bundle_root / INDEX_NAME
+    index = {}
+    if index_path.exists():
+        index = yaml.safe_load(index_path.read_text(encoding="utf-8")) or {}
+    versions = index.get("versions") or {}
+    versions[version] = {"created_at": created_at, "runtime_seconds": runtime_seconds, "files": entries}
+    if render_order:
+        versions[version]["render_order"] = list(render_order)
+    index = {"latest": version, "versions": versions}
+    tmp = index_path.with_name(f".{INDEX_NAME}.tmp")
+    tmp.write_text(yaml.safe_dump(index, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    tmp.replace(index_path)
+    return index_path
@@ -0,0 +1,283 @@
+"""Deadlines, retries and circuit breakers for provider calls.
+
+`ResilientProvider` enforces `timeout_seconds` and `max_retries` from the resolved
+provider config (falling back to the `resilience:` block in project.yaml). When the
+layer below queues calls (`ProviderPool`), the deadline is handed down and applied there
+once the call starts, so waiting for a slot or a rate limit is never a timeout. Transient
+failures are retried with capped exponential backoff and full jitter; a circuit breaker
+per provider ref fails calls fast once a provider keeps failing. Retries and breaker
+trips are reported as provider events, so they land in the run manifest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Iterator
+
+try:
+    from scripts.provider import Provider, ProviderResult, ProviderWrapper, StreamChunk, astream, emit_provider_event
+    from scripts.provider_pool import provider_ref_for
+except ImportError:
+    from provider import Provider, ProviderResult, ProviderWrapper, StreamChunk, astream, emit_provider_event
+    from provider_pool import provider_ref_for
+
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+
+class TransientProviderError(RuntimeError):
+    """Raised by providers for failures worth retrying (rate limits, overload, dropped connections)."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider's circuit breaker is open; the call was not attempted."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError, TransientProviderError)):
+        return True
+    if getattr(exc, "retryable", False):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    return status in RETRYABLE_STATUS
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    timeout_seconds: float | None = 120.0
+    max_retries: int = 2
+    backoff_base_s: float = 0.5
+    backoff_max_s: float = 20.0
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1)))
+
+    def for_params(self, params: dict[str, Any]) -> "RetryPolicy":
+        """Apply per-provider `timeout_seconds` / `max_retries` overrides."""
+        timeout = params.get("timeout_seconds", self.timeout_seconds)
+        return RetryPolicy(
+            timeout_seconds=float(timeout) if timeout else None,
+            max_retries=int(params.get("max_retries", self.max_retries)),
+            backoff_base_s=self.backoff_base_s,
+            backoff_max_s=self.backoff_max_s,
+        )
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after `reset_s` one trial call is let through."""
+
+    def __init__(self, failure_threshold: int = 5, reset_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_s = reset_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset_s else "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_s or self._trial_in_flight:
+                raise CircuitOpenError("circuit open")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def abandon(self) -> None:
+        """The call was cancelled before it could tell us anything; free the trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this failure opened (or re-opened) the breaker."""
+        with self._lock:
+            self._failures += 1
+            trial = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial or self._failures >= self.failure_threshold:
+                was_closed = self._opened_at is None
+                self._opened_at = time.monotonic()
+                return was_closed or trial
+            return False
+
+
+def _describe(exc: BaseException, policy: RetryPolicy) -> str:
+    if isinstance(exc, TimeoutError) and not str(exc):
+        return f"TimeoutError: no response within {policy.timeout_seconds}s"
+    return f"{type(exc).__name__}: {exc}"
+
+
+class ResilientProvider(ProviderWrapper):
+    """Per-attempt deadlines, retries with backoff, and a circuit breaker per provider ref."""
+
+    def __init__(self, inner: Provider, cfg: dict, policy: RetryPolicy, *, breaker_failures: int = 5, breaker_reset_s: float = 30.0):
+        super().__init__(inner)
+        self._cfg = cfg
+        self.policy = policy
+        self._breaker_args = (breaker_failures, breaker_reset_s)
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        # Deadlines go around the inner call only if it doesn't apply them itself.
+        self._own_deadline = not getattr(inner, "applies_timeout", False)
+
+    def breaker(self, provider_ref: str) -> CircuitBreaker:
+        with self._lock:
+            if provider_ref not in self._breakers:
+                self._breakers[provider_ref] = CircuitBreaker(*self._breaker_args)
+            return self._breakers[provider_ref]
+
+    def _prepare(self, request: dict[str, Any]) -> tuple[str, CircuitBreaker, RetryPolicy]:
+        ref = provider_ref_for(self._cfg, request["agent_name"])
+        return ref, self.breaker(ref), self.policy.for_params(request["config"].params)
+
+    @staticmethod
+    def _with_deadline(request: dict[str, Any], policy: RetryPolicy) -> dict[str, Any]:
+        """Pass the attempt deadline down as `config.params["timeout_seconds"]`.
+
+        The provider pool applies it once the call starts. `wait_for` can only abandon a blocking call that overruns; a client that applies
+        the timeout to its own request actually stops it and frees the thread.
+        """
+        config = request["config"]
+        if policy.timeout_seconds is None or "timeout_seconds" in config.params:
+            return request
+        params = {**config.params, "timeout_seconds": policy.timeout_seconds}
+        return {**request, "config": replace(config, params=params)}
+
+    def _deadline(self, policy: RetryPolicy) -> float | None:
+        return policy.timeout_seconds if self._own_deadline else None
+
+    def _enter(self, ref: str, breaker: CircuitBreaker, request: dict[str, Any]) -> None:
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            emit_provider_event("llm_circuit_open", agent=request["agent_name"], provider=ref)
+            raise CircuitOpenError(f"Circuit breaker open for provider '{ref}'") from None
+
+    def _failed(self, ref: str, breaker: CircuitBreaker, request: dict[str, Any], exc: BaseException, attempt: int, policy: RetryPolicy) -> float | None:
+        """Record a failed attempt. Returns the backoff delay, or None if the error should propagate."""
+        if not is_retryable(exc):
+            breaker.record_success()  # the provider answered; the failure is not about its health
+            return None
+        if breaker.record_failure():
+            emit_provider_event("llm_circuit_tripped", agent=request["agent_name"], provider=ref)
+        if attempt > policy.max_retries:
+            return None
+        delay = policy.delay(attempt)
+        emit_provider_event(
+            "llm_retry",
+            agent=request["agent_name"],
+            provider=ref,
+            attempt=attempt,
+            error=_describe(exc, policy),
+            delay_s=round(delay, 3),
+        )
+        return delay
+
+    async def agenerate(self, **request: Any) -> ProviderResult:
+        ref, breaker, policy = self._prepare(request)
+        request = self._with_deadline(request, policy)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._enter(ref, breaker, request)
+            try:
+                result = await asyncio.wait_for(self.inner.agenerate(**request), self._deadline(policy))
+            except Exception as e:
+                delay = self._failed(ref, breaker, request, e, attempt, policy)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+            breaker.record_success()
+            return result
+
+    def generate(self, **request: Any) -> ProviderResult:
+        # Blocking callers (no running loop) get the same deadline/retry semantics.
+        return asyncio.run(self.agenerate(**request))
+
+    async def agenerate_stream(self, **request: Any) -> AsyncIterator[StreamChunk]:
+        """Retry only until the first chunk arrives; after that a failure propagates.
+
+        The deadline applies to the wait for each chunk (an idle timeout), not the whole stream.
+        """
+        ref, breaker, policy = self._prepare(request)
+        request = self._with_deadline(request, policy)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._enter(ref, breaker, request)
+            chunks = astream(self.inner, **request)
+            started = False
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(chunks), self._deadline(policy))
+                    except StopAsyncIteration:
+                        break
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if started:
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    raise
+                delay = self._failed(ref, breaker, request, e, attempt, policy)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled, or closed early by the consumer (e.g. a contract abort).
+                if started:
+                    breaker.record_success()
+                else:
+                    breaker.abandon()
+                raise
+            finally:
+                await chunks.aclose()
+            breaker.record_success()
+            return
+
+    def generate_stream(self, **request: Any) -> Iterator[StreamChunk]:
+        # Blocking streams are retried as one whole call.
+        result = self.generate(**request)
+        yield StreamChunk(text=result.text, request_id=result.request_id, usage=result.usage)
+
+
+def build_resilient_provider(cfg: dict, inner: Provider) -> Provider:
+    """Wrap `inner` with deadlines/retries/breakers configured under `resilience:` (if enabled)."""
+    res = cfg.get("resilience") or {}
+    if not res.get("enabled", False):
+        return inner
+    policy = RetryPolicy(
+        timeout_seconds=float(res["timeout_seconds"]) if res.get("timeout_seconds") else None,
+        max_retries=int(res.get("max_retries", 2)),
+        backoff_base_s=float(res.get("backoff_base_s", 0.5)),
+        backoff_max_s=float(res.get("backoff_max_s", 20)),
+    )
+    return ResilientProvider(
+        inner,
+        cfg,
+        policy,
+        breaker_failures=int(res.get("breaker_failures", 5)),
+        breaker_reset_s=float(res.get("breaker_reset_s", 30)),
+    )
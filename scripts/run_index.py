@@ -0,0 +1,464 @@
+"""SQLite index of run manifests for fast queries across many run folders.
+
+The controller mirrors each run's manifest into the index whenever it materializes
+`run_manifest.yaml`. The index holds runs, branches, step records, llm_call events, gate
+decisions and output hashes. It is derived data: `reindex` rebuilds it from the run
+folders, parsing manifests in parallel and skipping those unchanged since they were indexed.
+
+Usage:
+  python scripts/run_index.py reindex [--full] [--workers N]
+  python scripts/run_index.py query --gate qc=FAIL --since 2026-01-01 --until 2026-01-31
+  python scripts/run_index.py query --sql "SELECT agent, count(*) FROM llm_calls GROUP BY agent"
+  python scripts/run_index.py stats --by agent,model
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+import yaml
+
+INDEX_FORMAT = 1
+MANIFEST_NAME = "run_manifest.yaml"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_dir TEXT NOT NULL,
+    date TEXT,
+    slug TEXT,
+    mode TEXT,
+    created_at TEXT,
+    status TEXT,
+    qc TEXT,
+    curator TEXT,
+    manifest_mtime_ns INTEGER,
+    manifest_size INTEGER,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS branches (
+    run_id TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    idx INTEGER,
+    title TEXT,
+    stages TEXT,
+    status TEXT,
+    PRIMARY KEY (run_id, branch_id)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    agent TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS llm_calls (
+    run_id TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    agent TEXT,
+    provider TEXT,
+    model TEXT,
+    started_at TEXT,
+    latency_ms INTEGER,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cached_tokens INTEGER,
+    request_id TEXT,
+    aborted INTEGER
+);
+CREATE TABLE IF NOT EXISTS gates (
+    run_id TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    gate TEXT NOT NULL,
+    decision TEXT,
+    at TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    run_id TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    path TEXT,
+    sha256 TEXT,
+    bytes INTEGER,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_date ON runs (date);
+CREATE INDEX IF NOT EXISTS steps_run ON steps (run_id);
+CREATE INDEX IF NOT EXISTS llm_calls_run ON llm_calls (run_id);
+CREATE INDEX IF NOT EXISTS llm_calls_agent_model ON llm_calls (agent, model);
+CREATE INDEX IF NOT EXISTS gates_run ON gates (run_id);
+CREATE INDEX IF NOT EXISTS gates_decision ON gates (gate, decision);
+CREATE INDEX IF NOT EXISTS outputs_run ON outputs (run_id);
+CREATE INDEX IF NOT EXISTS outputs_sha256 ON outputs (sha256);
+"""
+
+# Child tables, in insert order; each row starts with run_id.
+_TABLES = {
+    "branches": 6,
+    "steps": 5,
+    "llm_calls": 12,
+    "gates": 6,
+    "outputs": 7,
+}
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def run_status(data: dict) -> str:
+    """Coarse run status from a manifest (mirrors the controller's outcome statuses)."""
+    gates = data.get("gates") or {}
+    if "post_bundle" in (data.get("outputs") or {}):
+        return "published"
+    curator = (gates.get("curator") or {}).get("decision")
+    if curator and curator != "APPROVED":
+        return "curator_" + curator.lower()
+    stopped = next((e for e in data.get("events") or [] if e.get("type") == "stopped"), None)
+    if stopped is not None:
+        return "stopped_" + str(stopped.get("reason") or "qc_fail")
+    if "qc" in gates:
+        return "ready_for_curator"
+    return "incomplete"
+
+
+def _tokens(usage: dict | None, *keys: str) -> int | None:
+    for key in keys:
+        if (usage or {}).get(key) is not None:
+            return int(usage[key])
+    return None
+
+
+def manifest_rows(run_id: str, data: dict) -> dict[str, list[tuple]]:
+    """Flatten a manifest into rows for each child table (`branch_id` is '' for the trunk)."""
+    rows: dict[str, list[tuple]] = {table: [] for table in _TABLES}
+    scopes = [("", data)]
+    for branch_id, section in (data.get("branches") or {}).items():
+        rows["branches"].append((
+            run_id, branch_id, section.get("index"), section.get("title"), section.get("stages"), section.get("status"),
+        ))
+        scopes.append((branch_id, section))
+    for branch_id, scope in scopes:
+        for artifact, step in (scope.get("steps") or {}).items():
+            rows["steps"].append((run_id, branch_id, artifact, step.get("agent"), step.get("completed_at")))
+        for gate, entry in (scope.get("gates") or {}).items():
+            rows["gates"].append((run_id, branch_id, gate, entry.get("decision"), entry.get("at"), entry.get("source")))
+        for artifact, out in (scope.get("outputs") or {}).items():
+            rows["outputs"].append((
+                run_id, branch_id, artifact, out.get("path"), out.get("sha256"), out.get("bytes"), out.get("updated_at"),
+            ))
+        for event in scope.get("events") or []:
+            if event.get("type") != "llm_call":
+                continue
+            usage = event.get("usage")
+            provider = event.get("provider") or {}
+            rows["llm_calls"].append((
+                run_id,
+                branch_id,
+                event.get("agent"),
+                provider.get("name"),
+                provider.get("model"),
+                event.get("started_at"),
+                event.get("latency_ms"),
+                _tokens(usage, "input_tokens", "prompt_tokens"),
+                _tokens(usage, "output_tokens", "completion_tokens"),
+                event.get("cached_tokens"),
+                event.get("request_id"),
+                int(bool((event.get("stream") or {}).get("aborted"))),
+            ))
+    return rows
+
+
+def run_row(run_id: str, run_dir: str, data: dict, stat: os.stat_result | None) -> tuple:
+    run = data.get("run") or {}
+    gates = data.get("gates") or {}
+    return (
+        run_id,
+        run_dir,
+        run.get("date"),
+        run.get("slug"),
+        run.get("mode"),
+        run.get("created_at"),
+        run_status(data),
+        (gates.get("qc") or {}).get("decision"),
+        (gates.get("curator") or {}).get("decision"),
+        stat.st_mtime_ns if stat else None,
+        stat.st_size if stat else None,
+        now_iso(),
+    )
+
+
+class RunIndex:
+    """Handle on the index database; safe to share across threads (one connection per call)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (str(INDEX_FORMAT),))
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def update(self, manifest_path: Path, data: dict) -> bool:
+        """Replace the index rows of one run. Returns False if the database was unavailable.
+
+        The index can always be rebuilt with `reindex`, so a locked or broken database
+        never fails the run that is writing its manifest.
+        """
+        run_dir = manifest_path.parent
+        stat = manifest_path.stat() if manifest_path.exists() else None
+        try:
+            with closing(self.connect()) as conn, conn:
+                _store(conn, run_dir.name, str(run_dir), data, stat)
+        except sqlite3.Error:
+            return False
+        return True
+
+
+def _store(conn: sqlite3.Connection, run_id: str, run_dir: str, data: dict, stat: os.stat_result | None) -> None:
+    _delete(conn, run_id)
+    conn.execute(f"INSERT INTO runs VALUES ({', '.join('?' * 12)})", run_row(run_id, run_dir, data, stat))
+    for table, rows in manifest_rows(run_id, data).items():
+        if rows:
+            conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * _TABLES[table])})", rows)
+
+
+def _delete(conn: sqlite3.Connection, run_id: str) -> None:
+    conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+    for table in _TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+
+def open_run_index(cfg: dict, root_dir: Path) -> RunIndex | None:
+    """The run index configured under `run_index:` (None if disabled)."""
+    index_cfg = cfg.get("run_index") or {}
+    if not index_cfg.get("enabled", False):
+        return None
+    return RunIndex(root_dir / str(index_cfg.get("path") or "runs/.index.sqlite"))
+
+
+# ---------------------------
+# Reindex
+# ---------------------------
+
+def _parse_manifest(path: str) -> tuple[str, dict | None]:
+    with open(path, encoding="utf-8") as fh:
+        data = yaml.load(fh, Loader=_Loader)
+    return path, data if isinstance(data, dict) else None
+
+
+def reindex(
+    index: RunIndex,
+    runs_dir: Path,
+    *,
+    manifest_name: str = MANIFEST_NAME,
+    workers: int | None = None,
+    full: bool = False,
+) -> dict[str, int]:
+    """Bring the index in line with the run folders under `runs_dir`.
+
+    Manifests whose mtime and size match the indexed values are skipped (unless `full`);
+    the rest are parsed in parallel worker processes. Runs whose folder is gone are dropped.
+    """
+    manifests = {p.parent.name: p for p in sorted(runs_dir.glob(f"*/*/{manifest_name}"))}
+    with closing(index.connect()) as conn:
+        known = {
+            run_id: (mtime, size)
+            for run_id, mtime, size in conn.execute("SELECT run_id, manifest_mtime_ns, manifest_size FROM runs")
+        }
+    stats = {p: p.stat() for p in manifests.values()}
+    todo = [
+        p for run_id, p in manifests.items()
+        if full or known.get(run_id) != (stats[p].st_mtime_ns, stats[p].st_size)
+    ]
+    stale = [run_id for run_id in known if run_id not in manifests]
+
+    parsed: list[tuple[str, dict | None]] = []
+    if len(todo) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_parse_manifest, map(str, todo), chunksize=16))
+    else:
+        parsed = [_parse_manifest(str(p)) for p in todo]
+
+    indexed = invalid = 0
+    with closing(index.connect()) as conn, conn:
+        for run_id in stale:
+            _delete(conn, run_id)
+        for path_str, data in parsed:
+            path = Path(path_str)
+            if data is None:
+                invalid += 1
+                continue
+            _store(conn, path.parent.name, str(path.parent), data, stats[path])
+            indexed += 1
+    return {
+        "manifests": len(manifests),
+        "indexed": indexed,
+        "unchanged": len(manifests) - len(todo),
+        "invalid": invalid,
+        "removed": len(stale),
+    }
+
+
+# ---------------------------
+# Queries
+# ---------------------------
+
+def query_runs(
+    index: RunIndex,
+    *,
+    status: str | None = None,
+    gates: Iterable[str] = (),
+    since: str | None = None,
+    until: str | None = None,
+    agent: str | None = None,
+) -> tuple[list[str], list[tuple]]:
+    """Runs matching every filter. `gates` items look like `qc=FAIL` (any branch or the run)."""
+    where, params = [], []
+    if status:
+        where.append("r.status = ?")
+        params.append(status)
+    for gate in gates:
+        name, _, decision = gate.partition("=")
+        where.append("EXISTS (SELECT 1 FROM gates g WHERE g.run_id = r.run_id AND g.gate = ? AND g.decision = ?)")
+        params += [name, decision.upper()]
+    if since:
+        where.append("r.date >= ?")
+        params.append(since)
+    if until:
+        where.append("r.date <= ?")
+        params.append(until)
+    if agent:
+        where.append("EXISTS (SELECT 1 FROM llm_calls c WHERE c.run_id = r.run_id AND c.agent = ?)")
+        params.append(agent)
+    sql = "SELECT r.run_id, r.date, r.slug, r.status, r.qc, r.curator, r.run_dir FROM runs r"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return run_sql(index, sql + " ORDER BY r.date, r.run_id", params)
+
+
+STAT_GROUPS = ("agent", "model", "provider", "branch_id", "run_id")
+
+
+def llm_stats(
+    index: RunIndex, *, by: Iterable[str] = ("agent", "model"), since: str | None = None, until: str | None = None,
+) -> tuple[list[str], list[tuple]]:
+    """Call counts, latency and token totals of llm_call events, grouped by `by`."""
+    by = list(by)
+    unknown = [col for col in by if col not in STAT_GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown stats group(s): {', '.join(unknown)} (choose from {', '.join(STAT_GROUPS)})")
+    where, params = [], []
+    if since:
+        where.append("r.date >= ?")
+        params.append(since)
+    if until:
+        where.append("r.date <= ?")
+        params.append(until)
+    cols = ", ".join(f"c.{col}" for col in by)
+    sql = (
+        f"SELECT {cols}, count(*) AS calls, round(avg(c.latency_ms), 1) AS avg_latency_ms, "
+        "max(c.latency_ms) AS max_latency_ms, sum(c.input_tokens) AS input_tokens, "
+        "sum(c.output_tokens) AS output_tokens, sum(c.aborted) AS aborted "
+        "FROM llm_calls c JOIN runs r ON r.run_id = c.run_id"
+    )
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" GROUP BY {cols} ORDER BY {cols}"
+    return run_sql(index, sql, params)
+
+
+def run_sql(index: RunIndex, sql: str, params: Iterable[Any] = ()) -> tuple[list[str], list[tuple]]:
+    with closing(index.connect()) as conn:
+        cur = conn.execute(sql, list(params))
+        columns = [d[0] for d in cur.description or ()]
+        return columns, cur.fetchall()
+
+
+def render_table(columns: list[str], rows: list[tuple]) -> str:
+    def cell(value: Any) -> str:
+        return "" if value is None else str(value)
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(cell(v) for v in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Query and maintain the SQLite run index.")
+    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p_reindex = sub.add_parser("reindex", help="Rebuild the index from run folders")
+    p_reindex.add_argument("--full", action="store_true", help="Re-parse every manifest, not just changed ones")
+    p_reindex.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+
+    p_query = sub.add_parser("query", help="List runs matching filters, or run raw SQL")
+    p_query.add_argument("--status", default=None, help="e.g. published, ready_for_curator, stopped_qc_fail, stopped_render_budget")
+    p_query.add_argument("--gate", action="append", default=[], help="Gate decision, e.g. qc=FAIL (repeatable)")
+    p_query.add_argument("--since", default=None, help="First run date (YYYY-MM-DD), inclusive")
+    p_query.add_argument("--until", default=None, help="Last run date (YYYY-MM-DD), inclusive")
+    p_query.add_argument("--agent", default=None, help="Only runs with calls to this agent")
+    p_query.add_argument("--sql", default=None, help="Raw SQL against the index (overrides the filters)")
+
+    p_stats = sub.add_parser("stats", help="LLM call latency and token totals")
+    p_stats.add_argument("--by", default="agent,model", help=f"Comma-separated groups: {', '.join(STAT_GROUPS)}")
+    p_stats.add_argument("--since", default=None)
+    p_stats.add_argument("--until", default=None)
+    args = ap.parse_args()
+
+    root_dir = Path(__file__).resolve().parents[1]
+    config_path = Path(args.config)
+    cfg = yaml.safe_load((config_path if config_path.is_absolute() else root_dir / config_path).read_text(encoding="utf-8")) or {}
+    index_cfg = cfg.get("run_index") or {}
+    index = RunIndex(root_dir / str(index_cfg.get("path") or "runs/.index.sqlite"))
+
+    if args.command == "reindex":
+        counts = reindex(
+            index,
+            root_dir / cfg["paths"]["runs_dir"],
+            manifest_name=(cfg.get("artifacts") or {}).get("run_manifest", MANIFEST_NAME),
+            workers=args.workers,
+            full=args.full,
+        )
+        print(", ".join(f"{key}: {value}" for key, value in counts.items()))
+        print(f"Index: {index.path}")
+        return
+    if args.command == "query":
+        if args.sql:
+            columns, rows = run_sql(index, args.sql)
+        else:
+            columns, rows = query_runs(
+                index, status=args.status, gates=args.gate, since=args.since, until=args.until, agent=args.agent,
+            )
+    else:
+        columns, rows = llm_stats(index, by=[c.strip() for c in args.by.split(",") if c.strip()], since=args.since, until=args.until)
+    print(render_table(columns, rows))
+    print(f"\n{len(rows)} row(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,41 +6,174 @@ Replace `call_llm()` with your chosen provider client (Claude SDK / OpenAI Respo
 """
 
 import argparse
+import asyncio
 import datetime as dt
+import json
 import os
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import aclosing, nullcontext
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any
 import yaml
 import shutil
 
 try:
     # When executed as a module: python -m scripts.run_pipeline
-    from scripts.artifact_contracts import load_contracts, validate_artifact
+    from scripts.artifact_contracts import ContractResult, ContractSet, IncrementalValidator, load_contracts
+    from scripts.artifact_model import ArtifactModels, ShortlistItem, open_artifact_models
+    from scripts.context_blocks import context_prefix, policy_block, policy_inputs
     from scripts.provenance import sha256_file, sha256_text
-    from scripts.gates import parse_curator_approval, parse_qc_status
-    from scripts.provider import Provider, StubProvider, resolve_provider_config
+    from scripts.gates import (
+        GateDecision,
+        normalize_curator_decision,
+        parse_curator_approval,
+        parse_curator_branch,
+    )
+    from scripts.journal import JOURNAL_NAME, RunManifest, open_run_manifest, replay_journal
+    from scripts.llm_cache import build_cache_provider, refresh_cache
+    from scripts.provider import (
+        PromptPrefix,
+        Provider,
+        ProviderResult,
+        StreamChunk,
+        StubProvider,
+        as_async_provider,
+        astream,
+        cached_input_tokens,
+        capture_provider_events,
+        estimate_tokens,
+        resolve_provider_config,
+    )
+    from scripts.profiling import PROFILE_MD, RunProfiler, activate, record_span, span, write_profile
+    from scripts.provider_pool import ProviderPool, pool_scope
+    from scripts.resilience import build_resilient_provider
+    from scripts.batching import build_batch_collector
+    from scripts.run_index import RunIndex, open_run_index
+    from scripts.render_budget import RenderBudget, estimate_render
+    from scripts.render_bundle import (
+        BUNDLE_DIR,
+        edit_notes,
+        next_version,
+        plan_bundle_jobs,
+        plan_shots,
+        stamp_version,
+        update_index,
+    )
+    from scripts.idea_filter import merge_rejected, screen_ideas
+    from scripts.curator_watch import open_curator_watcher
+    from scripts.job_queue import Job, JobQueue, open_job_queue
+    from scripts.object_store import ObjectStore, open_object_store
+    from scripts.qc_engine import (
+        QC_INPUTS,
+        CheckResult,
+        llm_check_payload,
+        llm_checks,
+        parse_llm_check,
+        qc_policy_keys,
+        render_qc_report,
+        render_version,
+        run_deterministic_checks,
+    )
+    from scripts.scheduler import Step, StepScheduler
 except ImportError:
     # When executed as a script: python scripts/run_pipeline.py
-    from artifact_contracts import load_contracts, validate_artifact
+    from artifact_contracts import ContractResult, ContractSet, IncrementalValidator, load_contracts
+    from artifact_model import ArtifactModels, ShortlistItem, open_artifact_models
+    from context_blocks import context_prefix, policy_block, policy_inputs
     from provenance import sha256_file, sha256_text
-    from gates import parse_curator_approval, parse_qc_status
-    from provider import Provider, StubProvider, resolve_provider_config
+    from gates import (
+        GateDecision,
+        normalize_curator_decision,
+        parse_curator_approval,
+        parse_curator_branch,
+    )
+    from journal import JOURNAL_NAME, RunManifest, open_run_manifest, replay_journal
+    from llm_cache import build_cache_provider, refresh_cache
+    from provider import (
+        PromptPrefix,
+        Provider,
+        ProviderResult,
+        StreamChunk,
+        StubProvider,
+        as_async_provider,
+        astream,
+        cached_input_tokens,
+        capture_provider_events,
+        estimate_tokens,
+        resolve_provider_config,
+    )
+    from profiling import PROFILE_MD, RunProfiler, activate, record_span, span, write_profile
+    from provider_pool import ProviderPool, pool_scope
+    from resilience import build_resilient_provider
+    from batching import build_batch_collector
+    from run_index import RunIndex, open_run_index
+    from render_budget import RenderBudget, estimate_render
+    from render_bundle import (
+        BUNDLE_DIR,
+        edit_notes,
+        next_version,
+        plan_bundle_jobs,
+        plan_shots,
+        stamp_version,
+        update_index,
+    )
+    from idea_filter import merge_rejected, screen_ideas
+    from curator_watch import open_curator_watcher
+    from job_queue import Job, JobQueue, open_job_queue
+    from object_store import ObjectStore, open_object_store
+    from qc_engine import (
+        QC_INPUTS,
+        CheckResult,
+        llm_check_payload,
+        llm_checks,
+        parse_llm_check,
+        qc_policy_keys,
+        render_qc_report,
+        render_version,
+        run_deterministic_checks,
+    )
+    from scheduler import Step, StepScheduler
 
 # ---------------------------
 # Utilities
 # ---------------------------
 
 def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
+    with span("read_text") as profile:
+        text = path.read_text(encoding="utf-8")
+        profile["bytes_read"] = len(text.encode("utf-8"))
+    return text
 
 def write_text(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    """Write atomically (temp file + rename).
+
+    Renaming over `path` also replaces a hardlink into the object store rather than
+    rewriting the shared object.
+    """
+    with span("write_text") as profile:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+        profile["bytes_written"] = len(content.encode("utf-8"))
+
+
+# libyaml's emitter produces the same output as SafeDumper, roughly 10x faster.
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def write_yaml(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    """Write atomically (temp file + rename), like `write_text`."""
+    with span("write_yaml") as profile:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = yaml.dump(data, Dumper=_YamlDumper, sort_keys=False)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+        profile["bytes_written"] = len(text.encode("utf-8"))
 
 def now_iso() -> str:
     return dt.datetime.now().isoformat(timespec="seconds")
@@ -92,6 +225,24 @@ def stub_output(agent_name: str, user_payload: str) -> str:
             "     - repeated action → interruption\n"
             "   - **Tag:** `sketch`\n"
             "   - **Tone:** warm\n"
+            "2. **Title:** The Group Chat Dinner Vote\n"
+            "   - **Premise (1–2 sentences):** Three friends politely defer on where to eat until nobody has eaten.\n"
+            "   - **Pressure source:** social\n"
+            "   - **Release mechanism:** reversal\n"
+            "   - **Core contrast:** politeness vs hunger\n"
+            "   - **Tension pattern:**\n"
+            "     - deferral → escalation of politeness\n"
+            "   - **Tag:** `sketch`\n"
+            "   - **Tone:** warm\n"
+            "3. **Title:** The Thermostat Truce\n"
+            "   - **Premise (1–2 sentences):** Roommates silently adjust the thermostat one degree at a time.\n"
+            "   - **Pressure source:** situational\n"
+            "   - **Release mechanism:** understatement\n"
+            "   - **Core contrast:** cooperation vs control\n"
+            "   - **Tension pattern:**\n"
+            "     - repeated action → quiet escalation\n"
+            "   - **Tag:** `sketch`\n"
+            "   - **Tone:** dry\n"
         )
 
     if agent_name == "mabel":
@@ -100,7 +251,15 @@ def stub_output(agent_name: str, user_payload: str) -> str:
             "- **Title:** The Lunchbox That Won’t Close\n"
             "- **Why it fits (1–2 lines):** Domestic, relatable, kind; no mean edge.\n"
             "- **Risks / watch-outs (1 line max):** Avoid frantic energy.\n"
-            "- **Recommended tone note (1 line max):** Calm, understated.\n\n"
+            "- **Recommended tone note (1 line max):** Calm, understated.\n"
+            "- **Title:** The Group Chat Dinner Vote\n"
+            "- **Why it fits (1–2 lines):** Gentle social comedy; everyone is trying to be kind.\n"
+            "- **Risks / watch-outs (1 line max):** Keep the group small.\n"
+            "- **Recommended tone note (1 line max):** Warm, patient.\n"
+            "- **Title:** The Thermostat Truce\n"
+            "- **Why it fits (1–2 lines):** Quiet, visual, no dialogue required.\n"
+            "- **Risks / watch-outs (1 line max):** Avoid passive-aggressive edge.\n"
+            "- **Recommended tone note (1 line max):** Dry, minimal.\n\n"
             "## Rejected (rest)\n"
             "- **Title:** (stub rejected idea)\n"
             "- **Reason (1 line):** Too performative for the tone rules.\n"
@@ -204,6 +363,16 @@ def stub_output(agent_name: str, user_payload: str) -> str:
             "- Does it work without prior context? (yes/no) yes\n"
         )
 
+    if agent_name == "evan" and "OUTPUT: shot_prompt" in user_payload:
+        shot = next((line for line in user_payload.splitlines() if line.startswith("Shot ")), "Shot")
+        return f"(stub) {shot}: grounded realism, natural light, restrained expressions.\n"
+
+    if agent_name == "evan" and "OUTPUT: voice" in user_payload:
+        return "(stub) voice: calm, understated delivery.\n" + user_payload.split("Dialogue:\n", 1)[-1]
+
+    if agent_name == "evan" and "OUTPUT: subtitles" in user_payload:
+        return user_payload.split("Subtitle text:\n", 1)[-1]
+
     if agent_name == "evan":
         return (
             "## Render Output\n"
@@ -270,7 +439,7 @@ def _resolve_agent_provider_cfg(cfg: dict, agent_name: str):
 
 
 def _record_llm_call_event(
-    manifest: dict,
+    manifest: RunManifest,
     *,
     agent_name: str,
     provider_name: str,
@@ -282,45 +451,67 @@ def _record_llm_call_event(
     latency_ms: int,
     request_id: str | None,
     usage: dict | None,
+    prefix: PromptPrefix | None = None,
+    stream: dict | None = None,
 ) -> None:
-    manifest.setdefault("events", []).append(
-        {
-            "type": "llm_call",
-            "agent": agent_name,
-            "provider": {"name": provider_name, "model": model},
-            "prompt_sha256": sha256_text(system_prompt),
-            "payload_sha256": sha256_text(user_payload),
-            "started_at": started_at,
-            "finished_at": finished_at,
-            "latency_ms": latency_ms,
-            "request_id": request_id,
-            "usage": usage,
-        }
-    )
+    event = {
+        "type": "llm_call",
+        "agent": agent_name,
+        "provider": {"name": provider_name, "model": model},
+        "prompt_sha256": sha256_text(system_prompt),
+        "payload_sha256": sha256_text(user_payload),
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "latency_ms": latency_ms,
+        "request_id": request_id,
+        "usage": usage,
+    }
+    if prefix is not None:
+        event["prefix"] = {"sha256": prefix.sha256, "blocks": list(prefix.blocks)}
+        event["cached_tokens"] = cached_input_tokens(usage)
+    if stream is not None:
+        event["stream"] = stream
+    manifest.append("events", value=event)
 
 
-def call_llm(
+async def call_llm(
     *,
     cfg: dict,
     provider: Provider,
     agent_name: str,
     system_prompt: str,
     user_payload: str,
-    manifest: dict | None = None,
+    manifest: RunManifest | None = None,
+    prefix: PromptPrefix | None = None,
+    sink: "ArtifactStream | None" = None,
 ) -> str:
     """Provider-agnostic call.
 
-    In Phase 1 this uses StubProvider, but the interface is the same for real providers.
+    In Phase 1 this uses StubProvider (via SyncProviderAdapter), but the interface is
+    the same for real providers. A `prefix` (shared context blocks) is sent ahead of
+    `user_payload` and passed along as a cache-breakpoint hint. With a `sink`, the output
+    is streamed into it chunk by chunk, and the stream is closed early once the sink asks to stop.
     """
     _, provider_cfg = _resolve_agent_provider_cfg(cfg, agent_name)
+    if prefix is not None:
+        user_payload = prefix.text + user_payload
+    request = dict(agent_name=agent_name, system_prompt=system_prompt, user_payload=user_payload, config=provider_cfg)
+    if prefix is not None:
+        request["prefix"] = prefix
     started_at = now_iso()
     t0 = time.perf_counter()
-    result = provider.generate(
-        agent_name=agent_name,
-        system_prompt=system_prompt,
-        user_payload=user_payload,
-        config=provider_cfg,
-    )
+    with span("llm_call", agent=agent_name) as profile, capture_provider_events() as provider_events:
+        try:
+            if sink is None:
+                result = await provider.agenerate(**request)
+            else:
+                result = await _stream_into(sink, provider, provider_cfg, request)
+        finally:
+            if manifest is not None:
+                for event in provider_events:
+                    fields = dict(event)
+                    record_event(manifest, fields.pop("type"), **fields)
+        profile.update(_call_counters(system_prompt, user_payload, result))
     latency_ms = int((time.perf_counter() - t0) * 1000)
     finished_at = now_iso()
 
@@ -337,13 +528,48 @@ def call_llm(
             latency_ms=latency_ms,
             request_id=getattr(result, "request_id", None),
             usage=getattr(result, "usage", None),
+            prefix=prefix,
+            stream=sink.summary() if sink is not None else None,
         )
     return result.text
 
 
+def _call_counters(system_prompt: str, user_payload: str, result: ProviderResult) -> dict:
+    """Payload size and token usage for the profiler (estimated when the provider reports none)."""
+    usage = result.usage or {}
+    input_tokens = usage.get("input_tokens", usage.get("prompt_tokens"))
+    output_tokens = usage.get("output_tokens", usage.get("completion_tokens"))
+    return {
+        "payload_bytes": len(system_prompt.encode("utf-8")) + len(user_payload.encode("utf-8")),
+        "input_tokens": int(input_tokens) if input_tokens is not None else estimate_tokens(system_prompt + user_payload),
+        "output_tokens": int(output_tokens) if output_tokens is not None else estimate_tokens(result.text),
+        "cached_tokens": cached_input_tokens(usage) or 0,
+        "tokens_estimated": input_tokens is None or output_tokens is None,
+    }
+
+
+async def _stream_into(sink: "ArtifactStream", provider: Provider, provider_cfg, request: dict) -> ProviderResult:
+    chunks: list[StreamChunk] = []
+    try:
+        async with aclosing(astream(provider, **request)) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if sink.feed(chunk):
+                    break
+    finally:
+        sink.close()
+    return ProviderResult(
+        text="".join(c.text for c in chunks),
+        provider_name=provider_cfg.name,
+        model=provider_cfg.model,
+        request_id=next((c.request_id for c in reversed(chunks) if c.request_id), None),
+        usage=next((c.usage for c in reversed(chunks) if c.usage), None),
+    )
+
+
 def validate_and_write(
     *,
-    contracts: dict,
+    contracts: ContractSet,
     artifact_key: str,
     out_path: Path,
     content: str,
@@ -352,41 +578,193 @@ def validate_and_write(
 
     Writing first ensures you can inspect the violating output.
     """
-    write_text(out_path, content)
-    result = validate_artifact(contracts, artifact_key, content)
+    with span("validate_and_write", artifact=artifact_key):
+        write_text(out_path, content)
+        result = contracts.validate(artifact_key, content)
     if not result.ok:
-        violation_path = out_path.parent / "CONTRACT_VIOLATION.md"
-        write_text(
-            violation_path,
-            (
-                "# CONTRACT_VIOLATION\n\n"
-                f"Artifact: {artifact_key}\n\n"
-                f"Path: {out_path.name}\n\n"
-                f"Reason: {result.message}\n"
-            ),
+        raise_contract_violation(artifact_key, out_path, result)
+
+
+class ArtifactStream:
+    """Write a streamed artifact to disk as it arrives while tracking its contract.
+
+    Chunks go to a temp file next to `out_path`; `commit()` renames it into place once
+    the call returns, so a crash mid-stream never leaves a partial artifact behind.
+    `feed()` returns True once the stream should be cut off: the output has reached
+    `abort_after_tokens` and required headings/markers are still missing.
+    """
+
+    def __init__(self, validator: IncrementalValidator, out_path: Path, *, abort_after_tokens: int | None = None):
+        self.validator = validator
+        self.out_path = out_path
+        self.abort_after_tokens = abort_after_tokens
+        self.chunks = 0
+        self.bytes = 0
+        self.tokens = 0
+        self.aborted = False
+        self.write_s = 0.0  # time spent writing + validating, for the profiler
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+        self._fh = self._tmp.open("w", encoding="utf-8")
+
+    def feed(self, chunk: StreamChunk) -> bool:
+        t0 = time.perf_counter()
+        self._fh.write(chunk.text)
+        self._fh.flush()
+        self.validator.feed(chunk.text)
+        self.write_s += time.perf_counter() - t0
+        self.chunks += 1
+        self.bytes += len(chunk.text.encode("utf-8"))
+        reported = (chunk.usage or {}).get("output_tokens")
+        self.tokens = int(reported) if reported is not None else self.tokens + estimate_tokens(chunk.text)
+        budget = self.abort_after_tokens
+        if budget and self.tokens >= budget and not self.validator.complete:
+            self.aborted = True
+        return self.aborted
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+    def commit(self) -> None:
+        """Move the streamed output onto `out_path` (replacing, never rewriting, a stored object)."""
+        self.close()
+        os.replace(self._tmp, self.out_path)
+
+    def discard(self) -> None:
+        self.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def summary(self) -> dict:
+        return {"chunks": self.chunks, "output_tokens": self.tokens, "aborted": self.aborted}
+
+    def finish(self, content: str) -> ContractResult:
+        if not self.aborted:
+            return self.validator.finish(content)
+        violations = [f"Stream aborted after ~{self.tokens} output tokens"] + self.validator.missing()
+        return ContractResult(ok=False, message="; ".join(violations), violations=tuple(violations))
+
+
+def stream_budget(cfg: dict, agent_name: str) -> int | None:
+    """Token budget after which a stream still missing required headings is aborted."""
+    streaming = cfg.get("streaming") or {}
+    budget = streaming.get("abort_after_tokens")
+    if budget is None:
+        _, provider_cfg = _resolve_agent_provider_cfg(cfg, agent_name)
+        budget = provider_cfg.params.get("max_output_tokens")
+    return int(budget) if budget else None
+
+
+async def generate_artifact(
+    *,
+    cfg: dict,
+    contracts: ContractSet,
+    provider: Provider,
+    manifest: RunManifest,
+    agent_name: str,
+    system_prompt: str,
+    user_payload: str,
+    artifact_key: str,
+    out_path: Path,
+    prefix: PromptPrefix | None = None,
+) -> str:
+    """Call the agent and write its artifact, validating against the contract.
+
+    With `streaming.enabled`, output is written to `out_path` as it arrives and the
+    stream is aborted early once it can no longer satisfy its contract in budget.
+    """
+    call = dict(cfg=cfg, provider=provider, agent_name=agent_name, system_prompt=system_prompt, user_payload=user_payload, manifest=manifest, prefix=prefix)
+    if not (cfg.get("streaming") or {}).get("enabled", False):
+        out = await call_llm(**call)
+        validate_and_write(contracts=contracts, artifact_key=artifact_key, out_path=out_path, content=out)
+        return out
+
+    sink = ArtifactStream(
+        contracts.incremental(artifact_key),
+        out_path,
+        abort_after_tokens=stream_budget(cfg, agent_name),
+    )
+    try:
+        out = await call_llm(**call, sink=sink)
+    except BaseException:
+        sink.discard()
+        raise
+    sink.commit()  # kept even if it fails its contract, for inspection
+    record_span("stream_write", sink.write_s, artifact=artifact_key, bytes_written=sink.bytes)
+    if sink.aborted:
+        record_event(
+            manifest,
+            "llm_stream_aborted",
+            agent=agent_name,
+            artifact=artifact_key,
+            output_tokens=sink.tokens,
+            missing=sink.validator.missing(),
         )
-        raise ValueError(f"Artifact contract failed for '{artifact_key}': {result.message}")
+    result = sink.finish(out)
+    if not result.ok:
+        raise_contract_violation(artifact_key, out_path, result)
+    return out
+
+
+class ContractViolation(ValueError):
+    """An artifact failed its contract (CONTRACT_VIOLATION.md has been written)."""
+
+    def __init__(self, artifact_key: str, message: str):
+        super().__init__(f"Artifact contract failed for '{artifact_key}': {message}")
+        self.artifact_key = artifact_key
+
+
+def raise_contract_violation(artifact_key: str, out_path: Path, result: ContractResult) -> None:
+    """Write CONTRACT_VIOLATION.md next to the artifact (listing every violation) and stop."""
+    reasons = "".join(f"- {v}\n" for v in result.violations) or f"- {result.message}\n"
+    write_text(
+        out_path.parent / "CONTRACT_VIOLATION.md",
+        (
+            "# CONTRACT_VIOLATION\n\n"
+            f"Artifact: {artifact_key}\n\n"
+            f"Path: {out_path.name}\n\n"
+            "Reasons:\n"
+            f"{reasons}"
+        ),
+    )
+    raise ContractViolation(artifact_key, result.message)
 
 
-def upsert_output_manifest(manifest: dict, artifact_key: str, out_path: Path) -> None:
-    """Record output file metadata in the run manifest."""
+def save_manifest(manifest_path: Path, data: dict, run_index: RunIndex | None = None) -> None:
+    """Materialize the manifest as YAML and mirror it into the run index (if enabled)."""
+    with span("save_manifest"):
+        write_yaml(manifest_path, data)
+        if run_index is not None:
+            run_index.update(manifest_path, data)
+
+
+def upsert_output_manifest(manifest: RunManifest, artifact_key: str, out_path: Path, store: ObjectStore | None = None) -> None:
+    """Record output file metadata in the run manifest (and dedup the file into `store`)."""
     if not out_path.exists():
         return
     rel = out_path.name
-    manifest.setdefault("outputs", {})[artifact_key] = {
-        "path": rel,
-        "sha256": sha256_file(out_path),
-        "bytes": out_path.stat().st_size,
-        "updated_at": now_iso(),
-    }
-
-
-def record_gate(manifest: dict, gate_name: str, decision: str, *, source: str | None = None) -> None:
-    manifest.setdefault("gates", {})[gate_name] = {
+    with span("upsert_output_manifest", artifact=artifact_key):
+        sha256 = sha256_file(out_path)
+        if store is not None:
+            store.intern(out_path, sha256)
+        manifest.set("outputs", artifact_key, value={
+            "path": rel,
+            "sha256": sha256,
+            "bytes": out_path.stat().st_size,
+            "updated_at": now_iso(),
+        })
+
+
+def record_gate(manifest: RunManifest, gate_name: str, decision: str, *, source: str | None = None) -> None:
+    manifest.set("gates", gate_name, value={
         "decision": decision,
         "at": now_iso(),
         "source": source,
-    }
+    })
+
+
+def record_event(manifest: RunManifest, event_type: str, **fields) -> None:
+    manifest.append("events", value={"type": event_type, "at": now_iso(), **fields})
 
 # ---------------------------
 # Pipeline steps
@@ -398,171 +776,819 @@ def load_agent_prompt(agents_dir: Path, prompt_file: str) -> str:
         raise FileNotFoundError(f"Missing agent prompt file: {p}")
     return read_text(p)
 
-def step_trend_scout(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict) -> Path:
+async def step_trend_scout(cfg: dict, run_dir: Path, agents_dir: Path, contracts: ContractSet, provider: Provider, manifest: RunManifest) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['trend_scout']['prompt_file'])
     payload = "Window: last 72 hours\nRegion: US\n"
-    out = call_llm(cfg=cfg, provider=provider, agent_name="trend_scout", system_prompt=prompt, user_payload=payload, manifest=manifest)
     out_path = run_dir / cfg['artifacts']['trend_brief']
-    validate_and_write(contracts=contracts, artifact_key="trend_brief", out_path=out_path, content=out)
+    await generate_artifact(
+        cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+        agent_name="trend_scout", system_prompt=prompt, user_payload=payload,
+        artifact_key="trend_brief", out_path=out_path,
+    )
     return out_path
 
-def step_theo(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, trend_brief_path: Path) -> Path:
+async def step_theo(cfg: dict, run_dir: Path, agents_dir: Path, contracts: ContractSet, provider: Provider, manifest: RunManifest, trend_brief_path: Path) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['theo']['prompt_file'])
     payload = (
         f"Batch size: {cfg['run_defaults']['batch_size_ideas']}\n\n"
         "--- trend_brief.md ---\n"
         f"{read_text(trend_brief_path)}\n"
     )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="theo", system_prompt=prompt, user_payload=payload, manifest=manifest)
     out_path = run_dir / cfg['artifacts']['ideas']
-    validate_and_write(contracts=contracts, artifact_key="ideas", out_path=out_path, content=out)
+    await generate_artifact(
+        cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+        agent_name="theo", system_prompt=prompt, user_payload=payload,
+        artifact_key="ideas", out_path=out_path,
+    )
     return out_path
 
-def step_mabel(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, ideas_path: Path) -> Path:
+async def step_mabel(
+    cfg: dict,
+    run_dir: Path,
+    agents_dir: Path,
+    contracts: ContractSet,
+    provider: Provider,
+    manifest: RunManifest,
+    ideas_path: Path,
+    models: ArtifactModels,
+) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['mabel']['prompt_file'])
-    taste_path = Path(cfg['policy']['stephanie_taste_profile'])
-    payload = (
-        "--- stephanie_taste_profile.md ---\n"
-        f"{read_text(taste_path)}\n\n"
-        "--- ideas.md ---\n"
-        f"{read_text(ideas_path)}\n"
-    )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="mabel", system_prompt=prompt, user_payload=payload, manifest=manifest)
+    prefix = context_prefix(cfg, "stephanie_taste_profile")
+    ideas = read_text(ideas_path)
     out_path = run_dir / cfg['artifacts']['approved_ideas']
-    validate_and_write(contracts=contracts, artifact_key="approved_ideas", out_path=out_path, content=out)
+    screen = None
+    if (cfg.get("prefilter") or {}).get("enabled", False):
+        with span("prefilter_ideas"):
+            screen = screen_ideas(cfg, models.load("ideas", ideas_path))
+    if screen is not None and screen.rejected:
+        record_event(
+            manifest, "ideas_prefiltered", kept=len(screen.kept),
+            rejected=[{"title": r.idea.title, "reason": r.reason} for r in screen.rejected],
+        )
+        ideas = screen.ideas_markdown()
+    if screen is not None and not screen.kept:
+        # Nothing left for Mabel to judge: record the rejections without an LLM call.
+        out = "## Approved Shortlist (3–7)\n\n## Rejected (rest)\n"
+    else:
+        out = await generate_artifact(
+            cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+            agent_name="mabel", system_prompt=prompt, user_payload=f"--- ideas.md ---\n{ideas}\n",
+            artifact_key="approved_ideas", out_path=out_path, prefix=prefix,
+        )
+    if screen is not None and screen.rejected:
+        validate_and_write(
+            contracts=contracts, artifact_key="approved_ideas", out_path=out_path,
+            content=merge_rejected(out, screen.rejected),
+        )
     return out_path
 
-def step_rowan_scene_brief(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, approved_ideas_path: Path) -> Path:
+async def step_rowan_scene_brief(cfg: dict, run_dir: Path, agents_dir: Path, contracts: ContractSet, provider: Provider, manifest: RunManifest, item: ShortlistItem) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['rowan']['prompt_file'])
-    character_bible = Path(cfg['policy']['character_bible'])
+    prefix = context_prefix(cfg, "character_bible")
     payload = (
         "OUTPUT: scene_brief\n"
-        "Select the first item in the approved shortlist and produce a single scene_brief.md.\n\n"
-        "--- character_bible.md ---\n"
-        f"{read_text(character_bible)}\n\n"
-        "--- approved_ideas.md ---\n"
-        f"{read_text(approved_ideas_path)}\n"
+        "Produce a single scene_brief.md for this approved shortlist item.\n\n"
+        f"--- approved_ideas.md (shortlist item {item.index}) ---\n"
+        f"{item.block}\n"
     )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="rowan", system_prompt=prompt, user_payload=payload, manifest=manifest)
     out_path = run_dir / cfg['artifacts']['scene_brief']
-    validate_and_write(contracts=contracts, artifact_key="scene_brief", out_path=out_path, content=out)
+    await generate_artifact(
+        cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+        agent_name="rowan", system_prompt=prompt, user_payload=payload,
+        artifact_key="scene_brief", out_path=out_path, prefix=prefix,
+    )
     return out_path
 
 
-def step_lena(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, scene_brief_path: Path) -> Path:
+async def step_lena(cfg: dict, run_dir: Path, agents_dir: Path, contracts: ContractSet, provider: Provider, manifest: RunManifest, scene_brief_path: Path) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['lena']['prompt_file'])
-    character_bible = Path(cfg['policy']['character_bible'])
+    prefix = context_prefix(cfg, "character_bible")
     payload = (
         f"Target length: {cfg['run_defaults']['target_seconds']} seconds\n\n"
-        "--- character_bible.md ---\n"
-        f"{read_text(character_bible)}\n\n"
         "--- scene_brief.md ---\n"
         f"{read_text(scene_brief_path)}\n"
     )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="lena", system_prompt=prompt, user_payload=payload, manifest=manifest)
     out_path = run_dir / cfg['artifacts']['scripts']
-    validate_and_write(contracts=contracts, artifact_key="scripts", out_path=out_path, content=out)
+    await generate_artifact(
+        cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+        agent_name="lena", system_prompt=prompt, user_payload=payload,
+        artifact_key="scripts", out_path=out_path, prefix=prefix,
+    )
     return out_path
 
-def step_rowan_scene_plan(
+async def step_rowan_scene_plan(
     cfg: dict,
     run_dir: Path,
     agents_dir: Path,
-    contracts: dict,
+    contracts: ContractSet,
     provider: Provider,
-    manifest: dict,
+    manifest: RunManifest,
     scene_brief_path: Path,
     scripts_path: Path,
 ) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['rowan']['prompt_file'])
-    character_bible = Path(cfg['policy']['character_bible'])
+    prefix = context_prefix(cfg, "character_bible")
     payload = (
         "OUTPUT: scene_plan\n"
-        "--- character_bible.md ---\n"
-        f"{read_text(character_bible)}\n\n"
         "--- scene_brief.md ---\n"
         f"{read_text(scene_brief_path)}\n\n"
         "--- scripts.md ---\n"
         f"{read_text(scripts_path)}\n"
     )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="rowan", system_prompt=prompt, user_payload=payload, manifest=manifest)
     out_path = run_dir / cfg['artifacts']['scene_plan']
-    validate_and_write(contracts=contracts, artifact_key="scene_plan", out_path=out_path, content=out)
+    await generate_artifact(
+        cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+        agent_name="rowan", system_prompt=prompt, user_payload=payload,
+        artifact_key="scene_plan", out_path=out_path, prefix=prefix,
+    )
     return out_path
 
-def step_evan(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, scene_plan_path: Path, scripts_path: Path) -> Path:
-    """Evan produces render prompt bundles + report (stubbed)."""
+async def step_evan(
+    cfg: dict,
+    run_dir: Path,
+    agents_dir: Path,
+    contracts: ContractSet,
+    provider: Provider,
+    manifest: RunManifest,
+    scene_plan_path: Path,
+    scripts_path: Path,
+    store: ObjectStore | None = None,
+    models: ArtifactModels | None = None,
+    budget: RenderBudget | None = None,
+) -> Path:
+    """Evan's render report plus the next prompt bundle version (see render_bundle.py).
+
+    The report and every bundle file (one per shot, voice, subtitles) are independent
+    calls run concurrently, so a long plan takes about as long as its slowest shot.
+    With a preflight `budget`, shots are issued longest-first and the estimate is
+    appended to the report.
+    """
+    models = models or ArtifactModels(sidecars=False)
+    plan = models.load("scene_plan", scene_plan_path)
+    script = models.load("scripts", scripts_path)
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['evan']['prompt_file'])
+    bundle_root = run_dir / BUNDLE_DIR
+    version = next_version(bundle_root)
+    shots = plan_shots(plan, cfg['run_defaults'].get('target_seconds'))
+    order = budget.order if budget is not None else ()
+    jobs = plan_bundle_jobs(cfg, plan, script, shots, version=version, order=order)
     payload = (
         f"Aspect ratio: {cfg['run_defaults']['aspect_ratio']}\n"
         f"Resolution: {cfg['run_defaults']['resolution']}\n"
-        f"Target seconds: {cfg['run_defaults']['target_seconds']}\n\n"
+        f"Target seconds: {cfg['run_defaults']['target_seconds']}\n"
+        f"Bundle version: {version} ({len(shots)} shots)\n\n"
         "--- scene_plan.md ---\n"
         f"{read_text(scene_plan_path)}\n\n"
         "--- scripts.md ---\n"
         f"{read_text(scripts_path)}\n"
     )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="evan", system_prompt=prompt, user_payload=payload, manifest=manifest)
+    report_path = run_dir / "render_report.md"
+
+    async def bundle_file(user_payload: str) -> str:
+        return await call_llm(cfg=cfg, provider=provider, agent_name="evan", system_prompt=prompt, user_payload=user_payload, manifest=manifest)
 
-    # Create prompt bundle folder
-    bundle = run_dir / "render_prompts" / "v1"
+    with span("render_bundle", version=version, calls=len(jobs) + 1):
+        report, *outputs = await asyncio.gather(
+            generate_artifact(
+                cfg=cfg, contracts=contracts, provider=provider, manifest=manifest,
+                agent_name="evan", system_prompt=prompt, user_payload=payload,
+                artifact_key="render_report", out_path=report_path,
+            ),
+            *(bundle_file(job.payload) for job in jobs),
+        )
+    stamped = stamp_version(report, version)
+    if budget is not None:
+        stamped = stamped.rstrip("\n") + "\n\n" + budget.to_markdown()
+    if stamped != report:
+        validate_and_write(contracts=contracts, artifact_key="render_report", out_path=report_path, content=stamped)
+
+    # The version folder only appears once every call has succeeded.
+    bundle = bundle_root / version
     bundle.mkdir(parents=True, exist_ok=True)
-    write_text(bundle / "shot_01.txt", "(stub) shot prompt goes here\n")
-    write_text(bundle / "voice.txt", "(stub) voice prompt goes here\n")
-    write_text(bundle / "edit_notes.md", "(stub) edit/assembly notes\n")
-    report_path = run_dir / "render_report.md"
-    validate_and_write(contracts=contracts, artifact_key="render_report", out_path=report_path, content=out)
+    files = [(job.file, job.kind, job.shot, out) for job, out in zip(jobs, outputs)]
+    files.append(("edit_notes.md", "edit_notes", None, edit_notes(plan, shots, version=version)))
+    entries = []
+    for name, kind, shot, text in files:
+        path = bundle / name
+        write_text(path, text)
+        entry = {"file": name, "kind": kind, "sha256": sha256_file(path)}
+        if shot is not None:
+            entry.update(shot=shot.index, size=shot.size, seconds=shot.seconds)
+        entries.append(entry)
+        if store is not None:
+            store.intern(path, entry["sha256"])
+    update_index(
+        bundle_root, version, entries,
+        created_at=now_iso(), runtime_seconds=sum(s.seconds or 0.0 for s in shots), render_order=order,
+    )
     return report_path
 
-def step_qc(cfg: dict, run_dir: Path, agents_dir: Path, contracts: dict, provider: Provider, manifest: dict, render_report_path: Path) -> Path:
-    prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['qc']['prompt_file'])
-    payload = (
-        "--- render_report.md ---\n"
-        f"{read_text(render_report_path)}\n"
-    )
-    out = call_llm(cfg=cfg, provider=provider, agent_name="qc", system_prompt=prompt, user_payload=payload, manifest=manifest)
+def qc_deterministic_checks(cfg: dict, run_dir: Path, contracts: ContractSet, inputs: dict[str, Path]) -> list[CheckResult]:
+    """QC's offline checks (contracts, red lines, characters, duration); no provider calls."""
+    texts = {key: read_text(path) for key, path in inputs.items()}
+    with span("qc_checks", kind="deterministic"):
+        return run_deterministic_checks(
+            cfg, contracts, texts,
+            bible_text=policy_block(cfg, "character_bible").text,
+            bundle_root=run_dir / BUNDLE_DIR,
+        )
+
+async def step_qc(
+    cfg: dict,
+    run_dir: Path,
+    agents_dir: Path,
+    contracts: ContractSet,
+    provider: Provider,
+    manifest: RunManifest,
+    inputs: dict[str, Path],
+    deterministic: list[CheckResult],
+) -> Path:
+    """If the deterministic checks (`qc_deterministic_checks`) pass, the `qc.llm_checks` run concurrently.
+
+    All results are merged into one qc_report.md (see qc_engine.py).
+    """
+    texts = {key: read_text(path) for key, path in inputs.items()}
+    results = list(deterministic)
+    checks = llm_checks(cfg)
+    skipped: tuple[str, ...] = ()
+    if any(r.status == "FAIL" for r in results):
+        skipped = tuple(checks)
+        record_event(manifest, "qc_short_circuit", failed=[r.name for r in results if r.status == "FAIL"], skipped=list(skipped))
+    else:
+        prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['qc']['prompt_file'])
+        flagged = next((r.findings for r in results if r.status == "REVIEW"), ())
+
+        async def run_check(name: str, spec: dict) -> str:
+            policy = tuple(spec.get("policy") or ())
+            return await call_llm(
+                cfg=cfg, provider=provider, agent_name="qc", system_prompt=prompt,
+                user_payload=llm_check_payload(cfg, name, spec, texts, flagged), manifest=manifest,
+                prefix=context_prefix(cfg, *policy) if policy else None,
+            )
+
+        outputs = await asyncio.gather(*(run_check(name, spec) for name, spec in checks.items()))
+        results += [parse_llm_check(name, out) for name, out in zip(checks, outputs)]
     out_path = run_dir / cfg['artifacts']['qc_report']
-    validate_and_write(contracts=contracts, artifact_key="qc_report", out_path=out_path, content=out)
+    validate_and_write(
+        contracts=contracts, artifact_key="qc_report", out_path=out_path,
+        content=render_qc_report(results, version=render_version(texts.get("render_report", "")), skipped=skipped),
+    )
     return out_path
 
 def mark_ready_for_curator(run_dir: Path) -> None:
     write_text(run_dir / "READY_FOR_CURATOR.md",
                "# READY_FOR_CURATOR\n\nAll artifacts generated. Add curator_decision.md to proceed.\n")
 
-def step_parker(cfg: dict, run_dir: Path, agents_dir: Path, curator_decision_path: Path, provider: Provider, manifest: dict) -> Path:
+# What a speculative draft presumes the curator will say: a plain approval (v1, no notes).
+PRESUMED_CURATOR_DECISION = "## Curator Decision\n- Approved: yes\n- Selected version: v1\n"
+
+def parker_payload(branch: dict, curator_text: str) -> str:
+    return f"Selected branch: {branch['dir']} — {branch['title']}\n\n--- curator_decision.md ---\n{curator_text}\n"
+
+async def step_parker(cfg: dict, agents_dir: Path, provider: Provider, manifest: RunManifest, payload: str, out_path: Path) -> Path:
     prompt = load_agent_prompt(agents_dir, cfg['agent_routing']['parker']['prompt_file'])
-    payload = read_text(curator_decision_path)
-    out = call_llm(cfg=cfg, provider=provider, agent_name="parker", system_prompt=prompt, user_payload=payload, manifest=manifest)
+    out = await call_llm(cfg=cfg, provider=provider, agent_name="parker", system_prompt=prompt, user_payload=payload, manifest=manifest)
+    write_text(out_path, out)
+    return out_path
+
+# ---------------------------
+# Speculative Parker drafts
+# ---------------------------
 
-    post_bundle = run_dir / "post_bundle"
-    post_bundle.mkdir(parents=True, exist_ok=True)
-    write_text(post_bundle / "post_plan.md", out)
-    return post_bundle / "post_plan.md"
+SPECULATIVE_DIR = ".speculative"
+# Branch artifacts a post bundle is derived from; a draft is stale once any of them changes.
+PARKER_UPSTREAM = ("scripts", "render_report")
+
+
+def parker_fingerprint(cfg: dict, agents_dir: Path, branch: dict, curator_text: str) -> dict:
+    """Hash Parker's inputs: prompt, provider config, curator decision and the branch artifacts it builds on.
+
+    The decision is hashed in its normalized form, so a draft made from the presumed
+    approval matches any real decision that approves v1 without notes.
+    """
+    prompt_path = agents_dir / cfg["agent_routing"]["parker"]["prompt_file"]
+    _, provider_cfg = _resolve_agent_provider_cfg(cfg, "parker")
+    fingerprint = {
+        "prompt": sha256_file(prompt_path),
+        "provider": sha256_text(json.dumps(asdict(provider_cfg), sort_keys=True, default=str)),
+        "decision": sha256_text(normalize_curator_decision(curator_text)),
+    }
+    outputs = branch.get("outputs") or {}
+    for key in PARKER_UPSTREAM:
+        fingerprint[f"upstream:{key}"] = (outputs.get(key) or {}).get("sha256")
+    return fingerprint
+
+
+def speculative_dir(run_dir: Path, branch: dict) -> Path:
+    return run_dir / SPECULATIVE_DIR / Path(branch["dir"]).name
+
+
+async def draft_post_bundle(ctx: "RunContext", section: RunManifest) -> None:
+    """Draft Parker's post bundle for a branch, presuming a plain approval (v1, no notes).
+
+    Failures are recorded and swallowed: a draft is an optimization, never a reason to fail the run.
+    """
+    branch = section.data
+    payload = parker_payload(branch, PRESUMED_CURATOR_DECISION)
+    draft_dir = speculative_dir(ctx.run_dir, branch)
+    try:
+        out_path = await step_parker(ctx.cfg, ctx.agents_dir, ctx.provider, section, payload, draft_dir / "post_plan.md")
+    except Exception as e:
+        record_event(section, "speculative_failed", agent="parker", error=f"{type(e).__name__}: {e}")
+        return
+    write_yaml(draft_dir / "draft.yaml", {
+        "branch": branch["dir"],
+        "inputs": parker_fingerprint(ctx.cfg, ctx.agents_dir, branch, PRESUMED_CURATOR_DECISION),
+        "sha256": sha256_file(out_path),
+        "created_at": now_iso(),
+    })
+    record_event(section, "speculative_draft", agent="parker", path=str(out_path.relative_to(ctx.run_dir)))
+
+
+def promote_speculative_draft(run_dir: Path, branch: dict, fingerprint: dict, out_path: Path) -> str:
+    """Move a matching draft into place. Returns "promoted", or why the draft was not used."""
+    draft_dir = speculative_dir(run_dir, branch)
+    meta_path = draft_dir / "draft.yaml"
+    if not meta_path.exists():
+        return "missing"
+    meta = yaml.safe_load(read_text(meta_path)) or {}
+    draft_path = draft_dir / "post_plan.md"
+    if meta.get("inputs") != fingerprint:
+        return "inputs_changed"
+    if not draft_path.exists() or sha256_file(draft_path) != meta.get("sha256"):
+        return "draft_modified"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(draft_path, out_path)
+    return "promoted"
 
 # ---------------------------
-# Main
+# Shortlist fan-out
 # ---------------------------
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
-    ap.add_argument("--date", default=None, help="YYYY-MM-DD (defaults to today)")
-    ap.add_argument("--slug", default="run", help="Run slug (e.g., test_run)")
-    ap.add_argument("--resume", default=None, help="Path to existing run folder to resume after curator decision")
-    args = ap.parse_args()
+def select_branch_items(cfg: dict, approved_ideas_path: Path, models: ArtifactModels) -> list[ShortlistItem]:
+    """Shortlist items to branch on, capped by run_defaults.max_scripts."""
+    items = models.load("approved_ideas", approved_ideas_path)
+    if not items:
+        raise ValueError(f"No shortlist items found in {approved_ideas_path.name}")
+    run_defaults = cfg.get("run_defaults", {})
+    max_scripts = int(run_defaults.get("max_scripts", len(items)))
+    return items[: max(max_scripts, 0)]
+
+
+def new_branch_section(item: ShortlistItem, *, full: bool) -> dict:
+    return {
+        "index": item.index,
+        "title": item.title,
+        "dir": f"branches/{item.branch_id}",
+        "stages": "full" if full else "script_only",
+        "status": "pending",
+        "outputs": {},
+        "gates": {},
+        "events": [],
+    }
+
+
+@dataclass
+class RunContext:
+    """Everything a pipeline step needs, bundled for the DAG builder."""
+
+    cfg: dict
+    run_dir: Path
+    agents_dir: Path
+    contracts: ContractSet
+    provider: Provider
+    manifest: RunManifest
+    manifest_path: Path
+    previous: dict | None = None  # prior manifest of this run folder (--incremental, --resume)
+    prompt_hashes: dict = field(default_factory=dict)  # agent -> prompt sha256, hashed once per process
+    speculative: bool = False  # draft Parker's post bundle for likely-pass branches during QC
+    speculative_drafts: int = 0  # drafts started so far (capped by speculative.max_drafts)
+    run_index: RunIndex | None = None
+    object_store: ObjectStore | None = None
+    models: ArtifactModels = field(default_factory=ArtifactModels)  # parsed artifacts, shared by steps and gates
+
+    def checkpoint(self) -> None:
+        """Materialize the journaled manifest as YAML (trunk done, branch done, end of run)."""
+        save_manifest(self.manifest_path, self.manifest.snapshot(), self.run_index)
+
+
+@dataclass(frozen=True)
+class StepInputs:
+    """What an artifact step reads, for make-style change detection.
+
+    `upstream` names scheduler artifacts whose files are hashed; `policy` names
+    `policy.*` docs from project.yaml; `params` holds any other payload inputs.
+    """
+
+    agent: str
+    upstream: tuple[str, ...] = ()
+    policy: tuple[str, ...] = ()
+    params: dict | None = None
+
+
+def step_fingerprint(ctx: RunContext, artifact_key: str, spec: StepInputs, inputs: dict) -> dict:
+    """Hash every input of an artifact step (prompt, upstream files, policy docs, provider config, contract)."""
+    cfg = ctx.cfg
+    prompt_path = ctx.agents_dir / cfg["agent_routing"][spec.agent]["prompt_file"]
+    _, provider_cfg = _resolve_agent_provider_cfg(cfg, spec.agent)
+    fingerprint = {
+        "prompt": ctx.prompt_hashes.get(spec.agent) or sha256_file(prompt_path),
+        "provider": sha256_text(json.dumps(asdict(provider_cfg), sort_keys=True, default=str)),
+        "contract": sha256_text(json.dumps(ctx.contracts["artifacts"].get(artifact_key), sort_keys=True)),
+    }
+    for name in spec.upstream:
+        fingerprint[f"upstream:{name.rsplit('/', 1)[-1]}"] = sha256_file(inputs[name])
+    for key in spec.policy:
+        fingerprint[f"policy:{key}"] = policy_block(cfg, key).sha256
+    if spec.params:
+        fingerprint["params"] = sha256_text(json.dumps(spec.params, sort_keys=True, default=str))
+    return fingerprint
+
+
+def _reusable_output(previous: dict | None, artifact_key: str, fingerprint: dict, out_dir: Path) -> Path | None:
+    """Return the prior output path if the step completed and its recorded inputs and file hash still match."""
+    if not previous:
+        return None
+    step = (previous.get("steps") or {}).get(artifact_key) or {}
+    output = (previous.get("outputs") or {}).get(artifact_key) or {}
+    if step.get("status", "complete") != "complete" or step.get("inputs") != fingerprint or not output.get("path"):
+        return None
+    out_path = out_dir / output["path"]
+    if not out_path.exists() or sha256_file(out_path) != output.get("sha256"):
+        return None
+    return out_path
 
-    cfg = load_config(Path(args.config))
+
+def _artifact_step(
+    ctx: RunContext,
+    name: str,
+    artifact_key: str,
+    section: RunManifest,
+    fn,
+    requires: tuple[str, ...] = (),
+    *,
+    spec: StepInputs,
+    out_dir: Path,
+    previous: dict | None = None,
+    before=None,
+    after=None,
+    failed=None,
+) -> Step:
+    """Wrap a `step_*` coroutine so its output is recorded in `section`.
+
+    The step's input fingerprint and completion marker (`status`: running → complete
+    or failed) are stored under `section.steps`. With `ctx.previous` set (incremental
+    or resumed run), a completed step whose fingerprint and output file are unchanged
+    since the prior run is skipped and its previous output reused. A step that failed
+    its contract last time is regenerated without replaying the cached response.
+    """
+
+    async def run(inputs: dict) -> Path:
+        with span("step", step=name, agent=spec.agent) as profile:
+            if before is not None:
+                before()
+            fingerprint = step_fingerprint(ctx, artifact_key, spec, inputs)
+            out_path = _reusable_output(previous, artifact_key, fingerprint, out_dir)
+            if out_path is not None:
+                profile["skipped"] = True
+                section.set("outputs", artifact_key, value=previous["outputs"][artifact_key])
+                record_event(section, "step_skipped", step=artifact_key, reason="inputs_unchanged")
+            else:
+                prior = ((previous or {}).get("steps") or {}).get(artifact_key) or {}
+                regenerate = prior.get("status") == "failed" and prior.get("contract_violation", False)
+                section.set("steps", artifact_key, value={
+                    "agent": spec.agent,
+                    "inputs": fingerprint,
+                    "status": "running",
+                    "started_at": now_iso(),
+                })
+                try:
+                    with refresh_cache() if regenerate else nullcontext():
+                        out_path = await fn(inputs)
+                except Exception as exc:
+                    section.set("steps", artifact_key, "status", value="failed")
+                    section.set("steps", artifact_key, "error", value=str(exc))
+                    section.set("steps", artifact_key, "contract_violation", value=isinstance(exc, ContractViolation))
+                    if failed is not None:
+                        failed(exc)
+                    raise
+                upsert_output_manifest(section, artifact_key, out_path, ctx.object_store)
+            with span("parse_artifact", artifact=artifact_key):
+                ctx.models.load(artifact_key, out_path)
+            section.set("steps", artifact_key, value={
+                "agent": spec.agent,
+                "inputs": fingerprint,
+                "status": "complete",
+                "completed_at": now_iso(),
+            })
+            if after is not None:
+                after()
+        return out_path
+
+    return Step(name=name, run=run, requires=requires)
+
+
+def add_branch_steps(scheduler: StepScheduler, ctx: RunContext, item: ShortlistItem, *, full: bool) -> None:
+    """Declare scene_brief → lena (→ scene_plan → evan → qc) for one shortlist item.
+
+    The branch only touches its own sub-folder and manifest section, so branches
+    run concurrently. A failed step stops its own branch (status `failed`) but not the others.
+    """
+    cfg, agents_dir, contracts, provider = ctx.cfg, ctx.agents_dir, ctx.contracts, ctx.provider
+    run_defaults = cfg.get("run_defaults", {})
+    policy = cfg.get("policy") or {}
+    ctx.manifest.set("branches", item.branch_id, value=new_branch_section(item, full=full))
+    section = ctx.manifest.section("branches", item.branch_id)
+    previous = ((ctx.previous or {}).get("branches") or {}).get(item.branch_id)
+    branch_dir = ctx.run_dir / section["dir"]
+
+    def key(artifact: str) -> str:
+        return f"{item.branch_id}/{artifact}"
+
+    def branch_step(artifact_key: str, fn, requires: tuple[str, ...], spec: StepInputs, **hooks) -> Step:
+        return _artifact_step(
+            ctx, key(artifact_key), artifact_key, section, fn, requires,
+            spec=spec, out_dir=branch_dir, previous=previous,
+            failed=lambda exc: branch_failed(artifact_key, exc), **hooks,
+        )
+
+    def branch_failed(artifact_key: str, exc: Exception) -> None:
+        # Only this branch stops; its siblings finish and the run fails once they are done.
+        section.set("status", value="failed")
+        record_event(section, "branch_failed", step=artifact_key, error=f"{type(exc).__name__}: {exc}")
+        ctx.checkpoint()
+
+    def start() -> None:
+        section.set("status", value="running")
+        record_event(section, "branch_start")
+
+    def scripted() -> None:
+        if not full:
+            section.set("status", value="scripted")
+
+    scheduler.add(branch_step(
+        "scene_brief",
+        lambda i: step_rowan_scene_brief(cfg, branch_dir, agents_dir, contracts, provider, section, item),
+        ("approved_ideas",),
+        StepInputs("rowan", policy=("character_bible",), params={"item": item.block}),
+        before=start,
+    ))
+    scheduler.add(branch_step(
+        "scripts",
+        lambda i: step_lena(cfg, branch_dir, agents_dir, contracts, provider, section, i[key("scene_brief")]),
+        (key("scene_brief"),),
+        StepInputs("lena", upstream=(key("scene_brief"),), policy=("character_bible",),
+                   params={"target_seconds": run_defaults.get("target_seconds")}),
+        after=scripted,
+    ))
+    if not full:
+        return
+
+    scheduler.add(branch_step(
+        "scene_plan",
+        lambda i: step_rowan_scene_plan(cfg, branch_dir, agents_dir, contracts, provider, section, i[key("scene_brief")], i[key("scripts")]),
+        (key("scene_brief"), key("scripts")),
+        StepInputs("rowan", upstream=(key("scene_brief"), key("scripts")), policy=("character_bible",)),
+    ))
+    budget_cfg = cfg.get("render_budget") or {}
+    preflight = (key("render_budget"),) if budget_cfg.get("enabled", False) else ()
+
+    def add_render_steps() -> None:
+        """Evan → QC (→ speculative Parker draft); added once the render preflight passes."""
+        scheduler.add(branch_step(
+            "render_report",
+            lambda i: step_evan(
+                cfg, branch_dir, agents_dir, contracts, provider, section, i[key("scene_plan")], i[key("scripts")],
+                ctx.object_store, ctx.models, i.get(key("render_budget")),
+            ),
+            (key("scene_plan"), key("scripts"), *preflight),
+            StepInputs("evan", upstream=(key("scene_plan"), key("scripts")), params={
+                **{k: run_defaults.get(k) for k in ("aspect_ratio", "resolution", "fps", "target_seconds")},
+                "render_budget": budget_cfg if preflight else None,
+            }),
+        ))
+        async def qc_checks(inputs: dict) -> list[CheckResult]:
+            with span("step", step=key("qc_checks")):
+                return qc_deterministic_checks(cfg, branch_dir, contracts, {a: inputs[key(a)] for a in QC_INPUTS})
+
+        scheduler.add(Step(name=key("qc_checks"), run=qc_checks, requires=tuple(key(a) for a in QC_INPUTS)))
+        scheduler.add(branch_step(
+            "qc_report",
+            lambda i: step_qc(
+                cfg, branch_dir, agents_dir, contracts, provider, section,
+                {a: i[key(a)] for a in QC_INPUTS}, i[key("qc_checks")],
+            ),
+            (*(key(a) for a in QC_INPUTS), key("qc_checks")),
+            StepInputs("qc", upstream=tuple(key(a) for a in QC_INPUTS), policy=qc_policy_keys(cfg), params={
+                "qc": cfg.get("qc"),
+                "red_lines": policy.get("red_lines"),
+                "red_line_terms": policy.get("red_line_terms"),
+                "target_seconds": run_defaults.get("target_seconds"),
+            }),
+        ))
+
+        async def qc_gate(inputs: dict) -> str:
+            with span("step", step=key("qc_gate")):
+                qc_report = inputs[key("qc_report")]
+                qc_decision = ctx.models.load("qc_report", qc_report)
+                record_gate(section, "qc", qc_decision.status, source=qc_report.name)
+                if qc_decision.status == "FAIL" and run_defaults.get("stop_on_qc_fail", True):
+                    write_text(
+                        branch_dir / "STOPPED_QC_FAIL.md",
+                        (
+                            "# STOPPED_QC_FAIL\n\n"
+                            "QC reported FAIL and stop_on_qc_fail=true.\n"
+                        ),
+                    )
+                    section.set("status", value="stopped_qc_fail")
+                else:
+                    section.set("status", value="qc_" + qc_decision.status.lower())
+                ctx.checkpoint()
+            return qc_decision.status
+
+        scheduler.add(Step(name=key("qc_gate"), run=qc_gate, requires=(key("qc_report"),)))
+
+        # Speculative Parker draft: once the deterministic QC checks pass, alongside QC's LLM checks.
+        if ctx.speculative:
+            max_drafts = int((cfg.get("speculative") or {}).get("max_drafts", 1))
+
+            async def parker_draft(inputs: dict) -> None:
+                with span("step", step=key("parker_draft"), agent="parker"):
+                    failed = [r.name for r in inputs[key("qc_checks")] if r.status == "FAIL"]
+                    if failed:
+                        record_event(section, "speculative_skipped", reason="qc_fail", checks=failed)
+                        return
+                    if ctx.speculative_drafts >= max_drafts:
+                        record_event(section, "speculative_skipped", reason="max_drafts")
+                        return
+                    ctx.speculative_drafts += 1
+                    await draft_post_bundle(ctx, section)
+
+            scheduler.add(Step(name=key("parker_draft"), run=parker_draft, requires=(key("qc_checks"),)))
+
+    async def render_preflight(inputs: dict) -> RenderBudget:
+        # Estimate render cost/time offline; only a plan within budget gets Evan and QC.
+        with span("step", step=key("render_preflight")):
+            plan = ctx.models.load("scene_plan", inputs[key("scene_plan")])
+            budget = estimate_render(cfg, plan_shots(plan, run_defaults.get("target_seconds")))
+            section.set("render_budget", value=budget.to_manifest())
+            record_gate(section, "render_budget", "PASS" if budget.ok else "FAIL", source=cfg['artifacts']['scene_plan'])
+            if budget.ok:
+                add_render_steps()
+            else:
+                write_text(
+                    branch_dir / "STOPPED_RENDER_BUDGET.md",
+                    "# STOPPED_RENDER_BUDGET\n\n"
+                    "The scene plan's render estimate breaks render_budget.limits:\n"
+                    + "".join(f"- {v}\n" for v in budget.violations),
+                )
+                section.set("status", value="stopped_render_budget")
+                record_event(section, "render_budget_rejected", violations=list(budget.violations))
+                ctx.checkpoint()
+        return budget
+
+    if preflight:
+        scheduler.add(Step(name=key("render_preflight"), run=render_preflight, requires=(key("scene_plan"),), produces=key("render_budget")))
+    else:
+        add_render_steps()
+
+
+def build_pipeline(ctx: RunContext) -> StepScheduler:
+    """Declare the full-run DAG: trend_scout → theo → mabel → one branch per shortlist item.
+
+    `run_defaults.max_parallel_branches` caps concurrent steps; trunk steps run alone,
+    so during fan-out it bounds the number of branches in flight.
+    """
+    cfg, run_dir, agents_dir, contracts, provider, manifest = (
+        ctx.cfg, ctx.run_dir, ctx.agents_dir, ctx.contracts, ctx.provider, ctx.manifest,
+    )
+    run_defaults = cfg.get("run_defaults", {})
+    scheduler = StepScheduler(max_concurrency=max(1, int(run_defaults.get("max_parallel_branches", 4))))
+
+    def trunk_step(artifact_key: str, fn, requires: tuple[str, ...], spec: StepInputs) -> Step:
+        return _artifact_step(
+            ctx, artifact_key, artifact_key, manifest, fn, requires,
+            spec=spec, out_dir=run_dir, previous=ctx.previous,
+        )
+
+    scheduler.add(trunk_step(
+        "trend_brief",
+        lambda i: step_trend_scout(cfg, run_dir, agents_dir, contracts, provider, manifest),
+        (),
+        StepInputs("trend_scout"),
+    ))
+    scheduler.add(trunk_step(
+        "ideas",
+        lambda i: step_theo(cfg, run_dir, agents_dir, contracts, provider, manifest, i["trend_brief"]),
+        ("trend_brief",),
+        StepInputs("theo", upstream=("trend_brief",), params={"batch_size_ideas": run_defaults.get("batch_size_ideas")}),
+    ))
+    scheduler.add(trunk_step(
+        "approved_ideas",
+        lambda i: step_mabel(cfg, run_dir, agents_dir, contracts, provider, manifest, i["ideas"], ctx.models),
+        ("ideas",),
+        StepInputs("mabel", upstream=("ideas",), policy=("stephanie_taste_profile",), params={
+            "prefilter": cfg.get("prefilter"),
+            "red_line_terms": (cfg.get("policy") or {}).get("red_line_terms"),
+        }),
+    ))
+
+    async def fanout(inputs: dict) -> list[str]:
+        # The first `max_scene_plans` items run the full branch; the rest stop after Lena.
+        with span("step", step="fanout"):
+            items = select_branch_items(cfg, inputs["approved_ideas"], ctx.models)
+            max_scene_plans = int(run_defaults.get("max_scene_plans", len(items)))
+            for item in items:
+                add_branch_steps(scheduler, ctx, item, full=item.index <= max_scene_plans)
+            ctx.checkpoint()
+        return [item.branch_id for item in items]
+
+    scheduler.add(Step(name="fanout", run=fanout, requires=("approved_ideas",), produces="branch_ids"))
+    return scheduler
+
+
+def select_curator_branch(manifest: dict, curator_text: str) -> dict:
+    """Resolve the branch Parker should publish (explicit pick, else first QC PASS)."""
+    branches = manifest.get("branches") or {}
+    if not branches:
+        raise ValueError("Run manifest has no branches to publish")
+    wanted = parse_curator_branch(curator_text)
+    if wanted:
+        for branch_id, section in branches.items():
+            if branch_id == wanted or branch_id.startswith(f"{wanted}_") or int(section.get("index", 0)) == _as_int(wanted):
+                return section
+        raise ValueError(f"Curator selected unknown branch: {wanted}")
+    for section in branches.values():
+        if (section.get("gates") or {}).get("qc", {}).get("decision") == "PASS":
+            return section
+    raise ValueError("No branch passed QC; set 'Selected branch:' in curator_decision.md")
+
+
+def _as_int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+# ---------------------------
+# Main
+# ---------------------------
+
+def make_provider(
+    cfg: dict,
+    root_dir: Path,
+    *,
+    use_cache: bool = True,
+    limits: dict | None = None,
+    batching: bool | dict | None = None,
+    client: Any = None,
+) -> Provider:
+    """Build the provider stack: base client (stub in Phase 1, or `client`), then wrappers.
+
+    Innermost first: the provider pool (rate limits, fair queuing; `limits` overrides
+    `providers.<ref>.limits`), retries, the batch collector (`batching` overrides the
+    `batching:` block), then the cache. Cache hits never wait on the pool, deadlines or
+    a batch window, and retry backoff never holds a pool slot. The retry layer's per-attempt
+    deadline is applied by the pool, so it only starts once the call holds a slot.
+    """
+    client = client if client is not None else StubProvider(stub_output)
+    provider = as_async_provider(client, max_workers=int((cfg.get("resilience") or {}).get("sync_workers", 16)))
+    provider = ProviderPool(provider, cfg, limits)
+    provider = build_resilient_provider(cfg, provider)
+    # Clients with a native batch API serve batches directly; otherwise they run locally.
+    backend = client if hasattr(client, "submit_batch") else None
+    provider = build_batch_collector(cfg, provider, backend=backend, override=batching)
+    if use_cache:
+        provider = build_cache_provider(cfg, root_dir, provider)
+    return provider
+
+
+@dataclass(frozen=True)
+class SharedInputs:
+    """Config, contracts and prompt hashes, loaded once per process and shared by runs."""
+
+    cfg: dict
+    root_dir: Path
+    agents_dir: Path
+    runs_dir: Path
+    templates_dir: Path
+    contracts: ContractSet
+    config_entry: dict  # manifest inputs.config
+    contracts_entry: dict  # manifest inputs.contracts
+    prompts: dict  # manifest inputs.prompts
+    run_index: RunIndex | None = None  # SQLite index mirrored at every manifest write
+    object_store: ObjectStore | None = None  # dedup store that run folders hardlink into
+
+
+def load_shared_inputs(config_path: Path) -> SharedInputs:
+    cfg = load_config(config_path)
     root_dir = Path(__file__).resolve().parents[1]
     agents_dir = root_dir / cfg['paths']['agents_dir']
-    runs_dir = root_dir / cfg['paths']['runs_dir']
-    templates_dir = root_dir / cfg['paths']['templates_dir']
 
     contracts_path = root_dir / "contracts" / "artifact_contracts.yaml"
     contracts = load_contracts(contracts_path)
 
-    # Initialize run manifest (written into each run folder)
-    cfg_path = Path(args.config)
-    cfg_abs = (root_dir / cfg_path).resolve() if not cfg_path.is_absolute() else cfg_path
+    cfg_abs = (root_dir / config_path).resolve() if not config_path.is_absolute() else config_path
     contracts_abs = contracts_path.resolve()
 
     prompts_manifest = {}
@@ -582,116 +1608,53 @@ def main():
                 "sha256": None,
             }
 
+    config_entry = {
+        "path": str(cfg_abs.relative_to(root_dir)).replace("\\", "/") if cfg_abs.exists() else str(cfg_abs),
+        "sha256": sha256_file(cfg_abs) if cfg_abs.exists() else None,
+    }
+    if config_entry["sha256"] is None:
+        # Best-effort fallback: compute hash from loaded config dict.
+        config_entry["sha256"] = sha256_text(yaml.safe_dump(cfg, sort_keys=False))
+
     # Ensure taste profile exists
     taste_path = root_dir / cfg['policy']['stephanie_taste_profile']
     taste_path.parent.mkdir(parents=True, exist_ok=True)
     if not taste_path.exists():
         write_text(taste_path, "# stephanie_taste_profile.md\n\n(fill in)\n")
 
-    # Resume path flow (after curator decision)
-    if args.resume:
-        run_dir = Path(args.resume)
-        manifest_path = run_dir / cfg['artifacts'].get('run_manifest', 'run_manifest.yaml')
-        provider = StubProvider(stub_output)
-        manifest = {
-            "schema_version": "v1",
-            "run": {
-                "id": run_dir.name,
-                "created_at": now_iso(),
-                "mode": "resume",
-            },
-            "inputs": {
-                "config": {
-                    "path": str(cfg_abs.relative_to(root_dir)).replace("\\", "/") if cfg_abs.exists() else str(cfg_abs),
-                    "sha256": sha256_file(cfg_abs) if cfg_abs.exists() else None,
-                },
-                "contracts": {
-                    "path": str(contracts_abs.relative_to(root_dir)).replace("\\", "/"),
-                    "sha256": sha256_file(contracts_abs),
-                },
-                "prompts": prompts_manifest,
-                "provider": cfg.get("providers", {}).get("default", {}),
-                "routing": {
-                    agent: {
-                        "provider": (route or {}).get("provider"),
-                        "model": (route or {}).get("model"),
-                        "prompt_file": (route or {}).get("prompt_file"),
-                    }
-                    for agent, route in (cfg.get("agent_routing", {}) or {}).items()
-                },
-            },
-            "outputs": {},
-            "events": [
-                {
-                    "type": "resume",
-                    "at": now_iso(),
-                }
-            ],
-        }
-
-        # If an existing manifest is present, preserve it and append event.
-        if manifest_path.exists():
-            try:
-                existing = yaml.safe_load(read_text(manifest_path))
-                if isinstance(existing, dict):
-                    existing.setdefault("events", []).append({"type": "resume", "at": now_iso()})
-                    existing.setdefault("inputs", {}).setdefault(
-                        "provider", cfg.get("providers", {}).get("default", {})
-                    )
-                    existing.setdefault("inputs", {}).setdefault(
-                        "routing",
-                        {
-                            agent: {
-                                "provider": (route or {}).get("provider"),
-                                "model": (route or {}).get("model"),
-                                "prompt_file": (route or {}).get("prompt_file"),
-                            }
-                            for agent, route in (cfg.get("agent_routing", {}) or {}).items()
-                        },
-                    )
-                    manifest = existing
-            except Exception:
-                pass
-
-        curator_path = run_dir / cfg['artifacts']['curator_decision']
-        if not curator_path.exists():
-            raise FileNotFoundError(f"Missing curator_decision.md in {run_dir}")
-        curator_text = read_text(curator_path)
-        curator_decision = parse_curator_approval(curator_text)
-        record_gate(manifest, "curator", curator_decision.status, source=curator_path.name)
-        if curator_decision.status != "APPROVED":
-            print("Curator vetoed / not approved. Stopping.")
-            write_yaml(manifest_path, manifest)
-            return
-        parker_out = step_parker(cfg, run_dir, agents_dir, curator_path, provider, manifest)
-        upsert_output_manifest(manifest, "post_bundle", parker_out)
-        write_yaml(manifest_path, manifest)
-        print(f"Parker created post bundle: {parker_out}")
-        return
+    return SharedInputs(
+        cfg=cfg,
+        root_dir=root_dir,
+        agents_dir=agents_dir,
+        runs_dir=root_dir / cfg['paths']['runs_dir'],
+        templates_dir=root_dir / cfg['paths']['templates_dir'],
+        contracts=contracts,
+        config_entry=config_entry,
+        contracts_entry={
+            "path": str(contracts_abs.relative_to(root_dir)).replace("\\", "/"),
+            "sha256": sha256_file(contracts_abs),
+        },
+        prompts=prompts_manifest,
+        run_index=open_run_index(cfg, root_dir),
+        object_store=open_object_store(cfg, root_dir),
+    )
 
-    date = args.date or dt.date.today().isoformat()
-    run_dir = ensure_run_dir(runs_dir, date, args.slug)
 
-    manifest_path = run_dir / cfg['artifacts'].get('run_manifest', 'run_manifest.yaml')
-    manifest = {
+def base_manifest(shared: SharedInputs, run_dir: Path, mode: str, **run_fields) -> dict:
+    cfg = shared.cfg
+    return {
         "schema_version": "v1",
         "run": {
             "id": run_dir.name,
             "created_at": now_iso(),
-            "mode": "full",
-            "date": date,
-            "slug": args.slug,
+            "mode": mode,
+            **run_fields,
         },
         "inputs": {
-            "config": {
-                "path": str(cfg_abs.relative_to(root_dir)).replace("\\", "/") if cfg_abs.exists() else str(cfg_abs),
-                "sha256": sha256_file(cfg_abs) if cfg_abs.exists() else None,
-            },
-            "contracts": {
-                "path": str(contracts_abs.relative_to(root_dir)).replace("\\", "/"),
-                "sha256": sha256_file(contracts_abs),
-            },
-            "prompts": prompts_manifest,
+            "config": dict(shared.config_entry),
+            "contracts": dict(shared.contracts_entry),
+            "prompts": {agent: dict(entry) for agent, entry in shared.prompts.items()},
+            "context_blocks": policy_inputs(cfg),
             "provider": cfg.get("providers", {}).get("default", {}),
             "routing": {
                 agent: {
@@ -703,77 +1666,574 @@ def main():
             },
         },
         "outputs": {},
-        "events": [{"type": "start", "at": now_iso()}],
+        "events": [],
     }
 
-    if manifest["inputs"]["config"]["sha256"] is None:
-        # Best-effort fallback: compute hash from loaded config dict.
-        manifest["inputs"]["config"]["sha256"] = sha256_text(yaml.safe_dump(cfg, sort_keys=False))
 
-    # Write an initial manifest immediately for provenance, even if the run later fails.
-    write_yaml(manifest_path, manifest)
+def _journal_fsync(cfg: dict) -> bool:
+    return bool((cfg.get("journal") or {}).get("fsync", False))
 
-    # Ensure curator template is available for user later
-    copy_template(templates_dir / "curator_decision.template.md", run_dir / "curator_decision.md")
 
-    provider = StubProvider(stub_output)
+def load_run_state(run_dir: Path, manifest_path: Path) -> dict | None:
+    """Latest recorded state of a run folder: the replayed journal, else the YAML manifest."""
+    # The journal is at least as fresh as the YAML (e.g. after a crash mid-run).
+    if (run_dir / JOURNAL_NAME).exists():
+        return replay_journal(run_dir / JOURNAL_NAME) or None
+    if manifest_path.exists():
+        loaded = yaml.safe_load(read_text(manifest_path))
+        return loaded if isinstance(loaded, dict) else None
+    return None
+
+
+def incomplete_steps(state: dict) -> list[str]:
+    """Artifact steps recorded as started but not completed (trunk first, then per branch)."""
+    found = [name for name, step in (state.get("steps") or {}).items() if step.get("status", "complete") != "complete"]
+    for branch_id, section in (state.get("branches") or {}).items():
+        found += [
+            f"{branch_id}/{name}"
+            for name, step in (section.get("steps") or {}).items()
+            if step.get("status", "complete") != "complete"
+        ]
+    return found
+
+
+def resume_run(shared: SharedInputs, run_dir: Path, *, provider: Provider) -> dict:
+    """Resume a run folder. Returns an outcome summary.
+
+    A run whose pipeline never finished (no run-level QC gate: a provider error, a
+    contract violation, a killed process) restarts from its first incomplete steps;
+    completed steps are reused. A finished run goes through the curator gate and Parker.
+    """
+    cfg = shared.cfg
+    manifest_path = run_dir / cfg['artifacts'].get('run_manifest', 'run_manifest.yaml')
+    state = load_run_state(run_dir, manifest_path)
+    if state and "qc" not in (state.get("gates") or {}):
+        run = state.get("run") or {}
+        for stale in [run_dir / "CONTRACT_VIOLATION.md", *run_dir.glob("branches/*/CONTRACT_VIOLATION.md")]:
+            stale.unlink(missing_ok=True)
+        return _run_pipeline(
+            shared, run_dir, run["date"], run["slug"], provider=provider, previous=state, mode="resume", speculative=None,
+        )
+    fresh = base_manifest(shared, run_dir, "resume")
+
+    # If an existing journal/manifest is present, preserve it and append event.
+    if (run_dir / JOURNAL_NAME).exists():
+        manifest = open_run_manifest(run_dir, None, fsync=_journal_fsync(cfg))
+    else:
+        existing = None
+        if manifest_path.exists():
+            try:
+                existing = yaml.safe_load(read_text(manifest_path))
+            except Exception:
+                existing = None
+        manifest = open_run_manifest(run_dir, existing if isinstance(existing, dict) else fresh, fsync=_journal_fsync(cfg))
+    try:
+        record_event(manifest, "resume")
+        if "provider" not in manifest.get("inputs", {}):
+            manifest.set("inputs", "provider", value=fresh["inputs"]["provider"])
+        if "routing" not in manifest.get("inputs", {}):
+            manifest.set("inputs", "routing", value=fresh["inputs"]["routing"])
+
+        curator_path = run_dir / cfg['artifacts']['curator_decision']
+        if not curator_path.exists():
+            raise FileNotFoundError(f"Missing curator_decision.md in {run_dir}")
+        curator_text = read_text(curator_path)
+        curator_decision = parse_curator_approval(curator_text)
+        record_gate(manifest, "curator", curator_decision.status, source=curator_path.name)
+        if curator_decision.status != "APPROVED":
+            save_manifest(manifest_path, manifest.snapshot(), shared.run_index)
+            return {"run_dir": str(run_dir), "status": "curator_" + curator_decision.status.lower()}
+        branch = select_curator_branch(manifest.data, curator_text)
+        manifest.set("gates", "curator", "branch", value=branch["dir"])
+        payload = parker_payload(branch, curator_text)
+        parker_out = run_dir / "post_bundle" / "post_plan.md"
+        draft = None
+        if (run_dir / SPECULATIVE_DIR).exists():
+            fingerprint = parker_fingerprint(cfg, shared.agents_dir, branch, curator_text)
+            draft = promote_speculative_draft(run_dir, branch, fingerprint, parker_out)
+            if draft == "promoted":
+                record_event(manifest, "speculative_promoted", branch=branch["dir"])
+            else:
+                record_event(manifest, "speculative_discarded", branch=branch["dir"], reason=draft)
+            # Drafts for other branches (and a stale one for this branch) are never needed again.
+            shutil.rmtree(run_dir / SPECULATIVE_DIR, ignore_errors=True)
+        if draft != "promoted":
+            asyncio.run(step_parker(cfg, shared.agents_dir, provider, manifest, payload, parker_out))
+        upsert_output_manifest(manifest, "post_bundle", parker_out, shared.object_store)
+        save_manifest(manifest_path, manifest.snapshot(), shared.run_index)
+        return {"run_dir": str(run_dir), "status": "published", "post_bundle": str(parker_out), "speculative": draft}
+    finally:
+        manifest.close()
+
+
+def execute_run(
+    shared: SharedInputs,
+    date: str,
+    slug: str,
+    *,
+    provider: Provider,
+    incremental: bool = False,
+    speculative: bool | None = None,
+) -> dict:
+    """Run the full pipeline for one date/slug. Returns an outcome summary.
+
+    With `profiling.enabled`, writes run_profile.json / run_profile.md to the run folder
+    (also when the run fails). `speculative` (default: `speculative.enabled`) drafts
+    Parker's post bundle ahead of the curator gate.
+    """
+    run_dir = ensure_run_dir(shared.runs_dir, date, slug)
+    previous = None
+    if incremental:
+        previous = load_run_state(run_dir, run_dir / shared.cfg['artifacts'].get('run_manifest', 'run_manifest.yaml'))
+    return _run_pipeline(
+        shared, run_dir, date, slug, provider=provider, previous=previous,
+        mode="incremental" if previous else "full", speculative=speculative,
+    )
+
+
+def _run_pipeline(
+    shared: SharedInputs,
+    run_dir: Path,
+    date: str,
+    slug: str,
+    *,
+    provider: Provider,
+    previous: dict | None,
+    mode: str,
+    speculative: bool | None,
+) -> dict:
+    if speculative is None:
+        speculative = bool((shared.cfg.get("speculative") or {}).get("enabled", False))
+    profiler = RunProfiler(run_dir.name) if (shared.cfg.get("profiling") or {}).get("enabled", False) else None
+    with activate(profiler), pool_scope(run_dir.name):
+        try:
+            return _execute_run(
+                shared, run_dir, date, slug, provider=provider, previous=previous, mode=mode, speculative=speculative,
+            )
+        finally:
+            if profiler is not None:
+                write_profile(run_dir, profiler)
+
+
+def _execute_run(
+    shared: SharedInputs,
+    run_dir: Path,
+    date: str,
+    slug: str,
+    *,
+    provider: Provider,
+    previous: dict | None,
+    mode: str,
+    speculative: bool,
+) -> dict:
+    cfg = shared.cfg
+    manifest_path = run_dir / cfg['artifacts'].get('run_manifest', 'run_manifest.yaml')
+    initial = base_manifest(shared, run_dir, mode, date=date, slug=slug)
+    initial["events"].append({"type": "start", "at": now_iso()})
+    if mode == "resume":
+        initial["events"].append({"type": "resume_restart", "at": now_iso(), "incomplete": incomplete_steps(previous)})
+
+    # Start the journal and write an initial manifest immediately for provenance,
+    # even if the run later fails.
+    manifest = open_run_manifest(run_dir, initial, fsync=_journal_fsync(cfg))
+    save_manifest(manifest_path, manifest.snapshot(), shared.run_index)
+
+    # Ensure curator template is available for user later
+    copy_template(shared.templates_dir / "curator_decision.template.md", run_dir / "curator_decision.md")
 
     # Run pipeline
-    trend = step_trend_scout(cfg, run_dir, agents_dir, contracts, provider, manifest)
-    upsert_output_manifest(manifest, "trend_brief", trend)
-    write_yaml(manifest_path, manifest)
-    ideas = step_theo(cfg, run_dir, agents_dir, contracts, provider, manifest, trend)
-    upsert_output_manifest(manifest, "ideas", ideas)
-    write_yaml(manifest_path, manifest)
-    approved = step_mabel(cfg, run_dir, agents_dir, contracts, provider, manifest, ideas)
-    upsert_output_manifest(manifest, "approved_ideas", approved)
-    write_yaml(manifest_path, manifest)
-    scene_brief = step_rowan_scene_brief(cfg, run_dir, agents_dir, contracts, provider, manifest, approved)
-    upsert_output_manifest(manifest, "scene_brief", scene_brief)
-    write_yaml(manifest_path, manifest)
-    scripts = step_lena(cfg, run_dir, agents_dir, contracts, provider, manifest, scene_brief)
-    upsert_output_manifest(manifest, "scripts", scripts)
-    write_yaml(manifest_path, manifest)
-    scene = step_rowan_scene_plan(cfg, run_dir, agents_dir, contracts, provider, manifest, scene_brief, scripts)
-    upsert_output_manifest(manifest, "scene_plan", scene)
-    write_yaml(manifest_path, manifest)
-    render_report = step_evan(cfg, run_dir, agents_dir, contracts, provider, manifest, scene, scripts)
-    upsert_output_manifest(manifest, "render_report", render_report)
-    write_yaml(manifest_path, manifest)
-    qc_report = step_qc(cfg, run_dir, agents_dir, contracts, provider, manifest, render_report)
-    upsert_output_manifest(manifest, "qc_report", qc_report)
-    write_yaml(manifest_path, manifest)
-
-    qc_text = read_text(qc_report)
-    qc_decision = parse_qc_status(qc_text)
-    record_gate(manifest, "qc", qc_decision.status, source=qc_report.name)
-    write_yaml(manifest_path, manifest)
-
-    if qc_decision.status == "FAIL" and cfg.get("run_defaults", {}).get("stop_on_qc_fail", True):
-        write_text(
-            run_dir / "STOPPED_QC_FAIL.md",
-            (
-                "# STOPPED_QC_FAIL\n\n"
-                "QC reported FAIL and stop_on_qc_fail=true.\n"
-            ),
+    ctx = RunContext(
+        cfg=cfg,
+        run_dir=run_dir,
+        agents_dir=shared.agents_dir,
+        contracts=shared.contracts,
+        provider=provider,
+        manifest=manifest,
+        manifest_path=manifest_path,
+        previous=previous,
+        prompt_hashes={agent: entry["sha256"] for agent, entry in shared.prompts.items()},
+        speculative=speculative,
+        run_index=shared.run_index,
+        object_store=shared.object_store,
+        models=open_artifact_models(cfg),
+    )
+    try:
+        try:
+            asyncio.run(build_pipeline(ctx).run())
+        finally:
+            # Materialize whatever the journal holds, even if a step failed.
+            ctx.checkpoint()
+        sections = list(manifest.get("branches", {}).values())
+
+        # Run-level QC gate: the run proceeds if any fully-processed branch passed.
+        qc_decisions = [s["gates"]["qc"]["decision"] for s in sections if "qc" in s["gates"]]
+        if "PASS" in qc_decisions:
+            run_qc = "PASS"
+        elif "UNKNOWN" in qc_decisions or not qc_decisions:
+            run_qc = "UNKNOWN"
+        else:
+            run_qc = "FAIL"
+        record_gate(manifest, "qc", run_qc, source="branches")
+        outcome = {
+            "run_dir": str(run_dir),
+            "gates": {"qc": run_qc},
+            "branches": {
+                branch_id: section.get("status") for branch_id, section in manifest.get("branches", {}).items()
+            },
+        }
+
+        if not qc_decisions and any(s.get("status") == "stopped_render_budget" for s in sections):
+            stopped = [s for s in sections if s.get("status") == "stopped_render_budget"]
+            write_text(
+                run_dir / "STOPPED_RENDER_BUDGET.md",
+                "# STOPPED_RENDER_BUDGET\n\n"
+                "No branch reached QC; these scene plans broke render_budget.limits:\n"
+                + "".join(
+                    f"- {s['dir']}: {'; '.join((s.get('render_budget') or {}).get('violations') or ['see branch'])}\n"
+                    for s in stopped
+                ),
+            )
+            record_event(manifest, "stopped", reason="render_budget")
+            ctx.checkpoint()
+            return {**outcome, "status": "stopped_render_budget"}
+
+        if run_qc == "FAIL" and cfg.get("run_defaults", {}).get("stop_on_qc_fail", True):
+            write_text(
+                run_dir / "STOPPED_QC_FAIL.md",
+                (
+                    "# STOPPED_QC_FAIL\n\n"
+                    "QC reported FAIL for every branch and stop_on_qc_fail=true.\n"
+                ),
+            )
+            record_event(manifest, "stopped", reason="qc_fail")
+            ctx.checkpoint()
+            return {**outcome, "status": "stopped_qc_fail"}
+
+        mark_ready_for_curator(run_dir)
+
+        # Final checkpoint, then validate the manifest itself against contract
+        # (key paths are checked on the in-memory dict; no YAML round-trip).
+        ctx.checkpoint()
+        result = shared.contracts.validate_mapping("run_manifest", manifest.data)
+        if not result.ok:
+            raise_contract_violation("run_manifest", manifest_path, result)
+        return {**outcome, "status": "ready_for_curator"}
+    finally:
+        manifest.close()
+
+
+def run_campaign(
+    shared: SharedInputs,
+    campaign_path: Path,
+    *,
+    use_cache: bool = True,
+    incremental: bool = False,
+    speculative: bool | None = None,
+    client: Any = None,
+) -> Path:
+    """Execute every run listed in a campaign file on a bounded thread pool.
+
+    All runs share the loaded config, contracts, prompt hashes and provider stack.
+    `provider_limits` overrides the pool limits per provider ref (an int caps in-flight
+    calls; a mapping may set max_in_flight/rpm/tpm) across the whole campaign, and
+    `batching` (true/false or a mapping) overrides the `batching:` block, so theo/mabel
+    calls from all runs are submitted together as batch jobs. `client` replaces the stub
+    base provider (e.g. the synthetic providers of scripts/bench.py).
+    Writes `<runs_dir>/campaigns/<name>.summary.yaml` and returns its path.
+    """
+    campaign = yaml.safe_load(read_text(campaign_path)) or {}
+    runs = campaign.get("runs") or []
+    if not runs:
+        raise ValueError(f"Campaign has no runs: {campaign_path}")
+    name = str(campaign.get("name") or campaign_path.stem)
+    workers = max(1, int(campaign.get("workers", 2)))
+
+    limits = campaign.get("provider_limits") or {}
+    batching = campaign.get("batching")
+    provider = make_provider(
+        shared.cfg, shared.root_dir, use_cache=use_cache, limits=limits, batching=batching, client=client,
+    )
+
+    def _one(entry: dict) -> dict:
+        date, slug = str(entry["date"]), str(entry.get("slug") or "run")
+        t0 = time.perf_counter()
+        try:
+            outcome = execute_run(
+                shared, date, slug, provider=provider, incremental=bool(entry.get("incremental", incremental)),
+                speculative=entry.get("speculative", speculative),
+            )
+        except Exception as e:
+            outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        return {"date": date, "slug": slug, **outcome, "duration_s": round(time.perf_counter() - t0, 3)}
+
+    started_at = now_iso()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(workers, len(runs))) as pool:
+        results = list(pool.map(_one, runs))
+
+    statuses: dict[str, int] = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    durations = sorted(r["duration_s"] for r in results)
+    summary = {
+        "campaign": name,
+        "source": str(campaign_path),
+        "started_at": started_at,
+        "finished_at": now_iso(),
+        "workers": workers,
+        "provider_limits": limits,
+        "batching": batching,
+        "totals": {
+            "runs": len(results),
+            "wall_s": round(time.perf_counter() - t0, 3),
+            "run_s_sum": round(sum(durations), 3),
+            "run_s_max": durations[-1],
+            "statuses": statuses,
+        },
+        "runs": results,
+    }
+    summary_path = shared.runs_dir / "campaigns" / f"{name}.summary.yaml"
+    write_yaml(summary_path, summary)
+    return summary_path
+
+
+class WarmInputs:
+    """`SharedInputs` and the provider stack, kept loaded across `--serve` jobs.
+
+    The config, contract and prompt files are stamped by (mtime_ns, size). A changed
+    stamp triggers a hash check; only a changed sha256 reloads everything (and
+    rebuilds the provider). Policy docs already reload on change (context_blocks.py).
+    """
+
+    def __init__(self, config_path: Path, *, use_cache: bool = True):
+        self.config_path = config_path
+        self.use_cache = use_cache
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        self.shared = load_shared_inputs(self.config_path)
+        self.provider = make_provider(self.shared.cfg, self.shared.root_dir, use_cache=self.use_cache)
+        shared = self.shared
+        entries = [shared.config_entry, shared.contracts_entry, *shared.prompts.values()]
+        self._hashes = {shared.root_dir / entry["path"]: entry["sha256"] for entry in entries}
+        self._stamps = {path: _file_stamp(path) for path in self._hashes}
+
+    def current(self) -> tuple[SharedInputs, Provider]:
+        """The loaded inputs, reloaded first if any watched file's content changed."""
+        with self._lock:
+            changed = [path for path, stamp in self._stamps.items() if _file_stamp(path) != stamp]
+            modified = [path for path in changed if _file_sha256(path) != self._hashes[path]]
+            if modified:
+                self._load()
+                print(f"Reloaded config, contracts and prompts ({', '.join(p.name for p in modified)} changed)")
+            else:
+                self._stamps.update((path, _file_stamp(path)) for path in changed)
+            return self.shared, self.provider
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _file_sha256(path: Path) -> str | None:
+    return sha256_file(path) if path.exists() else None
+
+
+def curator_decision_pending(cfg: dict, run_dir: Path) -> GateDecision | None:
+    """The curator's decision for `run_dir` if it is newer than the run manifest (None otherwise).
+
+    The manifest is rewritten by every resume, so a decision is acted on once.
+    """
+    curator_path = run_dir / cfg['artifacts']['curator_decision']
+    curator = _file_stamp(curator_path)
+    manifest = _file_stamp(run_dir / cfg['artifacts'].get('run_manifest', 'run_manifest.yaml'))
+    if curator is None or manifest is None or curator[0] <= manifest[0]:
+        return None
+    decision = parse_curator_approval(read_text(curator_path))
+    return decision if decision.status != "UNKNOWN" else None
+
+
+def dispatch_curator(warm: WarmInputs, run_dir: Path) -> dict:
+    """Apply a new curator decision: the curator gate, then Parker if approved (`resume_run`)."""
+    shared, provider = warm.current()
+    decided = _file_stamp(run_dir / shared.cfg['artifacts']['curator_decision'])
+    try:
+        outcome = resume_run(shared, run_dir, provider=provider)
+    except Exception as e:
+        outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+    turnaround = time.time() - decided[0] / 1e9 if decided else 0.0
+    detail = f": {outcome['error']}" if "error" in outcome else ""
+    print(f"{run_dir.name}: {outcome['status']} {turnaround:.1f}s after the curator decision{detail}")
+    return outcome
+
+
+def run_job(warm: WarmInputs, queue: JobQueue, job: Job) -> dict:
+    """Execute one queued job with the warm inputs and file it under done/ or failed/."""
+    shared, provider = warm.current()
+    spec = job.spec
+    t0 = time.perf_counter()
+    try:
+        if job.kind == "run":
+            outcome = execute_run(
+                shared, str(spec["date"]), str(spec.get("slug") or "run"), provider=provider,
+                incremental=bool(spec.get("incremental", False)), speculative=spec.get("speculative"),
+            )
+        elif job.kind == "resume":
+            run_dir = Path(str(spec["run_dir"]))
+            outcome = resume_run(shared, run_dir if run_dir.is_absolute() else shared.root_dir / run_dir, provider=provider)
+        else:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+    except Exception as e:
+        outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        queue.fail(job, outcome["error"])
+    else:
+        queue.complete(job, {**outcome, "duration_s": round(time.perf_counter() - t0, 3)})
+    print(f"{job.name}: {outcome['status']} ({time.perf_counter() - t0:.1f}s)")
+    return outcome
+
+
+def serve(config_path: Path, *, use_cache: bool = True, drain: bool = False) -> None:
+    """Resident worker: run queued jobs (job_queue.py) on a bounded pool with warm inputs.
+
+    With `serve.curator_decisions`, run folders are watched for curator decisions
+    (curator_watch.py); each new decision goes straight to a Parker pool of
+    `serve.curator_watch.parker_workers`, so dropping in `curator_decision.md` is enough.
+    Work for the same run folder never runs at once. With `drain`, returns once the
+    queue is empty and nothing is running.
+    """
+    warm = WarmInputs(config_path, use_cache=use_cache)
+    cfg = warm.shared.cfg
+    serve_cfg = cfg.get("serve") or {}
+    queue = open_job_queue(cfg, warm.shared.root_dir)
+    workers = max(1, int(serve_cfg.get("workers", 2)))
+    parker_workers = max(1, int((serve_cfg.get("curator_watch") or {}).get("parker_workers", 2)))
+    poll_s = float(serve_cfg.get("poll_s", 2))
+    watcher = open_curator_watcher(cfg, warm.shared.runs_dir) if serve_cfg.get("curator_decisions", True) else None
+    tick_s = min(poll_s, watcher.debounce_s / 2) if watcher is not None else poll_s
+    if recovered := queue.recover():
+        print(f"Requeued {recovered} unfinished job(s)")
+    watching = f"; watching curator decisions ({watcher.backend})" if watcher is not None else ""
+    print(f"Serving {queue.root} with {workers} worker(s){watching}")
+
+    jobs: dict = {}  # future -> run folder name, queued jobs
+    parker: dict = {}  # future -> run folder name, curator dispatches
+    deferred: set[Path] = set()  # decisions for run folders that were busy when they settled
+    with ThreadPoolExecutor(max_workers=workers) as pool, ThreadPoolExecutor(max_workers=parker_workers) as parker_pool:
+        try:
+            while True:
+                shared, _ = warm.current()
+                busy = {*jobs.values(), *parker.values()}
+                if watcher is not None:
+                    for run_dir in [*deferred, *watcher.poll()]:
+                        if run_dir.name in busy:
+                            deferred.add(run_dir)
+                            continue
+                        deferred.discard(run_dir)
+                        decision = curator_decision_pending(shared.cfg, run_dir)
+                        if decision is not None:
+                            print(f"Curator decision {decision.status}: {run_dir}")
+                            parker[parker_pool.submit(dispatch_curator, warm, run_dir)] = run_dir.name
+                            busy.add(run_dir.name)
+                while len(jobs) < workers:
+                    job = queue.claim(busy=busy)
+                    if job is None:
+                        break
+                    jobs[pool.submit(run_job, warm, queue, job)] = job.run_key
+                    busy.add(job.run_key)
+                if not jobs and not parker:
+                    if drain and not deferred:
+                        return
+                    time.sleep(tick_s)
+                    continue
+                done, _ = wait([*jobs, *parker], timeout=tick_s, return_when=FIRST_COMPLETED)
+                for future in done:
+                    jobs.pop(future, None)
+                    parker.pop(future, None)
+        except KeyboardInterrupt:
+            print(f"Stopping; waiting for {len(jobs) + len(parker)} running job(s)")
+        finally:
+            if watcher is not None:
+                watcher.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default="project.yaml", help="Path to project.yaml")
+    ap.add_argument("--date", default=None, help="YYYY-MM-DD (defaults to today)")
+    ap.add_argument("--slug", default="run", help="Run slug (e.g., test_run)")
+    ap.add_argument(
+        "--resume",
+        default=None,
+        help="Path to an existing run folder: restart an interrupted run, or continue after the curator decision",
+    )
+    ap.add_argument("--campaign", default=None, help="Path to a campaign.yaml listing many date/slug runs")
+    ap.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a resident worker over the job queue (serve.queue_dir; submit with scripts/job_queue.py)",
+    )
+    ap.add_argument("--drain", action="store_true", help="With --serve: exit once the queue is empty")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache for this invocation")
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Rerun an existing date/slug, skipping steps whose recorded inputs are unchanged",
+    )
+    ap.add_argument(
+        "--speculative",
+        action="store_true",
+        default=None,
+        help="Draft Parker's post bundle during QC so an approving --resume can promote it instantly",
+    )
+    args = ap.parse_args()
+
+    if args.serve:
+        serve(Path(args.config), use_cache=not args.no_cache, drain=args.drain)
+        return
+
+    shared = load_shared_inputs(Path(args.config))
+
+    if args.campaign:
+        summary_path = run_campaign(
+            shared, Path(args.campaign), use_cache=not args.no_cache, incremental=args.incremental, speculative=args.speculative,
         )
-        manifest.setdefault("events", []).append({"type": "stopped", "at": now_iso(), "reason": "qc_fail"})
-        write_yaml(manifest_path, manifest)
-        print("QC failed; stopping before curator review.")
+        summary = yaml.safe_load(read_text(summary_path))
+        for result in summary["runs"]:
+            print(f"{result['date']}_{result['slug']}: {result['status']} ({result['duration_s']}s)")
+        print(f"Campaign summary: {summary_path}")
         return
 
-    mark_ready_for_curator(run_dir)
+    provider = make_provider(shared.cfg, shared.root_dir, use_cache=not args.no_cache)
 
-    # Validate the manifest itself against contract.
-    manifest_text = read_text(manifest_path)
-    validate_and_write(
-        contracts=contracts,
-        artifact_key="run_manifest",
-        out_path=manifest_path,
-        content=manifest_text,
-    )
+    if args.resume:
+        outcome = resume_run(shared, Path(args.resume), provider=provider)
+        if outcome["status"] == "published":
+            verb = "promoted the speculative" if outcome.get("speculative") == "promoted" else "created"
+            print(f"Parker {verb} post bundle: {outcome['post_bundle']}")
+            return
+        if outcome["status"].startswith("curator_"):
+            print("Curator vetoed / not approved. Stopping.")
+            return
+        # Otherwise an interrupted run was restarted; report it like a fresh one.
+    else:
+        date = args.date or dt.date.today().isoformat()
+        outcome = execute_run(shared, date, args.slug, provider=provider, incremental=args.incremental, speculative=args.speculative)
+    run_dir = Path(outcome["run_dir"])
+    if outcome["status"] == "stopped_qc_fail":
+        print("QC failed; stopping before curator review.")
+        return
+    if outcome["status"] == "stopped_render_budget":
+        print(f"No scene plan is within render_budget.limits; see {run_dir / 'STOPPED_RENDER_BUDGET.md'}.")
+        return
 
     print(f"Run complete: {run_dir}")
+    if (run_dir / PROFILE_MD).exists():
+        print(f"Profile: {run_dir / PROFILE_MD}")
     print(f"Next: edit {run_dir / 'curator_decision.md'} and re-run with --resume {run_dir}")
 
 if __name__ == "__main__":
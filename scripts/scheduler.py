@@ -0,0 +1,110 @@
+"""Asyncio step scheduler for the Stephanie Project controller.
+
+The pipeline is expressed as a DAG: each step declares the artifacts it requires and
+the artifact it produces. A step starts as soon as all of its inputs exist, so
+independent steps (e.g. shortlist branches) overlap instead of running serially.
+
+Steps may add further steps while the scheduler is running (fan-out).
+
+A failing step only takes down the steps that depend on it (directly or through other
+steps); independent steps, such as sibling shortlist branches, still run to completion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    requires: tuple[str, ...] = ()
+    produces: str | None = None  # artifact key; defaults to the step name
+
+    @property
+    def artifact(self) -> str:
+        return self.produces or self.name
+
+
+class StepScheduler:
+    """Run steps as their declared dependencies resolve.
+
+    When a step fails, the steps that require its artifact are dropped (and, in turn,
+    theirs), while everything else keeps running. Once nothing more can run, the first
+    failure is re-raised from `run()`; the names of dropped steps are in `skipped`.
+    """
+
+    def __init__(self, *, max_concurrency: int | None = None):
+        self._pending: list[Step] = []
+        self._names: set[str] = set()
+        self._artifact_owners: dict[str, str] = {}
+        self._max_concurrency = max_concurrency
+        self.artifacts: dict[str, Any] = {}
+        self.skipped: list[str] = []
+
+    def add(self, step: Step) -> None:
+        if step.name in self._names:
+            raise ValueError(f"Duplicate step name: {step.name}")
+        owner = self._artifact_owners.get(step.artifact)
+        if owner is not None:
+            raise ValueError(f"Artifact '{step.artifact}' already produced by step '{owner}'")
+        self._names.add(step.name)
+        self._artifact_owners[step.artifact] = step.name
+        self._pending.append(step)
+
+    async def run(self) -> dict[str, Any]:
+        semaphore = asyncio.Semaphore(self._max_concurrency) if self._max_concurrency else None
+        running: dict[asyncio.Task, Step] = {}
+
+        async def _invoke(step: Step) -> Any:
+            inputs = {key: self.artifacts[key] for key in step.requires}
+            if semaphore is None:
+                return await step.run(inputs)
+            async with semaphore:
+                return await step.run(inputs)
+
+        errors: list[Exception] = []
+        lost: set[str] = set()  # artifacts that failed or can no longer be produced
+        try:
+            while True:
+                self._drop_blocked(lost)
+                ready = [s for s in self._pending if all(r in self.artifacts for r in s.requires)]
+                for step in ready:
+                    self._pending.remove(step)
+                    running[asyncio.create_task(_invoke(step), name=step.name)] = step
+
+                if not running:
+                    if not self._pending or errors:
+                        break
+                    missing = sorted({r for s in self._pending for r in s.requires if r not in self.artifacts})
+                    raise ValueError(f"Unsatisfiable step dependencies: {', '.join(missing)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    exc = None if task.cancelled() else task.exception()
+                    if isinstance(exc, Exception):
+                        errors.append(exc)
+                        lost.add(step.artifact)
+                    else:
+                        self.artifacts[step.artifact] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+        return self.artifacts
+
+    def _drop_blocked(self, lost: set[str]) -> None:
+        """Drop pending steps that require a lost artifact; their own artifacts are lost too."""
+        while blocked := [s for s in self._pending if any(r in lost for r in s.requires)]:
+            for step in blocked:
+                self._pending.remove(step)
+                self.skipped.append(step.name)
+                lost.add(step.artifact)